@@ -0,0 +1,40 @@
+import functools
+
+import music21  # type: ignore
+import pytest  # type: ignore
+
+from blobopera import synthetic
+from blobopera.recording import Recording
+
+# Input sizes, in notes per part, used to parametrize every benchmark.
+SIZES = (10, 100, 1000)
+
+
+@functools.lru_cache(maxsize=None)
+def build_score(size: int) -> music21.stream.Score:
+    """Build a four-part score with the given number of notes per part."""
+    return synthetic.score(size)
+
+
+@functools.lru_cache(maxsize=None)
+def build_recording(size: int) -> Recording:
+    """Build a recording with the given number of notes per part."""
+    return synthetic.recording(size)
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}-notes")
+def size(request) -> int:
+    """Fixture that provides each of the benchmark input sizes."""
+    return request.param
+
+
+@pytest.fixture()
+def score(size) -> music21.stream.Score:
+    """Fixture that provides a synthetic score with the current size."""
+    return build_score(size)
+
+
+@pytest.fixture()
+def recording(size) -> Recording:
+    """Fixture that provides a synthetic recording with the current size."""
+    return build_recording(size)
@@ -0,0 +1,34 @@
+import pytest  # type: ignore
+
+from blobopera.archive import Archive, Compression, Writer
+from blobopera.recording import Recording
+
+from .fixture_score import recording, size  # noqa: F401
+
+# Number of entries in every benchmark archive.
+ENTRIES = 100
+
+
+@pytest.fixture(params=list(Compression), ids=lambda c: c.name.lower())
+def archive(request, tmp_path, recording):  # noqa: F811
+    """Fixture that provides an archive with many copies of a recording."""
+    data = Recording.serialize(recording)
+    path = tmp_path / "recordings.pack"
+    with open(path, "wb") as file, Writer(file, request.param) as writer:
+        for index in range(ENTRIES):
+            writer.add(str(index), data)
+    with Archive(path) as archive:
+        yield archive
+
+
+def test_archive_read(benchmark, archive):
+    """Benchmark the random access to a single archive entry."""
+    benchmark(archive.read, str(ENTRIES // 2))
+
+
+def test_loose_read(benchmark, tmp_path, recording):  # noqa: F811
+    """Benchmark the same access to loose files, for comparison."""
+    data = Recording.serialize(recording)
+    for index in range(ENTRIES):
+        (tmp_path / f"{index}.binary").write_bytes(data)
+    benchmark((tmp_path / f"{ENTRIES // 2}.binary").read_bytes)
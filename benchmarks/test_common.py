@@ -0,0 +1,26 @@
+import pytest  # type: ignore
+
+from blobopera.command import common
+from blobopera.recording import Recording
+
+from .fixture_score import recording, size  # noqa: F401
+
+
+@pytest.fixture(params=list(common.ConvertFormat), ids=lambda f: f.value)
+def data(request, recording):  # noqa: F811
+    """Fixture that provides a serialized recording in each format."""
+    if request.param is common.ConvertFormat.JSON:
+        return Recording.to_json(recording).encode()
+    else:
+        return Recording.serialize(recording)
+
+
+def test_parse(benchmark, data):
+    """Benchmark the parsing of serialized recordings."""
+    benchmark(common.parse, data, Recording)
+
+
+@pytest.mark.parametrize("format", common.ConvertFormat, ids=str.lower)
+def test_convert(benchmark, data, format):
+    """Benchmark the conversion of recordings between formats."""
+    benchmark(common.convert, data, format, message=Recording)
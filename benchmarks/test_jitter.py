@@ -0,0 +1,29 @@
+from itertools import islice
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from blobopera.jitter import Generator, Jitter, apply, curves
+
+from .fixture_score import recording, size  # noqa: F401
+
+TEMPLATES = Path(__file__).parents[1] / "tests/test_command_jitter.data"
+
+
+@pytest.fixture(scope="module")
+def jitter() -> Jitter:
+    """Fixture that provides the default set of jitter templates."""
+    return Jitter.deserialize((TEMPLATES / "jitter.binary").read_bytes())
+
+
+@pytest.mark.parametrize("count", [1000, 10000, 100000])
+def test_generator(benchmark, jitter, count):
+    """Benchmark the generation of pseudorandom jitter values."""
+    benchmark(lambda: list(islice(Generator(jitter, seed=0), count)))
+
+
+def test_humanize(benchmark, jitter, recording):  # noqa: F811
+    """Benchmark the application of jitter to every note of a recording."""
+    benchmark(
+        lambda: apply(recording, curves(recording, jitter, 0.02, 0.1, seed=0))
+    )
@@ -0,0 +1,67 @@
+import random
+
+import more_itertools
+import pytest  # type: ignore
+
+from blobopera.languages import GenericLanguage, RandomLanguage
+from blobopera.phoneme import Phoneme
+
+from .fixture_score import score, size  # noqa: F401
+
+
+class LegacyRandomLanguage(RandomLanguage):
+    """Previous random language, reseeding a generator on every note."""
+
+    def __init__(self, part, *, strict=False):
+        super().__init__(part, strict=strict)
+        self.random = random.Random()
+
+    def parse(self, before, current, after):
+        self.random.seed(current.offset)
+        return [self.pick(Phoneme.is_vowel), self.pick(Phoneme.is_consonant)]
+
+    def pick(self, condition):
+        while not condition(phoneme := self.random.choice(list(Phoneme))):
+            pass
+        return phoneme
+
+
+@pytest.mark.parametrize(
+    "language", [GenericLanguage, RandomLanguage, LegacyRandomLanguage]
+)
+def test_language_parse(benchmark, score, language):  # noqa: F811
+    """Benchmark the phoneme parsing of every note in a part."""
+    part = score.parts[0]
+    notes = list(part.flat.notesAndRests)
+    instance = language(part)
+
+    def parse():
+        for before, current, after in more_itertools.windowed_complete(
+            notes, 1
+        ):
+            instance.parse(list(before), current[0], list(after))
+
+    benchmark(parse)
+
+
+@pytest.mark.parametrize("language", [GenericLanguage, RandomLanguage])
+def test_language_parse_all(benchmark, score, language):  # noqa: F811
+    """Benchmark the batched phoneme parsing of every note in a part."""
+    part = score.parts[0]
+    notes = list(part.flat.notesAndRests)
+    benchmark(language(part).parse_all, notes)
+
+
+@pytest.mark.parametrize("language", [RandomLanguage, LegacyRandomLanguage])
+def test_language_parse_parts(benchmark, score, language):  # noqa: F811
+    """Benchmark the random phonemes of every note in all the parts."""
+    notes = [
+        (language(part), list(part.flat.notesAndRests)) for part in score.parts
+    ]
+
+    def parse():
+        for instance, events in notes:
+            for event in events:
+                instance.parse([], event, [])
+
+    benchmark(parse)
@@ -0,0 +1,10 @@
+import io
+
+from blobopera.plot import render
+
+from .fixture_score import recording, size  # noqa: F401
+
+
+def test_render(benchmark, recording):  # noqa: F811
+    """Benchmark the rendering of a piano roll without lyrics."""
+    benchmark(render, recording, io.BytesIO(), "png", labels=False)
@@ -0,0 +1,26 @@
+from fractions import Fraction
+
+import pytest  # type: ignore
+
+from blobopera.quantize import quantize
+from blobopera.recording import Part
+
+from .fixture_score import recording, size  # noqa: F401
+
+
+@pytest.mark.parametrize("method", ["vectorized", "fraction"])
+def test_quantize(benchmark, recording, method):  # noqa: F811
+    """Benchmark the quantization of the note times of every part."""
+    times = [
+        [note.time for note in Part.pb(part).notes] for part in recording.parts
+    ]
+
+    if method == "vectorized":
+        benchmark(lambda: [quantize(part).fractions() for part in times])
+    else:
+        benchmark(
+            lambda: [
+                [Fraction(time).limit_denominator(100) for time in part]
+                for part in times
+            ]
+        )
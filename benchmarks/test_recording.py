@@ -0,0 +1,55 @@
+import io
+
+from blobopera import midi, musicxml
+from blobopera.recording import Part, Recording
+
+from .fixture_score import recording, score, size  # noqa: F401
+
+
+def test_part_from_part(benchmark, score):  # noqa: F811
+    """Benchmark the conversion of a single music21 part."""
+    benchmark(Part.from_part, score.parts[0])
+
+
+def test_recording_from_score(benchmark, score):  # noqa: F811
+    """Benchmark the conversion of a whole four-part score."""
+    benchmark(Recording.from_score, score, parts=(0, 1, 2, 3))
+
+
+def test_recording_to_score(benchmark, recording):  # noqa: F811
+    """Benchmark the conversion of a recording to a music21 score."""
+    benchmark(recording.to_score)
+
+
+def test_midi_write(benchmark, recording):  # noqa: F811
+    """Benchmark the direct conversion of a recording to MIDI."""
+    benchmark(midi.write, recording, io.BytesIO())
+
+
+def test_musicxml_write(benchmark, recording):  # noqa: F811
+    """Benchmark the direct conversion of a recording to MusicXML."""
+    benchmark(musicxml.write, recording, io.BytesIO())
+
+
+def test_midi_read(benchmark, recording):  # noqa: F811
+    """Benchmark the native MIDI reader and score construction."""
+    file = io.BytesIO()
+    midi.write(recording, file)
+
+    def read():
+        file.seek(0)
+        return midi.score(midi.read(file))
+
+    benchmark(read)
+
+
+def test_musicxml_read(benchmark, recording):  # noqa: F811
+    """Benchmark the streaming MusicXML importer."""
+    file = io.BytesIO()
+    musicxml.write(recording, file)
+
+    def read():
+        file.seek(0)
+        return musicxml.read(file, parts=(0, 1, 2, 3))
+
+    benchmark(read)
@@ -0,0 +1,8 @@
+from blobopera.stats import summarize
+
+from .fixture_score import recording, size  # noqa: F401
+
+
+def test_summarize(benchmark, recording):  # noqa: F811
+    """Benchmark the statistics of every part of a recording."""
+    benchmark(summarize, recording)
@@ -0,0 +1,10 @@
+import io
+
+from blobopera.synthesis import render
+
+from .fixture_score import recording, size  # noqa: F401
+
+
+def test_render(benchmark, recording):  # noqa: F811
+    """Benchmark the synthesis of an audio preview on this process."""
+    benchmark(render, recording, io.BytesIO(), seed=0)
@@ -0,0 +1,35 @@
+import pytest  # type: ignore
+
+from blobopera.tempo import DEFAULT, TempoMap
+
+from .fixture_score import score, size  # noqa: F401
+
+
+def linear_seconds(changes, offset):
+    """Convert an offset to seconds adding up every previous tempo section."""
+    time, previous, rate = 0.0, 0.0, DEFAULT
+    for start, duration in changes:
+        if start > offset:
+            break
+        time += (start - previous) * rate
+        previous, rate = start, duration
+    return time + (offset - previous) * rate
+
+
+@pytest.mark.parametrize("lookup", ["bisect", "linear"])
+def test_tempo_seconds(benchmark, score, lookup):  # noqa: F811
+    """Benchmark the timing of every note with a tempo change per note."""
+    offsets = [
+        float(note.offset) for note in score.parts[0].flat.notesAndRests
+    ]
+    changes = [
+        (offset, 0.5 + index % 3 / 4) for index, offset in enumerate(offsets)
+    ]
+    tempos = TempoMap(changes)
+
+    if lookup == "bisect":
+        benchmark(lambda: [tempos.seconds(offset) for offset in offsets])
+    else:
+        benchmark(
+            lambda: [linear_seconds(changes, offset) for offset in offsets]
+        )
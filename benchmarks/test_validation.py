@@ -0,0 +1,8 @@
+from blobopera.validation import validate
+
+from .fixture_score import recording, size  # noqa: F401
+
+
+def test_validate(benchmark, recording):  # noqa: F811
+    """Benchmark the validation of every note of a recording."""
+    benchmark(validate, recording)
@@ -0,0 +1,300 @@
+"""Recording archives.
+
+This module stores many serialized recordings in a single pack file, which
+is much cheaper to list, copy and read than loose files. Packs begin with a
+fixed-size header, followed by the entry data and, finally, by an index with
+the name, position, size and compression of every entry.
+
+Readers memory-map the file and only parse the header and the index, so any
+entry can be retrieved in constant time without reading the rest of them.
+
+Example:
+    >>> with Writer(open("recordings.pack", "wb")) as writer:
+    >>>     writer.add("aria", Recording.serialize(recording))
+    >>> with Archive(Path("recordings.pack")) as archive:
+    >>>     archive.recording("aria")
+"""
+
+import lzma
+import mmap
+import struct
+import zlib
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple
+
+from .recording import Recording
+
+# Magic bytes at the beginning of every pack file.
+MAGIC: bytes = b"BLOBPACK"
+
+# Version of the pack format; bump it on incompatible changes.
+VERSION: int = 1
+
+# Magic, version, entry count, index offset and index size.
+HEADER = struct.Struct(">8sHxxIQQ")
+
+# Offset, stored size, original size, compression and name size.
+ENTRY = struct.Struct(">QIIBH")
+
+
+class Compression(IntEnum):
+    """Compression method of a pack entry."""
+
+    NONE = 0
+    ZLIB = 1
+    LZMA = 2
+
+
+class Entry(NamedTuple):
+    """Pack index entry.
+
+    Attributes:
+        offset: The position of the entry data in the pack file.
+        size: The size of the stored, maybe compressed, entry data.
+        length: The size of the original entry data.
+        compression: The compression method of the entry data.
+    """
+
+    offset: int
+    size: int
+    length: int
+    compression: Compression
+
+
+class Writer:
+    """Pack file writer.
+
+    Entries are written as soon as they're added, and the index gets
+    appended when closing the writer, so the file must be seekable. When
+    used as a context manager, the writer only gets closed if there aren't
+    any errors, leaving the header of failed packs blank.
+    """
+
+    def __init__(
+        self, file: BinaryIO, compression: Compression = Compression.NONE
+    ):
+        """Start writing a pack file.
+
+        Arguments:
+            file: A new, seekable, binary stream to write the pack to.
+            compression: The compression method for the entries; entries
+                that don't get any smaller are stored uncompressed.
+        """
+        self.file = file
+        self.compression = compression
+        self.index: Dict[str, Entry] = {}
+        self.position = HEADER.size
+        file.write(bytes(HEADER.size))  # Placeholder; see close.
+
+    def add(self, name: str, data: bytes):
+        """Add an entry to the pack.
+
+        Arguments:
+            name: The unique name of the entry.
+            data: The entry data, usually a serialized recording.
+
+        Raises:
+            ValueError: If there already is an entry with the same name.
+        """
+        if name in self.index:
+            raise ValueError(f"duplicate entry name: {name}")
+
+        compression, stored = Compression.NONE, data
+        if self.compression != Compression.NONE:
+            compressed = _compress(data, self.compression)
+            if len(compressed) < len(data):
+                compression, stored = self.compression, compressed
+
+        self.file.write(stored)
+        self.index[name] = Entry(
+            self.position, len(stored), len(data), compression
+        )
+        self.position += len(stored)
+
+    def close(self):
+        """Write the index and the header; the file is left open."""
+        index = bytearray()
+        for name, entry in self.index.items():
+            encoded = name.encode()
+            index += ENTRY.pack(*entry, len(encoded))
+            index += encoded
+        self.file.write(index)
+
+        self.file.seek(0)
+        self.file.write(
+            HEADER.pack(
+                MAGIC, VERSION, len(self.index), self.position, len(index)
+            )
+        )
+        self.file.seek(self.position + len(index))
+
+    def __enter__(self) -> "Writer":
+        return self
+
+    def __exit__(self, *exception):
+        # Failed packs don't get any index, so they can't be opened.
+        if exception[0] is None:
+            self.close()
+
+
+class Archive:
+    """Memory-mapped pack file reader.
+
+    Archives behave as read-only mappings from entry names to their data, in
+    the same order they were added.
+
+    Attributes:
+        index: The index entries, by name.
+    """
+
+    def __init__(self, path: Path):
+        """Open a pack file.
+
+        Arguments:
+            path: The path of the pack file.
+
+        Raises:
+            ValueError: If the file isn't a valid pack file.
+        """
+        with open(path, "rb") as file:
+            try:
+                self.data = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:  # Empty files can't be mapped.
+                raise ValueError("invalid pack file")
+
+        try:
+            magic, version, count, offset, size = HEADER.unpack_from(self.data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("invalid pack file")
+            self.index = _index(self.data[offset : offset + size], count)
+            # Truncated packs would return short entries otherwise.
+            if offset + size > len(self.data) or any(
+                entry.offset < HEADER.size
+                or entry.offset + entry.size > offset
+                for entry in self.index.values()
+            ):
+                raise ValueError("invalid pack file")
+        except (struct.error, UnicodeDecodeError, ValueError):
+            self.data.close()
+            raise ValueError("invalid pack file")
+
+    def read(self, name: str) -> bytes:
+        """Read the data of an entry.
+
+        Arguments:
+            name: The name of the entry.
+
+        Returns:
+            The original, uncompressed, entry data.
+
+        Raises:
+            KeyError: If there isn't any entry with the given name.
+            ValueError: If the entry data is corrupt.
+        """
+        entry = self.index[name]
+        data = self.data[entry.offset : entry.offset + entry.size]
+        try:
+            result = _decompress(data, entry.compression)
+        except (zlib.error, lzma.LZMAError):
+            raise ValueError(f"invalid pack entry: {name}")
+        if len(result) != entry.length:
+            raise ValueError(f"invalid pack entry: {name}")
+        return result
+
+    def recording(self, name: str) -> Recording:
+        """Read an entry as a recording.
+
+        Arguments:
+            name: The name of the entry.
+
+        Returns:
+            The deserialized recording.
+
+        Raises:
+            KeyError: If there isn't any entry with the given name.
+            ValueError: If the entry data is corrupt.
+        """
+        return Recording.deserialize(self.read(name))
+
+    def names(self) -> List[str]:
+        """List the names of all the entries, in order."""
+        return list(self.index)
+
+    def close(self):
+        """Unmap the pack file."""
+        self.data.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def _index(data: bytes, count: int) -> Dict[str, Entry]:
+    """Parse the index of a pack file.
+
+    Arguments:
+        data: The raw index data.
+        count: The number of entries.
+
+    Returns:
+        The index entries, by name.
+    """
+    index: Dict[str, Entry] = {}
+    position = 0
+    for _ in range(count):
+        offset, size, length, compression, name = ENTRY.unpack_from(
+            data, position
+        )
+        position += ENTRY.size
+        key = data[position : position + name].decode()
+        index[key] = Entry(offset, size, length, Compression(compression))
+        position += name
+    return index
+
+
+def _compress(data: bytes, compression: Compression) -> bytes:
+    """Compress entry data.
+
+    Arguments:
+        data: The original data.
+        compression: The compression method.
+
+    Returns:
+        The compressed data.
+    """
+    if compression == Compression.ZLIB:
+        return zlib.compress(data, 9)
+    elif compression == Compression.LZMA:
+        return lzma.compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: Compression) -> bytes:
+    """Decompress entry data.
+
+    Arguments:
+        data: The stored data.
+        compression: The compression method.
+
+    Returns:
+        The original data.
+    """
+    if compression == Compression.ZLIB:
+        return zlib.decompress(data)
+    elif compression == Compression.LZMA:
+        return lzma.decompress(data)
+    return data
@@ -5,5 +5,6 @@ recordings and other artifacts from the servers.
 """
 
 from .backend import Backend
+from .mock import MockServer
 
-__all__ = ["Backend"]
+__all__ = ["Backend", "MockServer"]
@@ -16,12 +16,14 @@ class Backend:
         private: The host name of the private server.
         static: The host name of the static server.
         shortener: The host name of the link shortener server.
+        scheme: The URL scheme of every server, like http for local ones.
     """
 
     public: str = "artsandculture.google.com"
     private: str = "cilex-aeiopera.uc.r.appspot.com"
     static: str = "gacembed.withgoogle.com"
     shortener: str = "g.co"
+    scheme: str = "https"
 
     def shorten(self, link: str) -> str:
         """Shorten a link with the internal shortener service.
@@ -35,7 +37,7 @@ class Backend:
         Raises:
             KeyError: If the shortener did not reply with a link.
         """
-        address = f"https://{self.public}/api/shortUrl"
+        address = f"{self.scheme}://{self.public}/api/shortUrl"
         response = requests.get(address, params={"destUrl": link})
         # We can't parse the response as JSON because it includes garbage.
         if match := re.search(r'.*"(https?://.+?)".*', response.text):
@@ -57,7 +59,8 @@ class Backend:
         # Encode the result with a custom Base64 URL-safe extended variant.
         code = base64.urlsafe_b64encode(data).decode().replace("=", ".")
         # Return the link with the base prefix and the calculated identifier.
-        address = f"https://{self.public}/experiment/blob-opera/AAHWrq360NcGbw"
+        address = f"{self.scheme}://{self.public}/experiment/blob-opera"
+        address = f"{address}/AAHWrq360NcGbw"
         return f"{address}?cp={code}"
 
     def upload(self, recording: bytes) -> str:
@@ -73,7 +76,7 @@ class Backend:
             ValueError: If the uploaded recording was rejected by the server.
         """
 
-        address = f"https://{self.private}/recording"
+        address = f"{self.scheme}://{self.private}/recording"
         response = requests.put(address, data=recording)
 
         try:
@@ -96,11 +99,11 @@ class Backend:
         """
         try:
             # If it's a short link, try to resolve the long link.
-            if handle.startswith(f"https://{self.shortener}"):
+            if handle.startswith(f"{self.scheme}://{self.shortener}"):
                 handle = requests.get(handle).url
 
             # If it's a long link, try to retrieve the identifier.
-            if handle.startswith(f"https://{self.public}"):
+            if handle.startswith(f"{self.scheme}://{self.public}"):
                 # Extract the query string from the address.
                 query_string = urllib.parse.urlparse(handle).query
                 # Extract the ``cp`` parameter from the query string.
@@ -111,7 +114,7 @@ class Backend:
                 handle = json.loads(raw)["r"]
 
             # Fetch the recording and return the raw protocol buffer.
-            address = f"https://{self.private}/recording/{handle}"
+            address = f"{self.scheme}://{self.private}/recording/{handle}"
             file = requests.get(address).json()["url"]
             return requests.get(file).content
 
@@ -0,0 +1,140 @@
+"""Backend load generator.
+
+This module drives a backend with many concurrent clients, each one
+repeatedly uploading a recording, optionally sharing it through a short
+link, and downloading it back, timing every operation on its own. It's meant
+to be pointed at a :py:class:`.mock.MockServer`, to measure how the client
+side behaves under latency and errors, but it works with any backend.
+
+Example:
+    >>> report = run(backend, data, clients=8, count=100)
+    >>> report.to_dict()["operations"]["download"]["p99"]
+"""
+
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List, NamedTuple
+
+import numpy  # type: ignore
+import requests
+
+from .backend import Backend
+
+# Operations of every round, in order.
+OPERATIONS = ("upload", "shorten", "download")
+
+
+class Report(NamedTuple):
+    """Results of a load test.
+
+    Attributes:
+        elapsed: The wall time of the whole test, in seconds.
+        latencies: The duration of every successful call, by operation, in
+            seconds.
+        errors: The number of failed calls, by operation.
+    """
+
+    elapsed: float
+    latencies: Dict[str, List[float]]
+    errors: Dict[str, int]
+
+    def to_dict(self) -> Dict[str, object]:
+        """Describe the results.
+
+        Returns:
+            A dictionary, suitable for serializing as JSON, with the elapsed
+            time, the number of successful calls per second, and the count,
+            errors, mean, median (p50) and 99th percentile (p99) latency of
+            every operation, in seconds, where latencies without any
+            successful call are None.
+        """
+        operations = {}
+        for operation in OPERATIONS:
+            latencies = numpy.asarray(self.latencies.get(operation, []))
+            errors = self.errors.get(operation, 0)
+            if not len(latencies) and not errors:
+                continue
+            p50, p99 = (
+                numpy.percentile(latencies, (50, 99))
+                if len(latencies)
+                else (None, None)
+            )
+            operations[operation] = {
+                "count": len(latencies),
+                "errors": errors,
+                "mean": float(latencies.mean()) if len(latencies) else None,
+                "p50": None if p50 is None else float(p50),
+                "p99": None if p99 is None else float(p99),
+            }
+        calls = sum(map(len, self.latencies.values()))
+        return {
+            "elapsed": self.elapsed,
+            "throughput": calls / self.elapsed if self.elapsed else None,
+            "operations": operations,
+        }
+
+
+def run(
+    backend: Backend,
+    recording: bytes,
+    clients: int = 8,
+    count: int = 100,
+    shorten: bool = False,
+) -> Report:
+    """Drive a backend with concurrent clients.
+
+    Arguments:
+        backend: The backend to drive.
+        recording: The raw recording to upload on every round.
+        clients: The number of concurrent clients.
+        count: The total number of rounds, split amongst the clients.
+        shorten: Whether to shorten the link of every uploaded recording and
+            download it through the short link instead of its identifier.
+
+    Returns:
+        The latencies and errors of every operation.
+    """
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = Lock()
+
+    def record(operation: str, start: float, success: bool):
+        with lock:
+            if success:
+                latencies[operation].append(time.perf_counter() - start)
+            else:
+                errors[operation] += 1
+
+    def call(operation: str, function, *arguments):
+        start = time.perf_counter()
+        try:
+            result = function(*arguments)
+        except (ValueError, KeyError, requests.RequestException):
+            record(operation, start, False)
+            return None
+        record(operation, start, True)
+        return result
+
+    def round(_: int):
+        if (handle := call("upload", backend.upload, recording)) is None:
+            return
+        if shorten:
+            link = backend.link(handle)
+            if (handle := call("shorten", backend.shorten, link)) is None:
+                return
+        # Failed downloads may still return an error page, so the content
+        # must be checked.
+        start = time.perf_counter()
+        try:
+            valid = backend.download(handle) == recording
+        except (KeyError, requests.RequestException):
+            valid = False
+        record("download", start, valid)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        for _ in executor.map(round, range(count)):
+            pass
+    return Report(time.perf_counter() - start, dict(latencies), dict(errors))
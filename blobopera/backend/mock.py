@@ -0,0 +1,258 @@
+"""Local backend emulator.
+
+This module serves the same endpoints as the Blob Opera servers on a local
+port, so the backend interface can be exercised end to end without any
+network access: recordings get stored in memory and served through signed,
+expiring file links, long links get shortened and expanded, and static
+assets get served from a local directory. Every request can be delayed and
+failed on purpose, to see how clients behave under a slow or flaky backend.
+
+Since there is a single server, it plays the role of every host, and the
+links it generates point back to the host name the client used to reach it.
+
+Example:
+    >>> with MockServer(latency=0.05, errors=0.01) as server:
+    >>>     Thread(target=server.serve_forever, daemon=True).start()
+    >>>     backend = server.backend()
+    >>>     backend.download(backend.upload(recording))
+"""
+
+import hashlib
+import hmac
+import json
+import secrets
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from random import Random
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from .backend import Backend
+
+# Lifetime of the signed file links, in seconds.
+EXPIRATION: int = 300
+
+# Garbage prepended by the shortener to its replies, like the real one does.
+GARBAGE: str = ")]}'\n"
+
+
+class MockServer(ThreadingHTTPServer):
+    """Local HTTP server emulating every Blob Opera server at once.
+
+    Arguments:
+        address: The host name and port to listen on; port zero picks any
+            free port.
+        latency: The delay added to every request, in seconds.
+        errors: The probability of failing every request with a 503 status,
+            between 0 and 1.
+        static: The directory with the static assets, if any.
+        seed: The seed of the error injection, for reproducible failures.
+
+    Attributes:
+        objects: The stored recordings, by identifier.
+        links: The destination of every short link, by token.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        latency: float = 0.0,
+        errors: float = 0.0,
+        static: Optional[Path] = None,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(address, _Handler)
+        self.latency: float = latency
+        self.errors: float = errors
+        self.static: Optional[Path] = static
+        self.objects: Dict[str, bytes] = {}
+        self.links: Dict[str, str] = {}
+        self._secret: bytes = secrets.token_bytes(16)
+        self._random: Random = Random(seed)
+        self._lock: Lock = Lock()
+
+    @property
+    def host(self) -> str:
+        """Host name and port the server is listening on."""
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def backend(self) -> Backend:
+        """Create a backend interface pointing to this server.
+
+        Returns:
+            A backend using this server as every host.
+        """
+        host = self.host
+        return Backend(host, host, host, host, scheme="http")
+
+    def fail(self) -> bool:
+        """Decide whether to inject an error on a request.
+
+        Returns:
+            True with the configured error probability.
+        """
+        with self._lock:
+            return self._random.random() < self.errors
+
+    def store(self, data: bytes) -> str:
+        """Store a recording.
+
+        Arguments:
+            data: The raw recording.
+
+        Returns:
+            The new recording identifier.
+        """
+        identifier = secrets.token_hex(8)
+        with self._lock:
+            self.objects[identifier] = data
+        return identifier
+
+    def shorten(self, link: str) -> str:
+        """Store a long link.
+
+        Arguments:
+            link: The destination of the short link.
+
+        Returns:
+            The new short link token.
+        """
+        token = secrets.token_urlsafe(6)
+        with self._lock:
+            self.links[token] = link
+        return token
+
+    def sign(self, identifier: str, expires: int) -> str:
+        """Sign a file link.
+
+        Arguments:
+            identifier: The recording identifier.
+            expires: The expiration time of the link, as a UNIX timestamp.
+
+        Returns:
+            The hexadecimal signature of the link.
+        """
+        message = f"{identifier}:{expires}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler for :py:class:`MockServer`."""
+
+    # Keep connections alive, like the real servers do.
+    protocol_version = "HTTP/1.1"
+    server: MockServer
+
+    def log_message(self, format: str, *arguments):
+        """Don't log every request to the standard error."""
+
+    def do_PUT(self):
+        """Handle uploads."""
+        if not self._begin():
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length)
+        if self.path.split("?")[0] != "/recording":
+            self._reply(404, b"Not Found")
+        elif not data:
+            self._reply(400, b"Bad Request")
+        else:
+            self._json({"id": self.server.store(data)})
+
+    def do_GET(self):
+        """Handle every other endpoint."""
+        if not self._begin():
+            return
+        address = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(address.query)
+        _, first, *rest = address.path.split("/")
+        rest = "/".join(rest)
+
+        if first == "recording" and rest:
+            if rest not in self.server.objects:
+                return self._reply(404, b"Not Found")
+            expires = int(time.time()) + EXPIRATION
+            signature = self.server.sign(rest, expires)
+            parameters = urllib.parse.urlencode(
+                {"expires": expires, "signature": signature}
+            )
+            self._json({"url": f"{self._base()}/file/{rest}?{parameters}"})
+
+        elif first == "file" and rest in self.server.objects:
+            try:
+                expires = int(query["expires"][0])
+                signature = query["signature"][0]
+            except (KeyError, ValueError):
+                return self._reply(403, b"Forbidden")
+            expected = self.server.sign(rest, expires)
+            if expires < time.time() or not hmac.compare_digest(
+                signature, expected
+            ):
+                return self._reply(403, b"Forbidden")
+            self._reply(200, self.server.objects[rest])
+
+        elif address.path == "/api/shortUrl" and "destUrl" in query:
+            token = self.server.shorten(query["destUrl"][0])
+            link = json.dumps([f"{self._base()}/s/{token}"])
+            self._reply(200, f"{GARBAGE}{link}".encode())
+
+        elif first == "s" and rest in self.server.links:
+            self.send_response(301)
+            self.send_header("Location", self.server.links[rest])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        elif first == "experiment":
+            self._reply(200, b"Found")
+
+        elif first == "blob-opera" and self.server.static:
+            root = self.server.static.resolve()
+            path = (root / urllib.parse.unquote(rest)).resolve()
+            if root in path.parents and path.is_file():
+                self._reply(200, path.read_bytes())
+            else:
+                self._reply(404, b"Not Found")
+
+        else:
+            self._reply(404, b"Not Found")
+
+    def _begin(self) -> bool:
+        """Apply the configured latency and error injection.
+
+        Returns:
+            Whether the request should be handled, or it already failed.
+        """
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.fail():
+            # Drain the body, so the connection can be reused.
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self._reply(503, b"Service Unavailable")
+            return False
+        return True
+
+    def _base(self) -> str:
+        """Build the base address of the links, from the request host."""
+        return f"http://{self.headers.get('Host') or self.server.host}"
+
+    def _json(self, value: object):
+        """Reply with a JSON document."""
+        self._reply(200, json.dumps(value).encode(), "application/json")
+
+    def _reply(
+        self,
+        status: int,
+        body: bytes,
+        type: str = "application/octet-stream",
+    ):
+        """Reply with a status and a body."""
+        self.send_response(status)
+        self.send_header("Content-Type", type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,99 @@
+"""Conversion cache.
+
+This module provides a small persistent key-value store for conversion
+results, saved as a JSON file. Keys are digests of everything a result
+depends on, so stale entries are never returned; instead, entries that
+weren't used during the last conversion are dropped when saving.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Version of the cache format; bump it whenever cached results change.
+VERSION: int = 2
+
+
+class Cache:
+    """Persistent key-value store for conversion results.
+
+    Attributes:
+        path: The path of the cache file.
+        entries: The cached values, by key.
+        used: The keys read or written since the cache was loaded.
+        hits: The number of lookups that found a value.
+        misses: The number of lookups that didn't find any value.
+    """
+
+    def __init__(self, path: Path):
+        """Load the cache from a file, if it exists and is valid.
+
+        Arguments:
+            path: The path of the cache file.
+        """
+        self.path = path
+        self.entries: Dict[str, Any] = {}
+        self.used: set = set()
+        self.hits = self.misses = 0
+
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == VERSION:
+            self.entries = data.get("entries", {})
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Calculate a cache key.
+
+        Arguments:
+            parts: Bytes, or any values with a stable representation, that
+                the cached value depends on.
+
+        Returns:
+            A hexadecimal digest of all the given parts.
+        """
+        digest = hashlib.sha256(str(VERSION).encode())
+        for part in parts:
+            data = part if isinstance(part, bytes) else repr(part).encode()
+            digest.update(len(data).to_bytes(8, "big") + data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a value.
+
+        Arguments:
+            key: The key, as returned by :py:meth:`key`.
+
+        Returns:
+            The cached value, or None if there isn't any.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.used.add(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a value.
+
+        Arguments:
+            key: The key, as returned by :py:meth:`key`.
+            value: Any value that can be serialized as JSON.
+        """
+        self.entries[key] = value
+        self.used.add(key)
+
+    def save(self):
+        """Save the used entries to the cache file, replacing it atomically."""
+        entries = {key: self.entries[key] for key in sorted(self.used)}
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(
+            json.dumps({"version": VERSION, "entries": entries})
+        )
+        os.replace(temporary, self.path)
@@ -0,0 +1,253 @@
+"""Columnar libretto corpus.
+
+This module flattens a :py:class:`.libretto.Corpus` into a few NumPy arrays,
+so the whole corpus can be analyzed with vectorized operations instead of
+walking every fragment and phoneme wrapper. Columns are saved as
+uncompressed NumPy archives, whose arrays can be memory-mapped in place.
+
+Example:
+    >>> columns = Columns.from_corpus(corpus)
+    >>> columns.save(open("libretto.npz", "wb"))
+    >>> summary(Columns.load(Path("libretto.npz")))["fragments"]
+"""
+
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, NamedTuple
+
+import numpy  # type: ignore
+
+from .libretto import Corpus
+from .phoneme import Phoneme
+
+# Percentiles included in the duration summaries.
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class Columns(NamedTuple):
+    """Libretto corpus as flat arrays.
+
+    Attributes:
+        phonemes: The phoneme code of every phoneme, fragment after fragment.
+        starts: The absolute start time of every phoneme, in seconds.
+        ends: The absolute end time of every phoneme, in seconds.
+        offsets: The position of the first phoneme of every fragment,
+            followed by the total number of phonemes, so fragment ``i``
+            spans from ``offsets[i]`` to ``offsets[i + 1]``.
+    """
+
+    phonemes: numpy.ndarray
+    starts: numpy.ndarray
+    ends: numpy.ndarray
+    offsets: numpy.ndarray
+
+    @classmethod
+    def from_corpus(self, corpus: Corpus) -> "Columns":
+        """Flatten a corpus.
+
+        Arguments:
+            corpus: The corpus of libretto fragments.
+
+        Returns:
+            An instance of this class with all the phonemes of the corpus.
+        """
+        # Protocol buffer wrappers are quite slow for per-phoneme access, so
+        # read the underlying messages directly.
+        fragments = Corpus.pb(corpus).fragments
+        timed = [
+            phoneme for fragment in fragments for phoneme in fragment.phonemes
+        ]
+        lengths = [len(fragment.phonemes) for fragment in fragments]
+        return self(
+            numpy.array([item.phoneme for item in timed], dtype=numpy.uint8),
+            numpy.array([item.start for item in timed], dtype=numpy.float32),
+            numpy.array([item.end for item in timed], dtype=numpy.float32),
+            numpy.concatenate(([0], numpy.cumsum(lengths, dtype=numpy.int64))),
+        )
+
+    @classmethod
+    def load(self, path: Path, mmap: bool = True) -> "Columns":
+        """Load the columns from a file.
+
+        Arguments:
+            path: The path of the file, as written by :py:meth:`save`.
+            mmap: Whether to memory-map the arrays instead of reading them.
+
+        Returns:
+            An instance of this class with the arrays from the file.
+
+        Raises:
+            ValueError: If the file isn't a valid columns file.
+        """
+        try:
+            if mmap:
+                arrays = _mmap(path)
+            else:
+                with numpy.load(path) as data:
+                    arrays = {name: data[name] for name in data.files}
+            return self(*(arrays[name] for name in self._fields))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            raise ValueError("invalid columns file")
+
+    def save(self, file: BinaryIO):
+        """Save the columns as an uncompressed NumPy archive.
+
+        Arguments:
+            file: A binary stream to write the archive to.
+        """
+        numpy.savez(file, **self._asdict())
+
+
+def summary(columns: Columns) -> Dict[str, dict]:
+    """Summarize the phoneme durations and fragment lengths of a corpus.
+
+    Arguments:
+        columns: The corpus columns.
+
+    Returns:
+        A dictionary, suitable for serializing as JSON, with a ``phonemes``
+        key holding the count and duration statistics of every phoneme, by
+        name, and a ``fragments`` key holding the statistics of the number of
+        phonemes and duration of the fragments.
+    """
+    durations = (columns.ends - columns.starts).astype(numpy.float64)
+    counts = numpy.bincount(columns.phonemes, minlength=len(Phoneme))
+    sums = numpy.bincount(columns.phonemes, durations, minlength=len(Phoneme))
+
+    # Sort durations by phoneme, so each phoneme takes a contiguous range and
+    # percentiles are just interpolated indexes into it.
+    order = numpy.lexsort((durations, columns.phonemes))
+    ordered = durations[order]
+    firsts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+    present = counts > 0
+    quantiles = {
+        name: _quantiles(ordered, firsts[present], counts[present], quantile)
+        for name, quantile in [
+            ("min", 0.0),
+            ("max", 1.0),
+            *((f"p{value}", value / 100) for value in PERCENTILES),
+        ]
+    }
+
+    phonemes = {}
+    for rank, code in enumerate(numpy.flatnonzero(present)):
+        phonemes[Phoneme(code).name] = {
+            "count": int(counts[code]),
+            "mean": float(sums[code] / counts[code]),
+            **{
+                name: float(values[rank]) for name, values in quantiles.items()
+            },
+        }
+
+    lengths = numpy.diff(columns.offsets)
+    nonempty = lengths > 0
+    spans = numpy.zeros(len(lengths))
+    spans[nonempty] = (
+        columns.ends[columns.offsets[1:][nonempty] - 1]
+        - columns.starts[columns.offsets[:-1][nonempty]]
+    )
+    return {
+        "phonemes": phonemes,
+        "fragments": {
+            "count": len(lengths),
+            "phonemes": _statistics(lengths),
+            "duration": _statistics(spans),
+        },
+    }
+
+
+def _quantiles(
+    values: numpy.ndarray,
+    firsts: numpy.ndarray,
+    counts: numpy.ndarray,
+    quantile: float,
+) -> numpy.ndarray:
+    """Calculate a quantile of many sorted groups at once.
+
+    Arguments:
+        values: The values of every group, sorted within each group.
+        firsts: The position of the first value of every group.
+        counts: The number of values of every group; all greater than zero.
+        quantile: The quantile, between 0 and 1.
+
+    Returns:
+        The quantile of every group, with linear interpolation.
+    """
+    positions = firsts + (counts - 1) * quantile
+    lower = numpy.floor(positions).astype(numpy.int64)
+    upper = numpy.minimum(lower + 1, firsts + counts - 1)
+    weights = positions - lower
+    return values[lower] * (1 - weights) + values[upper] * weights
+
+
+def _statistics(values: numpy.ndarray) -> Dict[str, float]:
+    """Summarize some values.
+
+    Arguments:
+        values: The values.
+
+    Returns:
+        The mean, minimum, maximum and percentiles of the values.
+    """
+    if not len(values):
+        return {}
+    return {
+        "mean": float(numpy.mean(values)),
+        "min": float(numpy.min(values)),
+        "max": float(numpy.max(values)),
+        **{
+            f"p{percentile}": float(value)
+            for percentile, value in zip(
+                PERCENTILES, numpy.percentile(values, PERCENTILES)
+            )
+        },
+    }
+
+
+def _mmap(path: Path) -> Dict[str, numpy.ndarray]:
+    """Memory-map the arrays of an uncompressed NumPy archive.
+
+    Unlike :py:func:`numpy.load`, which reads every array of an archive into
+    memory, this maps the data of every stored member in place.
+
+    Arguments:
+        path: The path of the archive.
+
+    Returns:
+        The read-only arrays of the archive, by name.
+
+    Raises:
+        ValueError: If some member is compressed or isn't a valid array.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as file:
+        for member in archive.infolist():
+            if member.compress_type != zipfile.ZIP_STORED:
+                raise ValueError("compressed archive member")
+            # Skip the local header, whose extra field may differ from the
+            # one in the central directory.
+            file.seek(member.header_offset + 26)
+            sizes = numpy.frombuffer(file.read(4), dtype="<u2")
+            file.seek(int(sizes.sum()), 1)
+            version = numpy.lib.format.read_magic(file)
+            if version == (1, 0):
+                header = numpy.lib.format.read_array_header_1_0(file)
+            elif version == (2, 0):
+                header = numpy.lib.format.read_array_header_2_0(file)
+            else:
+                raise ValueError("unsupported array format")
+
+            shape, fortran, dtype = header
+            name = member.filename.removesuffix(".npy")
+            if not numpy.prod(shape):  # Empty files can't be mapped.
+                arrays[name] = numpy.empty(shape, dtype)
+                continue
+            arrays[name] = numpy.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=file.tell(),
+                shape=shape,
+                order="F" if fortran else "C",
+            )
+    return arrays
@@ -1,9 +1,14 @@
 """Tool to download, upload, import, export and analyze Blob Opera data."""
 
+import cProfile
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
 import typer
 
 from ..backend import Backend
-from . import jitter, libretto, recording
+from . import common, jitter, libretto, recording, server, synthetic
 
 
 def main(
@@ -12,26 +17,46 @@ def main(
     private_host: str = Backend.private,
     static_host: str = Backend.static,
     shortener_host: str = Backend.shortener,
+    scheme: str = Backend.scheme,
+    profile: bool = False,
+    profile_output: Optional[Path] = None,
+    profile_format: common.ProfileFormat = common.DefaultProfileFormat,
 ):
     """Initialize a backend instance to be shared amongst subcommands.
 
     Note:
-        This function acts as the main application callback, and its only
-        purpose is creating a singleton (more or less) backend object.
+        This function acts as the main application callback, and its main
+        purpose is creating a singleton (more or less) backend object. When
+        profiling is enabled, it also starts a profiler that will be stopped
+        after running the subcommand, printing a summary of the hottest
+        functions to the standard error and, if an output file is given,
+        saving the complete results in the requested format.
     """
     context.obj = Backend(
-        public_host, private_host, static_host, shortener_host
+        public_host, private_host, static_host, shortener_host, scheme
     )
 
+    if profile or profile_output:
+        profiler = cProfile.Profile()
+        context.call_on_close(
+            partial(common.profile, profiler, profile_output, profile_format)
+        )
+        profiler.enable()
+
 
 # Create the application with the documentation string and the main callback.
 application = typer.Typer(help=__doc__.splitlines()[0], callback=main)
 
 
 # Add each command to the main application.
-for command in jitter, libretto, recording:
+for command in jitter, libretto, recording, synthetic:
     application.add_typer(
         command.application,
         name=command.__name__.split(".")[-1],  # Last component.
         help=command.__doc__,  # Documentation string.
     )
+
+
+# Add the backend emulator commands to the main application.
+application.command("serve-mock")(server.serve)
+application.command("load-test")(server.load)
@@ -4,14 +4,21 @@ This file provides data import functions and some shared defaults and
 enumerations used by choice-like subcommand options.
 """
 
+import cProfile
+import io
+import pstats
+from collections import defaultdict
 from enum import Enum
-from typing import Type
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Type, Union
 
 import typer
 from google.protobuf.json_format import ParseError
 from google.protobuf.message import DecodeError, EncodeError
 from proto import Message  # type: ignore
 
+from .. import archive
+
 
 class ConvertFormat(str, Enum):
     JSON = "JSON"
@@ -109,6 +116,67 @@ DefaultInterfaceLocation = typer.Option(
 )
 
 
+class TimingsFormat(str, Enum):
+    JSON = "JSON"
+
+
+DefaultTimingsFormat = typer.Option(None, case_sensitive=False)
+
+
+class ImportEngine(str, Enum):
+    MUSIC21 = "MUSIC21"
+    NATIVE = "NATIVE"
+
+
+DefaultImportEngine = typer.Option(None, case_sensitive=False)
+
+
+class PackCompression(str, Enum):
+    NONE = "NONE"
+    ZLIB = "ZLIB"
+    LZMA = "LZMA"
+
+
+DefaultPackCompression = typer.Option(
+    PackCompression.NONE, case_sensitive=False
+)
+DefaultUnpackFormat = typer.Option(ConvertFormat.BINARY, case_sensitive=False)
+
+
+class StatsFormat(str, Enum):
+    JSON = "JSON"
+    CSV = "CSV"
+
+
+DefaultStatsFormat = typer.Option(StatsFormat.JSON, case_sensitive=False)
+
+
+class PlotFormat(str, Enum):
+    PNG = "PNG"
+    SVG = "SVG"
+
+
+DefaultPlotFormat = typer.Option(PlotFormat.PNG, case_sensitive=False)
+
+
+class LibrettoExportFormat(str, Enum):
+    TEXT = "TEXT"
+    NPZ = "NPZ"
+
+
+DefaultLibrettoExportFormat = typer.Option(
+    LibrettoExportFormat.TEXT, case_sensitive=False
+)
+
+
+class ProfileFormat(str, Enum):
+    PSTATS = "PSTATS"
+    COLLAPSED = "COLLAPSED"
+
+
+DefaultProfileFormat = typer.Option(ProfileFormat.PSTATS, case_sensitive=False)
+
+
 def parse(data: bytes, message: Type[Message]) -> Message:
     """Parse a Protocol Buffer message from any of its representations.
 
@@ -119,6 +187,34 @@ def parse(data: bytes, message: Type[Message]) -> Message:
     Returns:
         An instance of the given message type.
     """
+    try:
+        return decode(data, message)
+    except ValueError:
+        # Does not seem to be a valid recording message.
+        typer.echo("Error: Invalid input file.", err=True)
+        raise typer.Exit(code=1)
+
+
+def decode(data: Union[bytes, ValueError], message: Type[Message]) -> Message:
+    """Decode a Protocol Buffer message from any of its representations.
+
+    Unlike :py:func:`parse`, this function doesn't exit on invalid data.
+
+    Arguments:
+        data: the input data, either raw protocol buffer bytes or JSON bytes,
+            or the error raised while reading it, as yielded by
+            :py:func:`recordings` for corrupt pack entries.
+        message: the class (not an instance!) of the protocol buffer message.
+
+    Returns:
+        An instance of the given message type.
+
+    Raises:
+        ValueError: If the data isn't a valid message of the given type, or
+            couldn't be read.
+    """
+    if isinstance(data, ValueError):
+        raise data
     try:
         try:
             # Try to interpret the input data as a JSON object.
@@ -129,11 +225,8 @@ def parse(data: bytes, message: Type[Message]) -> Message:
             result = message.deserialize(data)
             message.serialize(result)  # Sanity check.
     except (EncodeError, DecodeError):
-        # Does not seem to be a valid recording message.
-        typer.echo("Error: Invalid input file.", err=True)
-        raise typer.Exit(code=1)
-    else:
-        return result
+        raise ValueError("invalid input file")
+    return result
 
 
 def convert(
@@ -159,3 +252,119 @@ def convert(
         raise ValueError("invalid format")
 
     return data
+
+
+def profile(
+    profiler: cProfile.Profile,
+    output: Optional[Path],
+    format: ProfileFormat,
+    limit: int = 20,
+):
+    """Stop a profiler, save its results and print the hottest functions.
+
+    Arguments:
+        profiler: the running profiler.
+        output: the file for the profile results, if any.
+        format: the format of the profile results file.
+        limit: the number of functions to include in the summary.
+    """
+    profiler.disable()
+    stats = pstats.Stats(profiler, stream=(summary := io.StringIO()))
+
+    if output and format == ProfileFormat.PSTATS:
+        stats.dump_stats(output)
+    elif output and format == ProfileFormat.COLLAPSED:
+        with open(output, "w") as file:
+            for stack, microseconds in collapse(stats):
+                print(stack, microseconds, file=file)
+
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    typer.echo(summary.getvalue().strip("\n"), err=True)
+
+
+def collapse(stats: pstats.Stats) -> Iterator[tuple]:
+    """Reconstruct collapsed call stacks from profile statistics.
+
+    Deterministic profilers only record caller and callee pairs, so the
+    time of each function is split amongst the stacks that lead to it in
+    proportion to the time recorded for each one of its callers. Recursive
+    calls are folded into the first occurrence of the function in the stack.
+
+    Arguments:
+        stats: the profile statistics.
+
+    Yields:
+        Pairs of semicolon-separated stacks and self time in microseconds,
+        ready for flame graph tools.
+    """
+    callees: dict = defaultdict(dict)
+    for function, (*_, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees[caller][function] = edge
+
+    def label(function: tuple) -> str:
+        file, line, name = function
+        return name if file == "~" else f"{name} ({Path(file).name}:{line})"
+
+    def walk(function: tuple, stack: tuple, share: float) -> Iterator[tuple]:
+        _, _, own, _, _ = stats.stats[function]
+        stack = (*stack, function)
+        if (microseconds := round(own * share * 1e6)) > 0:
+            yield ";".join(map(label, stack)), microseconds
+        for callee, (*_, time) in callees[function].items():
+            if callee in stack or not (whole := stats.stats[callee][3]):
+                continue
+            if (fraction := share * time / whole) * whole >= 1e-6:
+                yield from walk(callee, stack, fraction)
+
+    for function, (*_, callers) in stats.stats.items():
+        if not callers:
+            yield from walk(function, (), 1.0)
+
+
+def recordings(
+    inputs: List[Path],
+) -> Iterator[Tuple[str, str, Union[bytes, ValueError]]]:
+    """Read the recordings of some files, pack archives and directories.
+
+    Arguments:
+        inputs: The paths of recording files, pack archives or directories,
+            whose files get read recursively.
+
+    Yields:
+        The name, entry name and raw data of every recording. Names are the
+        path of the file or, for pack entries, the path of the archive
+        followed by a colon and the entry name. Entry names are relative, as
+        in packs: the path of the file, relative to the given directory and
+        without its extension or, for pack entries, the entry name, under
+        the relative path of the archive if inside a directory. Corrupt pack
+        entries get the error raised while reading them instead of their
+        data, so :py:func:`decode` reports them like any invalid file.
+    """
+    for input in inputs:
+        if input.is_dir():
+            files = sorted(path for path in input.rglob("*") if path.is_file())
+            names = [path.relative_to(input) for path in files]
+        else:
+            files, names = [input], [Path(input.name)]
+
+        for path, name in zip(files, names):
+            entry = name.with_suffix("").as_posix()
+            with open(path, "rb") as file:
+                magic = file.read(len(archive.MAGIC))
+            if magic != archive.MAGIC:
+                yield str(path), entry, path.read_bytes()
+                continue
+            try:
+                pack = archive.Archive(path)
+            except ValueError:  # Broken archives are just invalid files.
+                yield str(path), entry, path.read_bytes()
+                continue
+            prefix = f"{entry}/" if input.is_dir() else ""
+            with pack:
+                for item in pack:
+                    try:
+                        data: Union[bytes, ValueError] = pack.read(item)
+                    except ValueError as error:
+                        data = error
+                    yield f"{path}:{item}", prefix + item, data
@@ -1,12 +1,16 @@
-"""Inspect the default set of audio jitter templates."""
+"""Inspect audio jitter templates and apply them to recordings."""
 
+import json
 from itertools import islice
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 
 import requests
 import typer
 
+from .. import jitter as humanize
 from ..jitter import Generator, Jitter
+from ..recording import Recording
 from . import common
 
 application = typer.Typer()
@@ -19,7 +23,7 @@ def download(
     format: common.DownloadFormat = common.DefaultDownloadFormat,
 ):
     """Download the default file with jitter templates from the server."""
-    base: str = f"https://{context.obj.static}/blob-opera"
+    base: str = f"{context.obj.scheme}://{context.obj.static}/blob-opera"
     address: str = f"{base}/jittertemplates.proto"
     content: bytes = requests.get(address).content
 
@@ -48,7 +52,86 @@ def generate(
 ):
     """Generate pseudorandom jitters from a file with jitter templates."""
     jitter: Jitter = common.parse(input.read(), Jitter)
-    generator: Generator = Generator(jitter, seed=seed)
+    try:
+        generator: Generator = Generator(jitter, seed=seed)
+    except ValueError as error:
+        typer.echo(f"Error: {error}.", err=True)
+        raise typer.Exit(code=1)
 
     for value in islice(generator, count):
         print(value, file=output)
+
+
+@application.command()
+def apply(
+    input: typer.FileBinaryRead = typer.Argument(...),
+    output: Path = typer.Argument(..., file_okay=False),
+    recordings: List[Path] = typer.Argument(..., exists=True),
+    time_depth: float = typer.Option(0.02, min=0.0),
+    pitch_depth: float = typer.Option(0.0, min=0.0),
+    seed: Optional[int] = None,
+    format: common.ConvertFormat = common.DefaultUnpackFormat,
+    curves: bool = False,
+):
+    """Humanize recording files with pseudorandom jitters.
+
+    Recordings can be files, in any of the internal formats, pack archives,
+    whose entries get humanized one by one, or directories, whose files get
+    humanized recursively. Every note gets its time and pitch shifted by
+    jitter values from the given file with jitter templates, scaled so the
+    largest one reaches the given depth, in seconds and semitones.
+
+    Humanized recordings are written to files in the output directory named
+    like pack entries, with the extension of the output format; every one
+    gets a different seed, derived from the given one. The deviations of
+    every note can also be written next to them, as JSON curves; invalid
+    recordings get reported and skipped, and make the exit code nonzero.
+    """
+    jitter: Jitter = common.parse(input.read(), Jitter)
+    extension = format.value.lower()
+    try:
+        humanize.check(jitter)
+    except ValueError as error:
+        typer.echo(f"Error: {error}.", err=True)
+        raise typer.Exit(code=1)
+
+    invalid = 0
+    planned = set()
+    for index, (name, entry, data) in enumerate(common.recordings(recordings)):
+        path = output / f"{entry}.{extension}"
+        sidecar = output / f"{entry}.curves.json"
+        if not path.resolve().is_relative_to(output.resolve()):
+            typer.echo(f"Error: invalid entry name: {entry}.", err=True)
+            raise typer.Exit(code=1)
+        # Curves of some entries may also clash with other JSON outputs.
+        paths = (
+            {path.resolve(), sidecar.resolve()} if curves else {path.resolve()}
+        )
+        if paths & planned:
+            typer.echo(f"Error: duplicate entry name: {entry}.", err=True)
+            raise typer.Exit(code=1)
+        planned |= paths
+
+        try:
+            recording = common.decode(data, Recording)
+        except ValueError as error:
+            typer.echo(f"Error: {name}: {error}.", err=True)
+            invalid += 1
+            continue
+
+        deviations = humanize.curves(
+            recording,
+            jitter,
+            time=time_depth,
+            pitch=pitch_depth,
+            seed=None if seed is None else seed + index,
+        )
+        result = Recording.serialize(humanize.apply(recording, deviations))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(common.convert(result, format, message=Recording))
+        if curves:
+            sidecar.write_text(json.dumps(deviations.to_dict()))
+
+    if invalid:
+        raise typer.Exit(code=1)
@@ -1,8 +1,14 @@
 """Inspect the default corpus of libretto texts."""
 
+import json
+from pathlib import Path
+from typing import Optional
+
 import requests
 import typer
 
+from ..columns import Columns, summary
+from ..index import SIZE, Index
 from ..libretto import Corpus
 from ..phoneme import Phoneme
 from . import common
@@ -17,7 +23,7 @@ def download(
     format: common.DownloadFormat = common.DefaultDownloadFormat,
 ):
     """Download the corpus of default recorded librettos from the server."""
-    base: str = f"https://{context.obj.static}/blob-opera"
+    base: str = f"{context.obj.scheme}://{context.obj.static}/blob-opera"
     address: str = f"{base}/recordedlibrettos.proto"
     content: bytes = requests.get(address).content
 
@@ -40,13 +46,90 @@ def convert(
 @application.command()
 def export(
     input: typer.FileBinaryRead = typer.Argument(...),
-    output: typer.FileTextWrite = typer.Argument(...),
+    output: typer.FileBinaryWrite = typer.Argument(...),
+    format: common.LibrettoExportFormat = common.DefaultLibrettoExportFormat,
 ):
-    """Export phonemes of recorded libretto in a human-friendly format."""
+    """Export phonemes of recorded libretto in a human-friendly format.
+
+    The text format has a line per fragment, with the phoneme names separated
+    by spaces and hyphens for silences; the NPZ format holds NumPy arrays
+    with the code, start and end time of every phoneme, and the offset of
+    every fragment, which can be memory-mapped for quick analysis.
+    """
     corpus: Corpus = common.parse(input.read(), Corpus)
 
+    if format == common.LibrettoExportFormat.NPZ:
+        Columns.from_corpus(corpus).save(output)
+        return
+
     for fragment in corpus.fragments:
         hyphenated = " ".join(
             Phoneme(timed.phoneme).name for timed in fragment.phonemes
         ).replace(Phoneme.SILENCE.name, "-")
-        print(hyphenated, file=output)
+        output.write(f"{hyphenated}\n".encode())
+
+
+@application.command()
+def stats(
+    input: Path = typer.Argument(..., exists=True, dir_okay=False),
+):
+    """Summarize the phoneme durations and fragment lengths of a corpus.
+
+    The input can be a corpus in any of the internal formats or an NPZ
+    export, and the summary is printed as JSON.
+    """
+    try:
+        columns = Columns.load(input)
+    except ValueError:
+        columns = Columns.from_corpus(common.parse(input.read_bytes(), Corpus))
+    typer.echo(json.dumps(summary(columns), indent=2))
+
+
+@application.command()
+def index(
+    input: typer.FileBinaryRead = typer.Argument(...),
+    output: Path = typer.Argument(..., dir_okay=False),
+    size: int = typer.Option(SIZE, min=1, max=8),
+):
+    """Build a phoneme search index for a corpus of recorded librettos.
+
+    The index holds every sequence of consecutive phonemes with the given
+    size, so searches only need to check a few candidate positions.
+    """
+    corpus: Corpus = common.parse(input.read(), Corpus)
+    Index.from_corpus(corpus, size).save(output)
+
+
+@application.command()
+def search(
+    index: Path = typer.Argument(..., exists=True, dir_okay=False),
+    query: str = typer.Argument(...),
+    limit: Optional[int] = typer.Option(None, min=1),
+):
+    """Search a sequence of phonemes in a libretto index.
+
+    The query holds phoneme names separated by spaces, like in the exported
+    librettos, with hyphens for silences. Every match is printed on its own
+    line with the fragment number, the phoneme offset in the fragment, and
+    the start and end times in seconds, separated by tabs.
+    """
+    try:
+        phonemes = [
+            Phoneme.SILENCE if name == "-" else Phoneme[name.upper()]
+            for name in query.split()
+        ]
+    except KeyError as error:
+        typer.echo(f"Error: unknown phoneme: {error.args[0]}.", err=True)
+        raise typer.Exit(code=1)
+
+    try:
+        table = Index.load(index)
+    except ValueError as error:
+        typer.echo(f"Error: {error}.", err=True)
+        raise typer.Exit(code=1)
+
+    for match in table.search(phonemes, limit):
+        typer.echo(
+            f"{match.fragment}\t{match.offset}\t"
+            f"{match.start:.3f}\t{match.end:.3f}"
+        )
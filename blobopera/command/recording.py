@@ -1,11 +1,43 @@
 """Operate with recording files and scores."""
 
+import csv
+import io
+import json
+import os
+import struct
 import tempfile
+import zipfile
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
+from time import perf_counter
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from xml.etree import ElementTree
 
 import music21  # type: ignore
 import typer
 
+from .. import archive, midi, musicxml, stats, synthesis, timing, validation
+from .. import plot as plotting
+from .. import watch as watching
+from ..cache import Cache
+from ..jitter import Jitter
 from ..languages import GenericLanguage, RandomLanguage
 from ..location import Location
 from ..phoneme import Phoneme
@@ -95,6 +127,15 @@ def _import(  # Prepend an underscore because import is a reserved keyword.
     tenor_part: int = -2,
     bass_part: int = -1,
     tempo: float = 1.0,
+    timings: Optional[common.TimingsFormat] = common.DefaultTimingsFormat,
+    engine: Optional[common.ImportEngine] = common.DefaultImportEngine,
+    incremental: bool = False,
+    optimize: bool = False,
+    watch: bool = False,
+    watch_directory: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False
+    ),
+    debounce: float = typer.Option(watching.DEBOUNCE, min=0.0),
 ):
     """Import a recording from a musical score file.
 
@@ -123,40 +164,73 @@ def _import(  # Prepend an underscore because import is a reserved keyword.
 
         Tempo: this value modifies the global tempo by the specified amount;
         0.5 would slow down the piece to half its original speed, and 2.0
-        would make it twice as quicker.
+        would make it twice as quicker. Every metronome mark of the score is
+        honored, and scores without them play a quarter note per second.
 
         Location: the location (i.e. background image) of the recording, like
         e.g. Seoul or London.
-    """
 
+        Timings: print the time spent on each stage of the conversion, along
+        with some counters, to the standard error in the given format.
+
+        Engine: the parser used for reading the score; the native engine only
+        supports MIDI and MusicXML files, but reads MIDI files much faster,
+        and reads MusicXML files measure by measure, with bounded memory use,
+        although metronome marks only affect their part and the following
+        ones. By default, MIDI files use the native engine and the rest of
+        formats use music21.
+
+        Incremental: keep the conversion results of every measure in a cache
+        file next to the output file, so subsequent imports only convert
+        the measures that changed; it requires the native engine and a
+        MusicXML file, and language parsers only see the current measure.
+
+        Optimize: merge tied notes, vowel continuations and consecutive
+        rests, and drop fields holding default values, so recordings are
+        smaller and lighter to play; the size reduction gets reported.
+
+        Watch: keep running and import the score again whenever it changes,
+        once it stops changing for the debounce time, in seconds; scores in
+        the watch directory, if any, are imported too, next to them.
+    """
     if language == common.PhonemeLanguage.GENERIC:
         language = GenericLanguage
     if language == common.PhonemeLanguage.RANDOM:
         language = RandomLanguage
 
-    score = music21.converter.parse(input)
-    parts = soprano_part, alto_part, tenor_part, bass_part
-
-    if len(score.parts) == 0:
-        typer.echo("Error: no parts detected.", err=True)
-        raise typer.Exit(code=1)
-    elif len(score.parts) == 1:
-        parts = (0, 0, 0, 0)  # Assign the same part to all the voices.
-
-    recording = Recording.from_score(
-        score=score,
-        theme=Theme[theme.value],
+    convert = partial(
+        _score,
+        format=format,
+        theme=theme,
         language=language,
+        fill=fill,
+        location=location,
+        parts=(soprano_part, alto_part, tenor_part, bass_part),
         tempo=tempo,
-        parts=parts,
-        fill=Phoneme[fill.value],
-        location=Location[location.value],
+        timings=timings,
+        engine=engine,
+        incremental=incremental,
+        optimize=optimize,
     )
 
-    output.write(
-        common.convert(
-            Recording.serialize(recording), format, message=Recording
-        )
+    if not watch:
+        # Standard output doesn't have any name, nor place for a cache.
+        name = None if output.name.startswith("<") else output.name
+        convert(input, output, Path(f"{name}.cache") if name else None)
+        return
+
+    if output.name.startswith("<"):
+        typer.echo("Error: watch mode requires an output file.", err=True)
+        raise typer.Exit(code=1)
+
+    output.close()
+    _watch(
+        convert,
+        input,
+        Path(output.name),
+        watch_directory,
+        "." + format.value.lower(),
+        debounce,
     )
 
 
@@ -172,10 +246,572 @@ def export(
     converting phonemes to lyrics whenever possible (not supported for the
     MIDI format) and mapping times and pitches to actual notes and rests.
     """
-    stream = common.parse(input.read(), Recording).to_score()
+    recording = common.parse(input.read(), Recording)
+
+    if format == common.ExportFormat.MIDI:
+        midi.write(recording, output)
+        return
+    elif format == common.ExportFormat.MUSICXML:
+        musicxml.write(recording, output)
+        return
+
+    stream = recording.to_score()
 
     # Exports in music21 override file extensions and have erratic behavior.
     with tempfile.TemporaryDirectory() as directory:
         path = stream.write(format, fp=Path(directory) / "file")
         with open(path, "rb") as data:
             output.write(data.read())
+
+
+@application.command()
+def pack(
+    output: Path = typer.Argument(..., dir_okay=False),
+    inputs: List[Path] = typer.Argument(..., exists=True),
+    compression: common.PackCompression = common.DefaultPackCompression,
+):
+    """Pack many recording files into a single archive.
+
+    Inputs can be recording files, in any of the internal formats, or
+    directories, whose files get packed recursively. Entries are named after
+    the path of every file, relative to the given directory, and without its
+    extension. Invalid recordings get reported, and the archive only gets
+    written if there aren't any.
+    """
+    method = archive.Compression[compression.value]
+    # Write to a temporary file next to the output, so failed packs never
+    # replace it.
+    temporary = output.with_name(f".{output.name}.partial")
+    invalid = 0
+    try:
+        file = open(temporary, "wb")
+        with file, archive.Writer(file, method) as writer:
+            for input in inputs:
+                if input.is_dir():
+                    files = sorted(
+                        path for path in input.rglob("*") if path.is_file()
+                    )
+                    names = [path.relative_to(input) for path in files]
+                else:
+                    files, names = [input], [Path(input.name)]
+
+                for path, name in zip(files, names):
+                    try:
+                        recording = common.decode(path.read_bytes(), Recording)
+                    except ValueError as error:
+                        typer.echo(f"Error: {path}: {error}.", err=True)
+                        invalid += 1
+                        continue
+                    try:
+                        writer.add(
+                            name.with_suffix("").as_posix(),
+                            Recording.serialize(recording),
+                        )
+                    except ValueError as error:
+                        typer.echo(f"Error: {error}.", err=True)
+                        raise typer.Exit(code=1)
+
+            if invalid:
+                raise typer.Exit(code=1)
+        os.replace(temporary, output)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+@application.command()
+def unpack(
+    input: Path = typer.Argument(..., exists=True, dir_okay=False),
+    output: Path = typer.Argument(..., file_okay=False),
+    names: Optional[List[str]] = typer.Argument(None),
+    format: common.ConvertFormat = common.DefaultUnpackFormat,
+):
+    """Unpack recording files from an archive into a directory.
+
+    Every entry, or just the given ones, gets written to a file named after
+    the entry, with the extension of the output format; corrupt entries get
+    reported and skipped, and make the exit code nonzero.
+    """
+    try:
+        pack = archive.Archive(input)
+    except ValueError as error:
+        typer.echo(f"Error: {error}.", err=True)
+        raise typer.Exit(code=1)
+
+    invalid = 0
+    with pack:
+        for name in names or pack.names():
+            if name not in pack:
+                typer.echo(f"Error: entry not found: {name}.", err=True)
+                raise typer.Exit(code=1)
+            path = output / f"{name}.{format.value.lower()}"
+            if not path.resolve().is_relative_to(output.resolve()):
+                typer.echo(f"Error: invalid entry name: {name}.", err=True)
+                raise typer.Exit(code=1)
+            try:
+                data = pack.read(name)
+            except ValueError as error:
+                typer.echo(f"Error: {error}.", err=True)
+                invalid += 1
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(common.convert(data, format, message=Recording))
+
+    if invalid:
+        raise typer.Exit(code=1)
+
+
+@application.command("stats")
+def _stats(  # Prepend an underscore to avoid shadowing the stats module.
+    inputs: List[Path] = typer.Argument(..., exists=True),
+    format: common.StatsFormat = common.DefaultStatsFormat,
+):
+    """Summarize the notes and phonemes of recording files.
+
+    Inputs can be recording files, in any of the internal formats, pack
+    archives, whose entries get summarized one by one, or directories, whose
+    files get summarized recursively. The statistics of every part get
+    aggregated over all the recordings: number of notes, rests and
+    syllables, total duration, note density, rest ratio, syllables per
+    note, pitch range and histogram and phoneme frequencies, along with the
+    totals of every part.
+
+    Statistics are printed as JSON or as CSV, with a row for every part and
+    another one for the totals; invalid recordings get reported and skipped,
+    and make the exit code nonzero.
+    """
+    count = invalid = 0
+    parts: List[stats.Summary] = []
+    for name, _, data in common.recordings(inputs):
+        try:
+            recording = common.decode(data, Recording)
+        except ValueError as error:
+            typer.echo(f"Error: {name}: {error}.", err=True)
+            invalid += 1
+            continue
+        parts = stats.merge(parts, stats.summarize(recording))
+        count += 1
+
+    total = stats.Summary.empty()
+    for part in parts:
+        total = total.merge(part)
+
+    if format == common.StatsFormat.JSON:
+        result = {
+            "recordings": count,
+            "parts": [part.to_dict() for part in parts],
+            "total": total.to_dict(),
+        }
+        typer.echo(json.dumps(result, indent=2))
+    elif format == common.StatsFormat.CSV:
+        rows = [
+            {"part": index, **part.to_row()}
+            for index, part in enumerate(parts)
+        ]
+        rows.append({"part": "total", **total.to_row()})
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        typer.echo(output.getvalue(), nl=False)
+
+    if invalid:
+        raise typer.Exit(code=1)
+
+
+@application.command()
+def plot(
+    output: Path = typer.Argument(..., file_okay=False),
+    inputs: List[Path] = typer.Argument(..., exists=True),
+    format: common.PlotFormat = common.DefaultPlotFormat,
+    labels: bool = True,
+    jobs: Optional[int] = typer.Option(None, min=1),
+):
+    """Render the piano rolls of recording files.
+
+    Inputs can be recording files, in any of the internal formats, pack
+    archives, whose entries get rendered one by one, or directories, whose
+    files get rendered recursively. Every recording gets drawn with a bar
+    for every sung note of every part and, optionally, its lyrics, and
+    written to a file in the output directory named like pack entries, with
+    the extension of the output format.
+
+    Recordings get rendered on the given number of worker processes, by
+    default one for every processor; invalid recordings get reported and
+    skipped, and make the exit code nonzero.
+    """
+    extension = format.value.lower()
+
+    def plan() -> Iterator[Tuple[str, tuple]]:
+        """Check the output path of every recording."""
+        planned = set()
+        for name, entry, data in common.recordings(inputs):
+            path = output / f"{entry}.{extension}"
+            if not path.resolve().is_relative_to(output.resolve()):
+                typer.echo(f"Error: invalid entry name: {entry}.", err=True)
+                raise typer.Exit(code=1)
+            if path.resolve() in planned:
+                typer.echo(f"Error: duplicate entry name: {entry}.", err=True)
+                raise typer.Exit(code=1)
+            planned.add(path.resolve())
+            yield name, (data, path, extension, labels)
+
+    rendered = invalid = 0
+    for name, error in _run(_plot, plan(), jobs or os.cpu_count() or 1):
+        rendered += 1
+        if error:
+            typer.echo(f"Error: {name}: {error}.", err=True)
+            invalid += 1
+
+    typer.echo(
+        f"Rendered recordings: {rendered - invalid} of {rendered}.",
+        err=True,
+    )
+    if invalid:
+        raise typer.Exit(code=1)
+
+
+@application.command()
+def render(
+    input: typer.FileBinaryRead = typer.Argument(...),
+    output: typer.FileBinaryWrite = typer.Argument(...),
+    jitter: Optional[Path] = typer.Option(None, exists=True, dir_okay=False),
+    seed: Optional[int] = None,
+    jobs: Optional[int] = typer.Option(None, min=1),
+):
+    """Render an audio preview of a recording to a WAV file.
+
+    This command synthesizes a rough preview of the recording, so it can be
+    heard without uploading it: every part sings the vowel of every note,
+    with its pitch, and rests are silent; consonants are left out.
+
+    Options:
+        Jitter: a file with jitter templates, in any of the internal formats,
+        whose values get added to the pitch of every part, like the original
+        audio engine does; the seed makes the jitter reproducible.
+
+        Jobs: the number of worker processes rendering the parts, by default
+        one for every processor; audio gets written block by block, so
+        memory use doesn't depend on the length of the recording.
+    """
+    recording = common.parse(input.read(), Recording)
+    templates = common.parse(jitter.read_bytes(), Jitter) if jitter else None
+    try:
+        synthesis.render(
+            recording,
+            output,
+            jitter=templates,
+            seed=seed,
+            jobs=jobs or os.cpu_count() or 1,
+        )
+    except ValueError as error:
+        typer.echo(f"Error: {error}.", err=True)
+        raise typer.Exit(code=1)
+
+
+@application.command()
+def validate(inputs: List[Path] = typer.Argument(..., exists=True)):
+    """Check whether recording files can be played.
+
+    Inputs can be recording files, in any of the internal formats, pack
+    archives, whose entries get checked one by one, or directories, whose
+    files get checked recursively. Recordings must have four parts whose
+    notes are in order, with valid pitches and syllables starting with a
+    vowel or a silence, reasonable phoneme durations and a valid theme and
+    location.
+
+    Every problem gets printed, prefixed by the name of the recording; the
+    exit code is nonzero if any recording is invalid.
+    """
+    checked = invalid = 0
+    for name, _, data in common.recordings(inputs):
+        checked += 1
+        try:
+            problems = validation.validate(common.decode(data, Recording))
+        except ValueError as error:
+            problems = [validation.Problem(str(error))]
+        if problems:
+            invalid += 1
+        for problem in problems:
+            typer.echo(f"{name}: {problem}")
+
+    typer.echo(f"Invalid recordings: {invalid} of {checked}.", err=True)
+    if invalid:
+        raise typer.Exit(code=1)
+
+
+def _plot(
+    data: Union[bytes, ValueError], path: Path, format: str, labels: bool
+):
+    """Render the piano roll of a recording to a file.
+
+    Arguments:
+        data: The raw data of the recording, in any of the internal formats,
+            or the error raised while reading it; see
+            :py:func:`.common.recordings`.
+        path: The path of the image file; missing directories get created.
+        format: The image format, like png or svg.
+        labels: Whether to draw the lyrics of every note.
+
+    Raises:
+        ValueError: If the data isn't a valid recording.
+    """
+    recording = common.decode(data, Recording)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file:
+        plotting.render(recording, file, format, labels)
+
+
+def _run(
+    function: Callable, tasks: Iterable[Tuple[str, tuple]], jobs: int
+) -> Iterator[Tuple[str, Optional[ValueError]]]:
+    """Call a function with many sets of arguments, maybe on a process pool.
+
+    Only a few calls per worker are pending at any time, so tasks, and the
+    data they hold, are only consumed as workers become available.
+
+    Arguments:
+        function: The function to call, defined at module level, so it can
+            be sent to worker processes.
+        tasks: The name and the arguments of every call.
+        jobs: The number of worker processes; with a single one, every call
+            runs on the current process instead.
+
+    Yields:
+        The name of every task, in order of completion, along with the
+        ValueError raised by its call, if any; other errors get raised.
+    """
+    if jobs == 1:
+        for name, arguments in tasks:
+            try:
+                function(*arguments)
+            except ValueError as error:
+                yield name, error
+            else:
+                yield name, None
+        return
+
+    with ProcessPoolExecutor(jobs) as executor:
+        pending: Dict[Future, str] = {}
+        tasks = iter(tasks)
+        while True:
+            for name, arguments in tasks:
+                pending[executor.submit(function, *arguments)] = name
+                if len(pending) >= 2 * jobs:
+                    break
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                error = future.exception()
+                if error is not None and not isinstance(error, ValueError):
+                    raise error
+                yield name, error
+
+
+def _score(
+    input: Path,
+    output: BinaryIO,
+    cache: Optional[Path],
+    format: common.ImportOutputFormat,
+    theme: common.InterfaceTheme,
+    language,
+    fill: common.FillPhoneme,
+    location: common.InterfaceLocation,
+    parts: Tuple[int, int, int, int],
+    tempo: float,
+    timings: Optional[common.TimingsFormat],
+    engine: Optional[common.ImportEngine],
+    incremental: bool,
+    optimize: bool,
+):
+    """Import a single score, as the import command does.
+
+    Arguments:
+        input: The path of the score.
+        output: A binary stream to write the recording to.
+        cache: The path of the incremental import cache, if any.
+        format: The output format of the recording.
+        theme: The theme of the recording.
+        language: The language class used to interpret the lyrics.
+        fill: The phoneme used to fill parts without lyrics.
+        location: The location of the recording.
+        parts: The score part used for every voice.
+        tempo: The global tempo multiplier.
+        timings: The format of the timing report, if any.
+        engine: The score parser, if not the default one.
+        incremental: Whether to cache the conversion of every measure.
+        optimize: Whether to compact the recording.
+
+    Raises:
+        typer.Exit: If the score can't be imported.
+    """
+    standard = input.suffix.lower() in (".mid", ".midi")  # MIDI file.
+    native = engine == common.ImportEngine.NATIVE or (
+        engine is None and (standard or incremental)
+    )
+
+    store: Optional[Cache] = None
+    if incremental:
+        if standard or not native:
+            typer.echo(
+                "Error: incremental imports require the native engine "
+                "and a MusicXML file.",
+                err=True,
+            )
+            raise typer.Exit(code=1)
+        if cache is None:
+            typer.echo("Error: incremental imports require a file.", err=True)
+            raise typer.Exit(code=1)
+        store = Cache(cache)
+
+    with timing.record() if timings else nullcontext() as observer:
+        if native and not standard:
+            # MusicXML files are read and converted measure by measure.
+            try:
+                with musicxml.source(input) as file:
+                    recording = musicxml.read(
+                        file,
+                        theme=Theme[theme.value],
+                        language=language,
+                        tempo=tempo,
+                        parts=parts,
+                        fill=Phoneme[fill.value],
+                        location=Location[location.value],
+                        cache=store,
+                    )
+            except ValueError as error:
+                typer.echo(f"Error: {error}.", err=True)
+                raise typer.Exit(code=1)
+            except (ElementTree.ParseError, zipfile.BadZipFile, KeyError):
+                typer.echo("Error: invalid MusicXML file.", err=True)
+                raise typer.Exit(code=1)
+        else:
+            with observer.stage("parse") if observer else nullcontext():
+                if native:
+                    try:
+                        with open(input, "rb") as file:
+                            score = midi.score(midi.read(file))
+                    except (ValueError, IndexError, struct.error):
+                        typer.echo("Error: invalid MIDI file.", err=True)
+                        raise typer.Exit(code=1)
+                else:
+                    score = music21.converter.parse(input)
+
+            if len(score.parts) == 0:
+                typer.echo("Error: no parts detected.", err=True)
+                raise typer.Exit(code=1)
+
+            recording = Recording.from_score(
+                score=score,
+                theme=Theme[theme.value],
+                language=language,
+                tempo=tempo,
+                # Assign the same part to all the voices if there's one.
+                parts=parts if len(score.parts) > 1 else (0, 0, 0, 0),
+                fill=Phoneme[fill.value],
+                location=Location[location.value],
+            )
+
+        if store:
+            store.save()
+            if observer:
+                observer.count("hits", store.hits)
+                observer.count("misses", store.misses)
+
+        if optimize:
+            with observer.stage("optimize") if observer else nullcontext():
+                original = Recording.serialize(recording)
+                recording = recording.compact()
+
+        with observer.stage("serialize") if observer else nullcontext():
+            serialized = Recording.serialize(recording)
+            data = common.convert(serialized, format, message=Recording)
+
+    if optimize:
+        size = len(serialized)
+        typer.echo(
+            f"Optimized: {len(original)} to {size} bytes "
+            f"({1 - size / max(len(original), 1):.1%} smaller).",
+            err=True,
+        )
+
+    output.write(data)
+
+    if observer:
+        typer.echo(json.dumps(observer.to_dict(), indent=2), err=True)
+
+
+def _watch(
+    convert: Callable[[Path, BinaryIO, Optional[Path]], None],
+    input: Path,
+    target: Path,
+    directory: Optional[Path],
+    extension: str,
+    debounce: float,
+):
+    """Import scores again whenever they change, until interrupted.
+
+    Arguments:
+        convert: A function importing a score to a stream, with an optional
+            cache path, like :py:func:`_score` with its options bound.
+        input: The path of the main score.
+        target: The path of the main recording.
+        directory: A directory whose scores get imported next to them, with
+            the given extension, if any.
+        extension: The extension of the recordings of the directory scores.
+        debounce: The time for scores to stop changing, in seconds.
+    """
+    # Every score in the watched directory gets imported to a file with the
+    # same name, next to it, and with the extension of the output format.
+    scores = ".musicxml", ".xml", ".mxl", ".mid", ".midi"
+
+    def paths() -> List[Path]:
+        """List the watched files."""
+        result = [input]
+        if directory:
+            for path in sorted(directory.iterdir()):
+                if path.suffix.lower() in scores and path != input:
+                    result.append(path)
+        return result
+
+    def emit(source: Path, target: Path):
+        """Import a score, reporting any error instead of stopping."""
+        start = perf_counter()
+        # Keep the previous output around until the import succeeds.
+        buffer = io.BytesIO()
+        try:
+            convert(source, buffer, Path(f"{target}.cache"))
+        except typer.Exit:
+            return
+        # Files may be saved only partially, or removed while reading them.
+        except (
+            ValueError,
+            KeyError,
+            OSError,
+            ElementTree.ParseError,
+            zipfile.BadZipFile,
+            music21.exceptions21.Music21Exception,
+        ) as error:
+            typer.echo(f"Error: {source}: {error}", err=True)
+            return
+        target.write_bytes(buffer.getvalue())
+        elapsed = perf_counter() - start
+        typer.echo(f"Imported {source} in {elapsed:.2f} seconds.", err=True)
+
+    emit(input, target)
+    for path in paths()[1:]:
+        emit(path, path.with_suffix(extension))
+
+    typer.echo("Watching for changes; press Ctrl+C to stop.", err=True)
+    try:
+        for batch in watching.changes(paths, debounce=debounce):
+            for path in batch:
+                if not path.exists():
+                    continue
+                elif path == input:
+                    emit(path, target)
+                else:
+                    emit(path, path.with_suffix(extension))
+    except KeyboardInterrupt:
+        pass
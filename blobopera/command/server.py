@@ -0,0 +1,74 @@
+"""Emulate the backend servers locally and measure them under load."""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from ..backend import load as loading
+from ..backend.mock import MockServer
+from ..recording import Recording
+from . import common
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = typer.Option(8000, min=0, max=65535),
+    latency: float = typer.Option(0.0, min=0.0),
+    error_rate: float = typer.Option(0.0, min=0.0, max=1.0),
+    static_directory: Optional[Path] = typer.Option(
+        None, exists=True, file_okay=False
+    ),
+    seed: Optional[int] = None,
+):
+    """Serve a local emulator of the backend servers.
+
+    This command listens on the given host and port, playing the role of
+    every server used by the other commands: recording uploads and
+    downloads through signed file links, link shortening and static assets,
+    served from the given directory. Recordings are only kept in memory,
+    until the server gets stopped with Ctrl+C.
+
+    Point the other commands to it with the --scheme=http option and the
+    same host and port for every --*-host option.
+
+    Options:
+        Latency: the delay added to every request, in seconds.
+
+        Error rate: the ratio of requests that fail on purpose with a 503
+        status, between 0 and 1.
+    """
+    with MockServer(
+        (host, port), latency, error_rate, static_directory, seed
+    ) as server:
+        typer.echo(f"Serving on http://{server.host}", err=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def load(
+    context: typer.Context,
+    input: typer.FileBinaryRead = typer.Argument(...),
+    clients: int = typer.Option(8, min=1),
+    requests: int = typer.Option(100, min=1),
+    shorten: bool = False,
+):
+    """Measure the backend servers under concurrent load.
+
+    This command uploads the given recording file and downloads it back
+    as many times as requested, from the given number of concurrent
+    clients, optionally going through a short link, and prints the
+    throughput and the mean, median (p50) and 99th percentile (p99) latency
+    of every operation as JSON, in seconds.
+
+    Failed calls, including downloads with the wrong contents, are counted
+    as errors instead of stopping the test. Aim it at the serve-mock
+    command rather than at the real servers.
+    """
+    recording: Recording = common.parse(input.read(), Recording)
+    data: bytes = Recording.serialize(recording)
+    report = loading.run(context.obj, data, clients, requests, shorten)
+    typer.echo(json.dumps(report.to_dict(), indent=2))
@@ -0,0 +1,91 @@
+"""Generate synthetic scores and recordings for testing."""
+
+import tempfile
+from pathlib import Path
+
+import typer
+
+from .. import synthetic
+from ..phoneme import Phoneme
+from ..recording import Recording
+from . import common
+
+application = typer.Typer()
+
+
+@application.command()
+def score(
+    output: typer.FileBinaryWrite = typer.Argument(...),
+    notes: int = typer.Option(100, min=1),
+    parts: int = typer.Option(4, min=1),
+    lyrics: float = typer.Option(1.0, min=0.0, max=1.0),
+    rests: float = typer.Option(0.1, min=0.0, max=1.0),
+    chords: float = typer.Option(0.0, min=0.0, max=1.0),
+    lines: int = typer.Option(1, min=1),
+    seed: int = 0,
+):
+    """Generate a synthetic MusicXML score.
+
+    This command creates a deterministic pseudorandom score with the given
+    number of notes per part, suitable for testing the import command at
+    scale.
+
+    Options:
+        Lyrics: the ratio of notes with lyrics, between 0 and 1.
+
+        Rests: the ratio of rests, between 0 and 1.
+
+        Chords: the ratio of chords amongst the notes, between 0 and 1.
+
+        Lines: the number of lines of lyrics for each note with lyrics.
+    """
+    stream = synthetic.score(
+        notes,
+        parts,
+        lyrics=lyrics,
+        rests=rests,
+        chords=chords,
+        lines=lines,
+        seed=seed,
+    )
+
+    # Exports in music21 override file extensions and have erratic behavior.
+    with tempfile.TemporaryDirectory() as directory:
+        path = stream.write("MUSICXML", fp=Path(directory) / "file")
+        with open(path, "rb") as data:
+            output.write(data.read())
+
+
+@application.command()
+def recording(
+    output: typer.FileBinaryWrite = typer.Argument(...),
+    format: common.ImportOutputFormat = common.DefaultImportOutputFormat,
+    notes: int = typer.Option(100, min=1),
+    parts: int = typer.Option(4, min=1),
+    lyrics: float = typer.Option(1.0, min=0.0, max=1.0),
+    rests: float = typer.Option(0.1, min=0.0, max=1.0),
+    chords: float = typer.Option(0.0, min=0.0, max=1.0),
+    lines: int = typer.Option(1, min=1),
+    seed: int = 0,
+    fill: common.FillPhoneme = common.DefaultFillPhoneme,
+):
+    """Generate a synthetic recording.
+
+    This command creates the same recording that would be imported from the
+    score generated by the score command with the same options, but without
+    building any intermediate score.
+    """
+    result = synthetic.recording(
+        notes,
+        parts,
+        lyrics=lyrics,
+        rests=rests,
+        chords=chords,
+        lines=lines,
+        seed=seed,
+        fill=Phoneme[fill.value],
+    )
+
+    output.write(
+        common.convert(Recording.serialize(result), format, message=Recording)
+    )
@@ -0,0 +1,277 @@
+"""Phoneme search index over the libretto corpus.
+
+This module indexes every phoneme n-gram of the fragments in a
+:py:class:`.libretto.Corpus`, so phoneme sequences can be found without
+scanning the whole corpus. The index is a sorted table of n-gram codes, each
+one packing a phoneme per byte, with the positions where they occur; looking
+up a sequence only needs a couple of binary searches for its rarest n-gram
+and a check of the few candidate positions.
+
+Example:
+    >>> index = Index.from_corpus(corpus)
+    >>> index.search([Phoneme.A, Phoneme.M, Phoneme.O, Phoneme.R, Phoneme.E])
+"""
+
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy  # type: ignore
+
+from .columns import Columns
+from .libretto import Corpus
+from .phoneme import Phoneme
+
+# Version of the index format; bump it on incompatible changes.
+VERSION: int = 1
+
+# Default length of the indexed n-grams, in phonemes.
+SIZE: int = 3
+
+# Value separating the fragments in the concatenated phoneme sequence.
+SEPARATOR: int = 255
+
+# Names of the arrays stored in index files, in constructor order.
+ARRAYS = ("sequence", "bounds", "starts", "ends", "codes", "positions")
+
+
+class Match(NamedTuple):
+    """Occurrence of a phoneme sequence in the corpus.
+
+    Attributes:
+        fragment: The index of the fragment in the corpus.
+        offset: The index of the first phoneme in the fragment.
+        start: The absolute start time of the first phoneme, in seconds.
+        end: The absolute end time of the last phoneme, in seconds.
+    """
+
+    fragment: int
+    offset: int
+    start: float
+    end: float
+
+
+class Index:
+    """Phoneme n-gram index.
+
+    Attributes:
+        size: The length of the indexed n-grams, in phonemes.
+        sequence: The phonemes of every fragment, concatenated and followed
+            by a separator, with some extra separators at the end.
+        bounds: The position of the first phoneme of every fragment.
+        starts: The start time of every phoneme in the sequence.
+        ends: The end time of every phoneme in the sequence.
+        codes: The sorted codes of every n-gram in the sequence.
+        positions: The position of every n-gram, in the same order.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        sequence: numpy.ndarray,
+        bounds: numpy.ndarray,
+        starts: numpy.ndarray,
+        ends: numpy.ndarray,
+        codes: Optional[numpy.ndarray] = None,
+        positions: Optional[numpy.ndarray] = None,
+    ):
+        """Initialize the index, building the n-gram table if not given.
+
+        Arguments:
+            size: The length of the indexed n-grams, between 1 and 8.
+            sequence: The concatenated phonemes; see the attributes.
+            bounds: The position of the first phoneme of every fragment.
+            starts: The start time of every phoneme in the sequence.
+            ends: The end time of every phoneme in the sequence.
+            codes: The sorted n-gram codes, as built by this class.
+            positions: The n-gram positions, as built by this class.
+
+        Raises:
+            ValueError: If the n-gram size is out of range.
+        """
+        if not 1 <= size <= 8:
+            raise ValueError("n-gram size must be between 1 and 8")
+
+        self.size = size
+        self.sequence = sequence
+        self.bounds = bounds
+        self.starts = starts
+        self.ends = ends
+
+        if codes is None or positions is None:
+            positions = numpy.flatnonzero(sequence[:-size] != SEPARATOR)
+            codes = _codes(sequence, positions, size)
+            order = numpy.argsort(codes, kind="stable")
+            codes, positions = codes[order], positions[order]
+
+        self.codes = codes
+        self.positions = positions
+
+    @classmethod
+    def from_corpus(self, corpus: Corpus, size: int = SIZE) -> "Index":
+        """Build an index over the fragments of a corpus.
+
+        Arguments:
+            corpus: The corpus of libretto fragments.
+            size: The length of the indexed n-grams, in phonemes.
+
+        Returns:
+            An instance of this class indexing every fragment.
+        """
+        return self.from_columns(Columns.from_corpus(corpus), size)
+
+    @classmethod
+    def from_columns(self, columns: Columns, size: int = SIZE) -> "Index":
+        """Build an index over the fragments of a columnar corpus.
+
+        Arguments:
+            columns: The corpus columns.
+            size: The length of the indexed n-grams, in phonemes.
+
+        Returns:
+            An instance of this class indexing every fragment.
+        """
+        # Follow every fragment with a separator, and pad the sequence so
+        # every position has a complete n-gram.
+        ends = columns.offsets[1:]
+        padding = numpy.zeros(size)
+        return self(
+            size,
+            numpy.concatenate(
+                (
+                    numpy.insert(columns.phonemes, ends, SEPARATOR),
+                    numpy.full(size, SEPARATOR),
+                )
+            ).astype(numpy.uint8),
+            columns.offsets[:-1] + numpy.arange(len(ends)),
+            numpy.concatenate(
+                (numpy.insert(columns.starts, ends, 0.0), padding)
+            ).astype(numpy.float32),
+            numpy.concatenate(
+                (numpy.insert(columns.ends, ends, 0.0), padding)
+            ).astype(numpy.float32),
+        )
+
+    @classmethod
+    def load(self, path: Path) -> "Index":
+        """Load an index from a file.
+
+        Arguments:
+            path: The path of the index file, as written by :py:meth:`save`.
+
+        Returns:
+            An instance of this class with the index contents.
+
+        Raises:
+            ValueError: If the file isn't a valid index file.
+        """
+        try:
+            with numpy.load(path) as data:
+                if int(data["version"]) == VERSION:
+                    arrays = (data[name] for name in ARRAYS)
+                    return self(int(data["size"]), *arrays)
+        except (OSError, KeyError, ValueError):
+            pass
+        raise ValueError("invalid index file")
+
+    def save(self, path: Path):
+        """Save the index to a file.
+
+        Arguments:
+            path: The path of the index file.
+        """
+        with open(path, "wb") as file:
+            numpy.savez(
+                file,
+                version=VERSION,
+                size=self.size,
+                **{name: getattr(self, name) for name in ARRAYS},
+            )
+
+    def search(
+        self, query: Sequence[Phoneme], limit: Optional[int] = None
+    ) -> List[Match]:
+        """Find every occurrence of a phoneme sequence.
+
+        Arguments:
+            query: The phonemes to look for, in order.
+            limit: The maximum number of matches to return, if any.
+
+        Returns:
+            The matches, in corpus order.
+        """
+        if not query:
+            return []
+        pattern = numpy.array([int(phoneme) for phoneme in query])
+
+        if len(pattern) < self.size:
+            # Short queries are prefixes of a contiguous range of n-grams.
+            padding = self.size - len(pattern)
+            low = _code([*pattern, *[0] * padding])
+            high = _code([*pattern, *[SEPARATOR] * padding])
+            left = numpy.searchsorted(self.codes, low, "left")
+            right = numpy.searchsorted(self.codes, high, "right")
+            candidates = self.positions[left:right]
+        else:
+            # Take the candidates from the rarest n-gram of the query.
+            ranges = []
+            for shift in range(len(pattern) - self.size + 1):
+                code = _code(pattern[shift : shift + self.size])
+                left = numpy.searchsorted(self.codes, code, "left")
+                right = numpy.searchsorted(self.codes, code, "right")
+                ranges.append((right - left, shift, left, right))
+            _, shift, left, right = min(ranges)
+            candidates = self.positions[left:right] - shift
+            candidates = candidates[
+                (candidates >= 0)
+                & (candidates + len(pattern) <= len(self.sequence))
+            ]
+            for offset, phoneme in enumerate(pattern):
+                candidates = candidates[
+                    self.sequence[candidates + offset] == phoneme
+                ]
+
+        candidates = numpy.sort(candidates)[:limit]
+        fragments = numpy.searchsorted(self.bounds, candidates, "right") - 1
+        return [
+            Match(
+                int(fragment),
+                int(position - self.bounds[fragment]),
+                float(self.starts[position]),
+                float(self.ends[position + len(pattern) - 1]),
+            )
+            for fragment, position in zip(fragments, candidates)
+        ]
+
+
+def _code(phonemes: Sequence[int]) -> numpy.uint64:
+    """Pack some phonemes into an n-gram code.
+
+    Arguments:
+        phonemes: The phoneme values, in order.
+
+    Returns:
+        An integer with a byte for each phoneme, the first one being the most
+        significant, so codes sort like their phoneme sequences.
+    """
+    data = bytes(int(phoneme) for phoneme in phonemes)
+    return numpy.uint64(int.from_bytes(data, "big"))
+
+
+def _codes(
+    sequence: numpy.ndarray, positions: numpy.ndarray, size: int
+) -> numpy.ndarray:
+    """Calculate the n-gram codes of every position.
+
+    Arguments:
+        sequence: The phoneme sequence, padded with enough separators.
+        positions: The positions of the n-grams.
+        size: The length of the n-grams.
+
+    Returns:
+        The code of every n-gram, as packed by :py:func:`_code`.
+    """
+    codes = numpy.zeros(len(positions), dtype=numpy.uint64)
+    for offset in range(size):
+        codes <<= numpy.uint64(8)
+        codes |= sequence[positions + offset].astype(numpy.uint64)
+    return codes
@@ -3,16 +3,21 @@
 This module defines the protocol buffer format used for the default set of
 jitter templates used by the audio engine. The :py:class:`Jitter` class can
 be used to serialize and deserialize the ``jittertemplates.proto`` file from
-the original Blob Opera application.
+the original Blob Opera application, and :py:func:`curves` and :py:func:`apply`
+use its values to humanize the notes of recordings in bulk.
 """
 
 from functools import partial
+from itertools import islice
 from random import Random
-from typing import Any, Callable, Iterator
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
 
+import numpy  # type: ignore
 import proto  # type: ignore
 from more_itertools import pairwise
 
+from .recording import Recording
+
 
 class Template(proto.Message):
     """Individual jitter template.
@@ -71,7 +76,12 @@ class Generator:
             seed: The seed to use for the pseudorandom number generator. Useful
                 for obtaining deterministic results while performing unit
                 tests.
+
+        Raises:
+            ValueError: If the templates could never yield any value; see
+                :py:func:`check`.
         """
+        check(jitter, overlap)
         self.random: Random = Random(seed)
         self.jitter: Jitter = jitter
         self.overlap: int = overlap
@@ -109,3 +119,145 @@ class Generator:
 
             # Yield all the remaining (non-overlapping) values.
             yield from current.values[count:][:-count]
+
+
+def check(jitter: Jitter, overlap: int = 10):
+    """Check whether jitter templates can yield any value.
+
+    Due to the off-by-one tail of :py:class:`Generator`, templates with a
+    single value never yield anything, neither mixed nor on their own, so
+    templates that are all that short would keep the generator looping
+    forever without yielding, and so would a zero overlap.
+
+    Arguments:
+        jitter: A protocol buffer message with jitter templates.
+        overlap: The overlap between templates; see :py:class:`Generator`.
+
+    Raises:
+        ValueError: If the overlap isn't positive or there isn't any template
+            with at least two values.
+    """
+    if overlap < 1:
+        raise ValueError("jitter overlap must be positive")
+    if not any(len(template.values) > 1 for template in jitter.templates):
+        raise ValueError("jitter templates need at least two values")
+
+
+class Curves(NamedTuple):
+    """Jitter deviations for every note of a recording.
+
+    Attributes:
+        times: The time deviation of every note of every part, in seconds.
+        pitches: The pitch deviation of every note of every part, in
+            semitones.
+    """
+
+    times: List[numpy.ndarray]
+    pitches: List[numpy.ndarray]
+
+    def to_dict(self) -> Dict[str, list]:
+        """Describe the deviations.
+
+        Returns:
+            A dictionary, suitable for serializing as JSON, with a ``parts``
+            list holding the ``times`` and ``pitches`` deviations of every
+            part.
+        """
+        return {
+            "parts": [
+                {"times": times.tolist(), "pitches": pitches.tolist()}
+                for times, pitches in zip(self.times, self.pitches)
+            ]
+        }
+
+
+def curves(
+    recording: Recording,
+    jitter: Jitter,
+    time: float = 0.0,
+    pitch: float = 0.0,
+    seed: Any = None,
+    overlap: int = 10,
+) -> Curves:
+    """Sample jitter deviations for every note of a recording.
+
+    Values get drawn from a single :py:class:`Generator`, first for the time
+    of every note, part after part, and then for the pitch, so consecutive
+    notes follow the smooth shape of the templates. Values are scaled so
+    the largest value in the templates becomes the given depth.
+
+    Arguments:
+        recording: The recording whose notes get the deviations.
+        jitter: The jitter templates.
+        time: The maximum time deviation, in seconds.
+        pitch: The maximum pitch deviation, in semitones.
+        seed: The seed of the generator; see :py:class:`Generator`.
+        overlap: The overlap between templates; see :py:class:`Generator`.
+
+    Returns:
+        The deviations of every note of every part.
+
+    Raises:
+        ValueError: If the templates have some nonzero value, but could
+            never yield any; see :py:func:`check`.
+    """
+    counts = [len(part.notes) for part in Recording.pb(recording).parts]
+    total = sum(counts)
+    peak = max(
+        (
+            abs(value)
+            for template in jitter.templates
+            for value in template.values
+        ),
+        default=0.0,
+    )
+
+    if total and peak:
+        generator = Generator(jitter, overlap=overlap, seed=seed)
+        values = numpy.fromiter(islice(generator, 2 * total), float, 2 * total)
+        values /= peak
+    else:  # Empty templates would never yield any value.
+        values = numpy.zeros(2 * total)
+
+    bounds = numpy.cumsum(counts)[:-1]
+    return Curves(
+        numpy.split(values[:total] * time, bounds),
+        numpy.split(values[total:] * pitch, bounds),
+    )
+
+
+def apply(recording: Recording, curves: Curves) -> Recording:
+    """Apply jitter deviations to every note of a recording.
+
+    Shifted notes never start before zero nor before the previous note of
+    their part, so parts stay playable.
+
+    Arguments:
+        recording: The recording to humanize.
+        curves: The deviations, as sampled by :py:func:`curves`.
+
+    Returns:
+        A new recording with the deviations added to the time and pitch of
+        every note.
+    """
+    # Protocol buffer wrappers are quite slow for per-note access, so work
+    # with the underlying messages directly.
+    result = Recording.pb(recording).__class__()
+    result.CopyFrom(Recording.pb(recording))
+
+    for part, deltas, bends in zip(result.parts, curves.times, curves.pitches):
+        notes = part.notes
+        count = len(notes)
+        if deltas.any():
+            times = numpy.fromiter((note.time for note in notes), float, count)
+            times = numpy.maximum.accumulate(numpy.maximum(times + deltas, 0))
+            for note, value in zip(notes, times.tolist()):
+                note.time = value
+        if bends.any():
+            pitches = numpy.fromiter(
+                (note.pitch for note in notes), float, count
+            )
+            for note, value in zip(notes, (pitches + bends).tolist()):
+                note.pitch = value
+
+    return Recording.wrap(result)
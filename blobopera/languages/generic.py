@@ -6,13 +6,25 @@ if there isn't a better alternative.
 
 import re
 import unicodedata
-from typing import List
+from typing import List, Sequence
 
 import music21  # type: ignore
 
 from ..phoneme import Phoneme
 from .language import Language
 
+# Expression matching any phoneme, longest first, or a line break.
+EXPRESSION = re.compile(
+    "|".join(
+        sorted(
+            (phoneme.name.lower() for phoneme in Phoneme),
+            reverse=True,
+            key=len,
+        )
+        + ["\n"]
+    )
+)
+
 
 class GenericLanguage(Language):
     """Convert lyrics to phonemes with simple 1-to-1 string matching.
@@ -56,27 +68,52 @@ class GenericLanguage(Language):
                 and there are alternative lyrics for the given event.
         """
 
-        if lyrics := current.lyric:
-            # Scores can contain many lines of lyrics. That's not supported.
-            if "\n" in lyrics and self.strict:
-                raise ValueError("each note must contain at most one lyric")
+        return self.parse_all([current])[0]
+
+    def parse_all(
+        self, notes: Sequence[music21.note.GeneralNote]
+    ) -> List[List[Phoneme]]:
+        """Parse lyrics from every event of a part at once.
 
-            # Retrieve the first line of lyrics.
-            lyrics = lyrics.splitlines()[0]
+        The normalized lyrics of all the events are joined with line breaks
+        and tokenized in a single pass of the regular expression.
 
-            # Extract the lowercase text of each phoneme.
-            phonemes = [phoneme.name.lower() for phoneme in Phoneme]
+        Arguments:
+            notes: All the events of the part, in order.
 
-            # Sort phonemes by length and build a regular expression.
-            expression = "|".join(sorted(phonemes, reverse=True, key=len))
-            # Find and capture all the phonemes in the normalized text.
-            matches = re.findall(f"({expression})", self.normalize(lyrics))
+        Returns:
+            A list of phonemes for every event, in the same order.
 
-            # Return a list of phoneme objects with all the matches.
-            return [Phoneme[match.upper()] for match in matches]
-        else:
+        Raises:
+            ValueError: If  :py:attr:`self.strict` is :py:obj:`True`
+                and there are alternative lyrics for any of the events.
+        """
+        if not notes:
             return []
 
+        texts = []
+        for note in notes:
+            if lyrics := note.lyric:
+                # Scores can contain many lines of lyrics. That's not
+                # supported.
+                if "\n" in lyrics and self.strict:
+                    raise ValueError(
+                        "each note must contain at most one lyric"
+                    )
+
+                # Retrieve the first line of lyrics.
+                lyrics = self.normalize(lyrics.splitlines()[0])
+            texts.append(lyrics or "")
+
+        # Normalized lyrics don't have line breaks, so they separate events.
+        result: List[List[Phoneme]] = [[]]
+        for match in EXPRESSION.findall("\n".join(texts)):
+            if match == "\n":
+                result.append([])
+            else:
+                result[-1].append(Phoneme[match.upper()])
+        return result
+
     def normalize(self, text: str) -> str:
         """Normalize text.
 
@@ -5,7 +5,7 @@ importer and the different language classes.
 """
 
 from abc import abstractmethod
-from typing import List, Protocol
+from typing import List, Protocol, Sequence
 
 import music21  # type: ignore
 
@@ -48,3 +48,25 @@ class Language(Protocol):
         Returns:
             A list of phonemes representing the lyrics for the current event.
         """
+
+    def parse_all(
+        self, notes: Sequence[music21.note.GeneralNote]
+    ) -> List[List[Phoneme]]:
+        """Parse lyrics from every event of a part at once.
+
+        Note:
+            Languages can override this method to process all the lyrics
+            together, which is usually much quicker; by default, it calls
+            :py:meth:`parse` for every event, which takes quadratic time
+            because of the lists of previous and next events.
+
+        Arguments:
+            notes: All the events of the part, in order.
+
+        Returns:
+            A list of phonemes for every event, in the same order.
+        """
+        return [
+            self.parse(list(notes[:index]), note, list(notes[index + 1 :]))
+            for index, note in enumerate(notes)
+        ]
@@ -4,14 +4,22 @@ This language module provides random lyrics as seen in the default Blob Opera
 carols. It should be avoided, whenever desirable, in favor of actual lyrics.
 """
 
-import random
-from typing import Callable, List
+from fractions import Fraction
+from functools import lru_cache
+from typing import List, Sequence, Tuple
 
 import music21  # type: ignore
 
 from ..phoneme import Phoneme
 from .language import Language
 
+# Phonemes to pick from, in enumeration order.
+VOWELS: Tuple[Phoneme, ...] = tuple(filter(Phoneme.is_vowel, Phoneme))
+CONSONANTS: Tuple[Phoneme, ...] = tuple(filter(Phoneme.is_consonant, Phoneme))
+
+# Mask for emulating unsigned 64-bit integer arithmetic.
+MASK: int = (1 << 64) - 1
+
 
 class RandomLanguage(Language):
     """Generate random phonemes for parts without lyrics.
@@ -31,7 +39,6 @@ class RandomLanguage(Language):
             part: The whole part of the score.
             strict: If true, don't allow events with multiple lyrics.
         """
-        self.random = random.Random()
         self.strict = strict
         self.part = part
 
@@ -60,25 +67,62 @@ class RandomLanguage(Language):
         if current.lyric is not None and self.strict:
             raise ValueError("random language doesn't accept lyrics")
 
-        # Seed the pseudorandom generator with the absolute note start time.
-        self.random.seed(current.offset)
-
-        # Return a random vowel and a random consonant.
-        return [self.pick(Phoneme.is_vowel), self.pick(Phoneme.is_consonant)]
+        # Return a copy, as callers are free to modify the resulting list.
+        return list(_phonemes(current.offset))
 
-    def pick(self, condition: Callable[[Phoneme], bool]) -> Phoneme:
-        """Pick a random phoneme that meets the specified condition.
-
-        This function picks random phonemes repeatedly and stops when finds one
-        that meets the specified condition.
+    def parse_all(
+        self, notes: Sequence[music21.note.GeneralNote]
+    ) -> List[List[Phoneme]]:
+        """Generate lyrics for every event of a part at once.
 
         Arguments:
-            condition: a callable that returns True when a given phoneme
-                meets the desired conditions.
+            notes: All the events of the part, in order.
 
         Returns:
-            A phoneme meeting the specified condition.
+            A list of phonemes for every event, in the same order.
+
+        Raises:
+            ValueError: If :py:attr:`self.strict` is :py:obj:`True` and
+                any of the events already contains lyrics.
         """
-        while not condition(phoneme := self.random.choice(list(Phoneme))):
-            pass
-        return phoneme
+        if self.strict and any(note.lyric is not None for note in notes):
+            raise ValueError("random language doesn't accept lyrics")
+        return [list(_phonemes(note.offset)) for note in notes]
+
+
+@lru_cache(maxsize=65536)
+def _phonemes(offset: float) -> Tuple[Phoneme, Phoneme]:
+    """Pick a pseudorandom vowel and consonant for a note start offset.
+
+    Results only depend on the offset, so notes starting at the same time in
+    different parts get the same phonemes; the cache is shared by every part
+    for this very reason.
+
+    Arguments:
+        offset: The start offset of the note, either a float or a fraction.
+
+    Returns:
+        A vowel and a consonant.
+    """
+    # Floats and fractions with the same value yield the same exact ratio.
+    numerator, denominator = Fraction(offset).as_integer_ratio()
+    state = _mix(numerator & MASK ^ _mix(denominator))
+    return (
+        VOWELS[state % len(VOWELS)],
+        CONSONANTS[(state >> 32) % len(CONSONANTS)],
+    )
+
+
+def _mix(value: int) -> int:
+    """Hash an integer with the SplitMix64 finalizer.
+
+    Arguments:
+        value: An unsigned 64-bit integer.
+
+    Returns:
+        A well-distributed unsigned 64-bit integer.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK
+    value = (value ^ value >> 30) * 0xBF58476D1CE4E5B9 & MASK
+    value = (value ^ value >> 27) * 0x94D049BB133111EB & MASK
+    return value ^ value >> 31
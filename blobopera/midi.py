@@ -0,0 +1,386 @@
+"""Standard MIDI files.
+
+This module converts recordings to Standard MIDI Files directly, without
+building any intermediate music21 score. Timing follows the same convention
+as :py:meth:`.recording.Recording.to_score`: a quarter note lasts a second,
+id est, the tempo is fixed at 60 beats per minute.
+
+It also reads Standard MIDI Files into monophonic note events, which is much
+quicker than parsing them with music21 and keeps the actual timing of the
+file, in seconds, by honoring every tempo change.
+"""
+
+import struct
+from bisect import bisect_right
+from collections import defaultdict
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+)
+
+import music21  # type: ignore
+
+from .phoneme import Phoneme
+from .recording import Recording
+
+# Names of the four tracks, one for each blob singer.
+NAMES: Tuple[str, ...] = ("Soprano", "Alto", "Tenor", "Bass")
+
+# Default number of ticks per quarter note.
+RESOLUTION: int = 480
+
+# Velocity for every note; same as the music21 default.
+VELOCITY: int = 90
+
+# Default tempo of Standard MIDI Files, in microseconds per quarter note.
+TEMPO: int = 500_000
+
+# Number of data bytes for each channel message kind, by high status nibble.
+LENGTHS: Dict[int, int] = {
+    0x80: 2,
+    0x90: 2,
+    0xA0: 2,
+    0xB0: 2,
+    0xC0: 1,
+    0xD0: 1,
+    0xE0: 2,
+}
+
+
+class Event(NamedTuple):
+    """Note event read from a Standard MIDI File.
+
+    Attributes:
+        time: The absolute start time of the note, in seconds.
+        duration: The duration of the note, in seconds.
+        pitch: The MIDI pitch of the note.
+    """
+
+    time: float
+    duration: float
+    pitch: int
+
+
+def write(
+    recording: Recording, file: BinaryIO, *, resolution: int = RESOLUTION
+):
+    """Write a recording as a Standard MIDI File.
+
+    The file has a conductor track with the tempo and time signature followed
+    by a track for each part, where notes last until the start of the next
+    note or rest, and the last note lasts a quarter note.
+
+    Arguments:
+        recording: The recording to convert.
+        file: A binary stream to write the file to.
+        resolution: The number of ticks per quarter note.
+    """
+    tracks: List[bytes] = [_conductor()]
+    # Protocol buffer wrappers are quite slow for per-note access, so read
+    # the underlying messages directly.
+    for channel, part in enumerate(Recording.pb(recording).parts):
+        notes = [
+            (
+                max(round(note.time * resolution), 0),
+                note.pitch,
+                note.syllable.vowel.phoneme == Phoneme.SILENCE,
+            )
+            for note in part.notes
+        ]
+        events = _events(notes, channel, resolution)
+        tracks.append(_track(events, NAMES[channel % len(NAMES)]))
+
+    file.write(b"MThd" + struct.pack(">IHHH", 6, 1, len(tracks), resolution))
+    for track in tracks:
+        file.write(b"MTrk" + struct.pack(">I", len(track)) + track)
+
+
+def _events(
+    notes: List[Tuple[int, float, bool]], channel: int, resolution: int
+) -> Iterator[Tuple[int, bytes]]:
+    """Generate the note events for a part.
+
+    Arguments:
+        notes: Tuples of start tick, pitch and whether it's a rest.
+        channel: The MIDI channel for the part.
+        resolution: The number of ticks per quarter note.
+
+    Yields:
+        Pairs of absolute ticks and raw MIDI event bytes, in order.
+    """
+    ends = [start for start, _, _ in notes[1:]] + [
+        notes[-1][0] + resolution if notes else 0
+    ]
+    for (start, pitch, rest), end in zip(notes, ends):
+        if rest or end <= start:
+            continue
+        key = min(max(round(pitch), 0), 127)
+        yield start, bytes((0x90 | channel & 0x0F, key, VELOCITY))
+        yield end, bytes((0x80 | channel & 0x0F, key, 0))
+
+
+def _conductor() -> bytes:
+    """Build the conductor track with the tempo and time signature.
+
+    Returns:
+        The raw track data.
+    """
+    return (
+        b"\x00\xff\x51\x03"  # Tempo: a million microseconds per quarter.
+        + (1_000_000).to_bytes(3, "big")
+        + b"\x00\xff\x58\x04\x04\x02\x18\x08"  # Time signature: 4/4.
+        + b"\x00\xff\x2f\x00"  # End of track.
+    )
+
+
+def _track(events: Iterator[Tuple[int, bytes]], name: str) -> bytes:
+    """Build a track from absolute timed events.
+
+    Arguments:
+        events: Pairs of absolute ticks and raw MIDI event bytes.
+        name: The name of the track.
+
+    Returns:
+        The raw track data, with delta times.
+    """
+    data = bytearray(b"\x00\xff\x03")
+    data += _quantity(len(name.encode())) + name.encode()
+
+    # Sorting is stable, so note-off events stay before the note-on events
+    # that share their ticks; it only reorders malformed recordings.
+    previous = 0
+    for tick, event in sorted(events, key=lambda pair: pair[0]):
+        data += _quantity(tick - previous) + event
+        previous = tick
+
+    data += b"\x00\xff\x2f\x00"  # End of track.
+    return bytes(data)
+
+
+def _quantity(value: int) -> bytes:
+    """Encode a variable-length quantity.
+
+    Arguments:
+        value: A non-negative integer.
+
+    Returns:
+        The value encoded in groups of seven bits, most significant first,
+        with the high bit set in all but the last byte.
+    """
+    result = bytearray((value & 0x7F,))
+    while value := value >> 7:
+        result.insert(0, value & 0x7F | 0x80)
+    return bytes(result)
+
+
+def read(file: BinaryIO) -> List[List[Event]]:
+    """Read the notes of a Standard MIDI File.
+
+    Every track and channel with notes becomes a part, in order. Chords are
+    reduced to their top voice: at every onset, the highest starting note is
+    kept and lasts until it ends or the next onset, whichever comes first.
+
+    Arguments:
+        file: A binary stream with the file contents.
+
+    Returns:
+        A list of parts, each one with its note events in chronological order.
+
+    Raises:
+        ValueError: If the file isn't a valid Standard MIDI File.
+    """
+    data = file.read()
+    if data[:4] != b"MThd" or len(data) < 14:
+        raise ValueError("invalid MIDI file header")
+    length, _, count, division = struct.unpack(">IHHH", data[4:14])
+
+    tracks: List[bytes] = []
+    position = 8 + length
+    while len(tracks) < count and position + 8 <= len(data):
+        kind = data[position : position + 4]
+        (size,) = struct.unpack(">I", data[position + 4 : position + 8])
+        if kind == b"MTrk":
+            tracks.append(data[position + 8 : position + 8 + size])
+        position += 8 + size
+
+    # Keys are track and channel numbers; values are start tick, end tick and
+    # pitch of every note, in the order of their note-off events.
+    notes: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = defaultdict(
+        list
+    )
+    tempos: List[Tuple[int, int]] = []
+
+    for number, track in enumerate(tracks):
+        # Start ticks of the sounding notes, by channel and pitch; a list
+        # per key takes care of overlapping notes with the same pitch.
+        sounding: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for tick, status, payload in _messages(track):
+            if status == 0xFF and payload[0] == 0x51 and len(payload) == 4:
+                tempos.append((tick, int.from_bytes(payload[1:], "big")))
+            elif status & 0xF0 in (0x80, 0x90):
+                key = status & 0x0F, payload[0]
+                if status & 0xF0 == 0x90 and payload[1] > 0:
+                    sounding[key].append(tick)
+                elif sounding[key]:
+                    start = sounding[key].pop(0)
+                    notes[number, key[0]].append((start, tick, key[1]))
+
+    clock = _clock(tempos, division)
+    return [
+        [
+            Event(clock(start), clock(end) - clock(start), pitch)
+            for start, end, pitch in _top(notes[key])
+        ]
+        for key in sorted(notes)
+    ]
+
+
+def score(parts: List[List[Event]]) -> music21.stream.Score:
+    """Build a music21 score from note events.
+
+    Offsets are expressed in seconds, so a quarter note lasts a second like
+    in :py:meth:`.recording.Recording.to_score`, and gaps between notes are
+    filled with rests.
+
+    Arguments:
+        parts: A list of parts, as returned by :py:func:`read`.
+
+    Returns:
+        A music21 score with a part for each one of the given parts.
+    """
+    result = music21.stream.Score()
+    for index, events in enumerate(parts):
+        part = music21.stream.Part()
+        part.partName = NAMES[index % len(NAMES)]
+
+        end = 0.0
+        for event in events:
+            if event.time > end:
+                rest = music21.note.Rest(quarterLength=event.time - end)
+                part.coreInsert(end, rest)
+            note = music21.note.Note(event.pitch, quarterLength=event.duration)
+            # Avoid the bookkeeping of ``Stream.insert`` for every element.
+            part.coreInsert(event.time, note)
+            end = event.time + event.duration
+
+        part.coreElementsChanged()
+        result.insert(0, part)
+    return result
+
+
+def _messages(track: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    """Generate the messages of a track.
+
+    Arguments:
+        track: The raw track data.
+
+    Yields:
+        Tuples of absolute tick, status byte and message data; meta events
+        have a status of 0xFF and their data begins with their type.
+    """
+    tick, position, running = 0, 0, 0
+    while position < len(track):
+        delta, position = _unquantity(track, position)
+        tick += delta
+        status = track[position]
+        if status < 0x80:  # Running status: reuse the previous status byte.
+            status = running
+        else:
+            position += 1
+
+        if status == 0xFF:
+            kind = track[position]
+            size, start = _unquantity(track, position + 1)
+            yield tick, status, bytes((kind,)) + track[start : start + size]
+            position = start + size
+        elif status in (0xF0, 0xF7):
+            size, position = _unquantity(track, position)
+            position += size
+        elif status & 0xF0 in LENGTHS:
+            running = status
+            size = LENGTHS[status & 0xF0]
+            yield tick, status, track[position : position + size]
+            position += size
+        else:
+            raise ValueError("invalid MIDI track data")
+
+
+def _clock(tempos: List[Tuple[int, int]], division: int) -> Callable:
+    """Build a function converting ticks to seconds.
+
+    Arguments:
+        tempos: Pairs of tick and tempo, in microseconds per quarter note.
+        division: The time division field of the file header.
+
+    Returns:
+        A function that takes an absolute tick and returns its time, in
+        seconds, taking into account all the tempo changes before it.
+    """
+    if division & 0x8000:  # SMPTE timing, with frames and ticks per frame.
+        rate = -struct.unpack(">b", bytes((division >> 8,)))[0]
+        return lambda tick: tick / (rate * (division & 0xFF))
+
+    ticks, times, tempo = [0], [0.0], TEMPO
+    for tick, value in sorted(tempos):
+        times.append(times[-1] + (tick - ticks[-1]) * tempo / division / 1e6)
+        ticks.append(tick)
+        tempo = value
+    # Tempos in effect from every change on, aligned with the change ticks.
+    values = [TEMPO] + [value for _, value in sorted(tempos)]
+
+    def clock(tick: int) -> float:
+        index = bisect_right(ticks, tick) - 1
+        return times[index] + (tick - ticks[index]) * values[index] / (
+            division * 1e6
+        )
+
+    return clock
+
+
+def _top(notes: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """Reduce notes to their top voice.
+
+    Arguments:
+        notes: Tuples of start tick, end tick and pitch, in any order.
+
+    Returns:
+        Non-overlapping tuples of start tick, end tick and pitch, where only
+        the highest note starting on each tick is kept and notes are cut at
+        the next onset.
+    """
+    result: List[Tuple[int, int, int]] = []
+    onsets: Dict[int, Tuple[int, int]] = {}
+    for start, end, pitch in notes:
+        if start not in onsets or pitch > onsets[start][1]:
+            onsets[start] = end, pitch
+    for start in sorted(onsets):
+        end, pitch = onsets[start]
+        if result and result[-1][1] > start:
+            result[-1] = result[-1][0], start, result[-1][2]
+        if end > start:
+            result.append((start, end, pitch))
+    return result
+
+
+def _unquantity(data: bytes, position: int) -> Tuple[int, int]:
+    """Decode a variable-length quantity.
+
+    Arguments:
+        data: The raw data.
+        position: The position of the first byte of the quantity.
+
+    Returns:
+        The decoded value and the position right after the quantity.
+    """
+    value = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value = value << 7 | byte & 0x7F
+        if byte < 0x80:
+            return value, position
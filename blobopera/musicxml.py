@@ -0,0 +1,979 @@
+"""MusicXML files.
+
+This module converts recordings to MusicXML files directly, writing parts,
+measures, notes and lyrics incrementally instead of building an intermediate
+music21 score. The result is musically equivalent to exporting the score
+returned by :py:meth:`.recording.Recording.to_score`: notes last until the
+next one starts, a quarter note lasts a second and every part is laid out in
+measures of four quarter notes.
+
+It also imports recordings from MusicXML files measure by measure, building
+only the selected parts and discarding every measure as soon as its notes
+are converted, so memory use doesn't depend on the length of the score.
+"""
+
+import base64
+import zipfile
+from contextlib import contextmanager
+from fractions import Fraction
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+import music21  # type: ignore
+
+from .cache import Cache
+from .languages import GenericLanguage, Language
+from .location import Location
+from .phoneme import Phoneme
+from .quantize import quantize
+from .recording import Part, Recording
+from .tempo import TempoMap
+from .theme import Theme
+
+# Names of the four parts, one for each blob singer.
+NAMES: Tuple[str, ...] = ("Soprano", "Alto", "Tenor", "Bass")
+
+# Number of divisions per quarter note; same as the music21 default.
+DIVISIONS: int = 10080
+
+# Length of each measure, in divisions; four quarter notes.
+MEASURE: int = 4 * DIVISIONS
+
+# Note types and their durations, in divisions, from the longest.
+TYPES: Tuple[Tuple[str, int], ...] = (
+    ("whole", 4 * DIVISIONS),
+    ("half", 2 * DIVISIONS),
+    ("quarter", DIVISIONS),
+    ("eighth", DIVISIONS // 2),
+    ("16th", DIVISIONS // 4),
+    ("32nd", DIVISIONS // 8),
+    ("64th", DIVISIONS // 16),
+)
+
+# Supported tuplet ratios, as actual and normal number of notes.
+TUPLETS: Tuple[Tuple[int, int], ...] = ((3, 2), (5, 4), (7, 4))
+
+# Pitch class spelling, with the same preferences as music21.
+STEPS: Tuple[Tuple[str, int], ...] = (
+    ("C", 0),
+    ("C", 1),
+    ("D", 0),
+    ("E", -1),
+    ("E", 0),
+    ("F", 0),
+    ("F", 1),
+    ("G", 0),
+    ("G", 1),
+    ("A", 0),
+    ("B", -1),
+    ("B", 0),
+)
+
+# Durations of the note types, in quarter lengths, as read by music21.
+LENGTHS: Dict[str, float] = {
+    "maxima": 32.0,
+    "long": 16.0,
+    "breve": 8.0,
+    "whole": 4.0,
+    "half": 2.0,
+    "quarter": 1.0,
+    "eighth": 0.5,
+    "16th": 0.25,
+    "32nd": 0.125,
+    "64th": 0.0625,
+    "128th": 0.03125,
+    "256th": 0.015625,
+    "512th": 0.0078125,
+    "1024th": 0.00390625,
+}
+
+# Maximum number of previous and next notes passed to the language parsers.
+CONTEXT: int = 16
+
+# Note events, as position and duration in divisions, pitch and lyric; the
+# pitch is None for rests.
+Event = Tuple[int, int, Optional[int], Optional[str]]
+
+
+def write(
+    recording: Recording,
+    file: BinaryIO,
+    title: str = "",
+    composer: str = "",
+):
+    """Write a recording as a MusicXML file.
+
+    Arguments:
+        recording: The recording to convert.
+        file: A binary stream to write the file to.
+        title: The recording title, shown in the heading of the score.
+        composer: The composer name, shown in the heading of the score.
+    """
+    for chunk in generate(recording, title, composer):
+        file.write(chunk.encode())
+
+
+def generate(
+    recording: Recording, title: str = "", composer: str = ""
+) -> Iterator[str]:
+    """Generate a MusicXML document from a recording, piece by piece.
+
+    Arguments:
+        recording: The recording to convert.
+        title: The recording title, shown in the heading of the score.
+        composer: The composer name, shown in the heading of the score.
+
+    Yields:
+        Consecutive fragments of the document.
+    """
+    parts = list(zip(recording.parts, NAMES))
+    # Every part is padded with a rest until the end of the longest one, so
+    # the length of each part is required beforehand.
+    length = max((_length(part) for part, _ in parts), default=0)
+
+    yield '<?xml version="1.0" encoding="utf-8"?>\n'
+    yield (
+        '<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 3.0 '
+        'Partwise//EN" "http://www.musicxml.org/dtds/partwise.dtd">\n'
+    )
+    yield '<score-partwise version="3.0">\n'
+    yield f"  <movement-title>{escape(title)}</movement-title>\n"
+    yield "  <identification>\n"
+    yield f'    <creator type="composer">{escape(composer)}</creator>\n'
+    yield "    <encoding>\n"
+    yield "      <software>blobopera</software>\n"
+    yield "    </encoding>\n"
+    yield "  </identification>\n"
+    yield "  <part-list>\n"
+    for index, (_, name) in enumerate(parts, 1):
+        yield f'    <score-part id="P{index}">\n'
+        yield f"      <part-name>{name}</part-name>\n"
+        yield "    </score-part>\n"
+    yield "  </part-list>\n"
+
+    for index, (part, _) in enumerate(parts, 1):
+        yield f'  <part id="P{index}">\n'
+        yield from _measures(_events(part, length), _clef(part))
+        yield "  </part>\n"
+
+    yield "</score-partwise>\n"
+
+
+def _positions(part: Part) -> Iterator[int]:
+    """Generate the start position of every note, in divisions.
+
+    Positions are relative to the first note, whose time gets rounded to the
+    nearest fraction with a denominator of at most 100, like in
+    :py:meth:`.recording.Note.to_note`.
+    """
+    quantized = quantize(note.time for note in Part.pb(part).notes)
+    if len(quantized.numerators):
+        first = Fraction(
+            int(quantized.numerators[0]), int(quantized.denominators[0])
+        )
+        yield from quantized.ticks(DIVISIONS, first).tolist()
+
+
+def _length(part: Part) -> int:
+    """Calculate the length of a part, in divisions.
+
+    The last note lasts a quarter note, as its duration is unknown.
+    """
+    position = None
+    for position in _positions(part):
+        pass
+    return 0 if position is None else position + DIVISIONS
+
+
+def _events(part: Part, length: int) -> Iterator[Event]:
+    """Generate the note events of a part, padded to the given length."""
+    notes = zip(part.notes, part.lyrics(), _positions(part))
+    previous: Optional[Tuple[int, Optional[int], Optional[str]]] = None
+
+    for note, lyric, position in notes:
+        if previous is not None and position > previous[0]:
+            start, pitch, text = previous
+            yield start, position - start, pitch, text
+        if Phoneme(note.syllable.vowel.phoneme).is_silence():
+            previous = position, None, lyric
+        else:
+            previous = position, round(note.pitch), lyric
+
+    end = 0
+    if previous is not None:
+        start, pitch, text = previous
+        end = start + DIVISIONS
+        yield start, DIVISIONS, pitch, text
+
+    if end < length:
+        yield end, length - end, None, None
+
+
+def _clef(part: Part) -> Tuple[str, int]:
+    """Choose a treble or bass clef depending on the average note pitch."""
+    pitches: List[float] = [
+        note.pitch
+        for note in part.notes
+        if not Phoneme(note.syllable.vowel.phoneme).is_silence()
+    ]
+    if pitches and sum(pitches) / len(pitches) < 60:
+        return "F", 4
+    return "G", 2
+
+
+def _measures(events: Iterator[Event], clef: Tuple[str, int]) -> Iterator[str]:
+    """Lay out note events in measures, tying notes across bar lines."""
+    number = 1
+    yield f'    <measure number="{number}">\n'
+    yield "      <attributes>\n"
+    yield f"        <divisions>{DIVISIONS}</divisions>\n"
+    yield "        <time>\n"
+    yield "          <beats>4</beats>\n"
+    yield "          <beat-type>4</beat-type>\n"
+    yield "        </time>\n"
+    yield "        <clef>\n"
+    yield f"          <sign>{clef[0]}</sign>\n"
+    yield f"          <line>{clef[1]}</line>\n"
+    yield "        </clef>\n"
+    yield "      </attributes>\n"
+    yield "      <direction>\n"
+    yield "        <direction-type>\n"
+    yield '          <metronome parentheses="no">\n'
+    yield "            <beat-unit>quarter</beat-unit>\n"
+    yield "            <per-minute>60</per-minute>\n"
+    yield "          </metronome>\n"
+    yield "        </direction-type>\n"
+    yield '        <sound tempo="60"/>\n'
+    yield "      </direction>\n"
+
+    for position, duration, pitch, lyric in events:
+        # Split the note at bar lines and in pieces with known note types.
+        pieces: List[Tuple[int, int]] = []
+        while duration > 0:
+            boundary = (position // MEASURE + 1) * MEASURE
+            span = min(duration, boundary - position)
+            for piece in _split(span):
+                pieces.append((position, piece))
+                position += piece
+            duration -= span
+
+        for index, (start, piece) in enumerate(pieces):
+            if start // MEASURE + 1 > number:
+                number = start // MEASURE + 1
+                yield "    </measure>\n"
+                yield f'    <measure number="{number}">\n'
+            tie = index > 0, index < len(pieces) - 1
+            yield from _note(piece, pitch, None if index else lyric, tie)
+
+    yield '      <barline location="right">\n'
+    yield "        <bar-style>light-heavy</bar-style>\n"
+    yield "      </barline>\n"
+    yield "    </measure>\n"
+
+
+def _split(duration: int) -> List[int]:
+    """Split a duration in pieces that can be represented with note types."""
+    pieces: List[int] = []
+    while duration > 0:
+        if _type(duration) is not None:
+            pieces.append(duration)
+            break
+        # Take the longest plain note type that fits, if any.
+        for _, value in TYPES:
+            if value <= duration:
+                pieces.append(value)
+                duration -= value
+                break
+        else:
+            pieces.append(duration)
+            break
+    return pieces
+
+
+def _type(duration: int) -> Optional[Tuple[str, int, Tuple[int, int]]]:
+    """Find the note type, dots and tuplet ratio for a duration, if any."""
+    for actual, normal in ((1, 1), *TUPLETS):
+        for name, value in TYPES:
+            for dots, factor in enumerate((4, 6, 7)):
+                if duration * actual * 4 == value * normal * factor:
+                    return name, dots, (actual, normal)
+    return None
+
+
+def _note(
+    duration: int,
+    pitch: Optional[int],
+    lyric: Optional[str],
+    tie: Tuple[bool, bool],
+) -> Iterator[str]:
+    """Generate a note or rest element."""
+    yield "      <note>\n"
+    if pitch is None:
+        yield "        <rest/>\n"
+    else:
+        step, alter = STEPS[pitch % 12]
+        yield "        <pitch>\n"
+        yield f"          <step>{step}</step>\n"
+        if alter:
+            yield f"          <alter>{alter}</alter>\n"
+        yield f"          <octave>{pitch // 12 - 1}</octave>\n"
+        yield "        </pitch>\n"
+    yield f"        <duration>{duration}</duration>\n"
+
+    ties = [kind for kind, tied in zip(("stop", "start"), tie) if tied]
+    if pitch is not None:
+        for kind in ties:
+            yield f'        <tie type="{kind}"/>\n'
+
+    if found := _type(duration):
+        name, dots, (actual, normal) = found
+        yield f"        <type>{name}</type>\n"
+        yield "        <dot/>\n" * dots
+        if (actual, normal) != (1, 1):
+            yield "        <time-modification>\n"
+            yield f"          <actual-notes>{actual}</actual-notes>\n"
+            yield f"          <normal-notes>{normal}</normal-notes>\n"
+            yield "        </time-modification>\n"
+
+    if pitch is not None and ties:
+        yield "        <notations>\n"
+        for kind in ties:
+            yield f'          <tied type="{kind}"/>\n'
+        yield "        </notations>\n"
+
+    if lyric:
+        yield '        <lyric number="1">\n'
+        yield "          <syllabic>single</syllabic>\n"
+        yield f"          <text>{escape(lyric)}</text>\n"
+        yield "        </lyric>\n"
+    yield "      </note>\n"
+
+
+@contextmanager
+def source(path: Path) -> Iterator[BinaryIO]:
+    """Open a MusicXML file for reading, be it compressed or not.
+
+    Arguments:
+        path: The path to an uncompressed or compressed MusicXML file.
+
+    Yields:
+        A binary stream with the MusicXML document.
+    """
+    if not zipfile.is_zipfile(path):
+        with open(path, "rb") as file:
+            yield file
+        return
+
+    with zipfile.ZipFile(path) as archive:
+        container = archive.read("META-INF/container.xml")
+        rootfile = ElementTree.fromstring(container).find(".//rootfile")
+        if rootfile is None:
+            raise ValueError("missing root file in compressed MusicXML file")
+        with archive.open(rootfile.get("full-path", "")) as file:
+            yield file
+
+
+def read(
+    file: BinaryIO,
+    theme: Theme = Theme.NORMAL,
+    language: Type[Language] = GenericLanguage,
+    tempo: float = 1.0,
+    parts: Sequence[int] = (0, 0, 0, 0),
+    fill: Phoneme = Phoneme.SILENCE,
+    location: Location = Location.BLOBPERAHOUSE,
+    *,
+    context: int = CONTEXT,
+    cache: Optional[Cache] = None,
+) -> Recording:
+    """Import a recording from a MusicXML file, measure by measure.
+
+    This function produces the same recording as
+    :py:meth:`.recording.Recording.from_score` with the score parsed by
+    music21, but without ever keeping more than a measure in memory. Parts
+    with several staves are read as a single part, though, language parsers
+    only see a few notes around the current one, and metronome marks only
+    apply to the parts after the one they're in, besides that one.
+
+    Arguments:
+        file: A binary stream with a partwise MusicXML document.
+        context: The maximum number of previous and next notes passed to the
+            language parser.
+        cache: A cache for the conversion results of every measure; when
+            given, measures are converted independently, so language parsers
+            only see the notes of the current measure.
+
+    See :py:meth:`.recording.Recording.from_score` for the rest of the
+    arguments; scores with a single part use it for all the voices, like the
+    import command does.
+
+    Returns:
+        An instance of :py:class:`.recording.Recording` with the four
+        selected parts.
+
+    Raises:
+        ValueError: If the document isn't a partwise MusicXML score, hasn't
+            got any part, or the part index tuple hasn't got four elements.
+        IndexError: If one of the part indexes is out of bounds.
+    """
+    if len(parts) != 4:
+        raise ValueError("recordings require exactly four tracks")
+
+    events = ElementTree.iterparse(file, events=("start", "end"))
+    # Positions of the selected parts and their conversion results.
+    positions: List[int] = []
+    built: Dict[int, Part] = {}
+    position = 0
+    # Tempo changes of every part read so far, in score order.
+    tempos = TempoMap()
+
+    for event, element in events:
+        if event == "start" and element.tag == "score-timewise":
+            raise ValueError("timewise scores aren't supported")
+        elif event == "end" and element.tag == "part-list":
+            count = len(element.findall("score-part"))
+            if count == 0:
+                raise ValueError("no parts detected")
+            elif count == 1:
+                parts = (0, 0, 0, 0)  # Assign the same part to all voices.
+            try:
+                positions = [range(count)[index] for index in parts]
+            except IndexError:
+                raise IndexError("track index out of bounds")
+        elif event == "start" and element.tag == "part":
+            measures = _elements(events, element)
+            state = _Measures(tempos)
+            if position not in positions:
+                # Skip the part without converting it, but keep its tempo.
+                for item in measures:
+                    state.skip(item)
+            elif cache is not None:
+                built[position] = _cached(
+                    measures, state, cache, language, tempo, fill
+                )
+            else:
+                # Languages take the whole part, but none of them uses it and
+                # it isn't available here; give them an empty one instead.
+                built[position] = Part.from_notes(
+                    (note for item in measures for note in state.parse(item)),
+                    language(music21.stream.Part()),
+                    tempo,
+                    fill,
+                    context,
+                    tempos,
+                )
+            position += 1
+
+    if not positions:
+        raise ValueError("no parts detected")
+
+    recording = Recording(theme=theme, location=location)
+    for position in positions:
+        if position not in built:
+            raise IndexError("track index out of bounds")
+        recording.parts.append(built[position])
+    return recording
+
+
+def _elements(
+    events: Iterator[Tuple[str, ElementTree.Element]],
+    part: ElementTree.Element,
+) -> Iterator[ElementTree.Element]:
+    """Generate the measures of a part, one at a time.
+
+    Arguments:
+        events: The parser events, right after the start of the part.
+        part: The part element; it gets cleared after every measure.
+
+    Yields:
+        The complete measure elements, which are only valid until the next
+        one is requested.
+    """
+    for event, element in events:
+        if event == "end" and element.tag == "measure":
+            yield element
+            part.clear()
+        elif event == "end" and element.tag == "part":
+            part.clear()
+            return
+
+
+def _cached(
+    measures: Iterator[ElementTree.Element],
+    state: "_Measures",
+    cache: Cache,
+    language: Type[Language],
+    tempo: float,
+    fill: Phoneme,
+) -> Part:
+    """Convert the measures of a part, reusing cached results.
+
+    Every measure gets converted on its own, so its leading consonants end
+    up in the start of the converted part, and its leading rests don't have
+    any fallback pitch. Both get fixed when joining the measures, so the
+    result is the same as converting the whole part at once.
+
+    Cached results don't depend on the position of their measure: offsets
+    are kept relative to the start of the measure, and note times get
+    calculated from them when joining the measures, so inserting or
+    removing measures before a measure doesn't invalidate it, nor do tempo
+    changes before it that leave the same tempo in effect.
+
+    Arguments:
+        measures: The measure elements of the part.
+        state: The measure converter, with the tempo map of the score.
+        cache: The cache for the conversion results of every measure.
+
+    See :py:func:`read` for the rest of the arguments.
+
+    Returns:
+        The converted part.
+    """
+    tempos = state.tempos
+    parser = language(music21.stream.Part())
+    name = f"{language.__module__}.{language.__qualname__}"
+    # Protocol buffer wrappers are quite slow for per-note access, so join
+    # the underlying messages directly.
+    result = Part.pb(Part())
+
+    for measure in measures:
+        start = Fraction(state.offset)
+
+        # Times only depend on the tempo in effect at the start of the
+        # measure and on the tempo changes within it, found by skipping it
+        # on a scratch state; its own changes are part of the measure.
+        probe = _Measures(TempoMap())
+        probe.divisions, probe.bar = state.divisions, state.bar
+        probe.skip(measure)
+        changes = [
+            (str(Fraction(offset) - start), rate)
+            for offset, rate in tempos.changes(state.offset)
+            if offset <= state.offset + probe.offset
+        ]
+        key = cache.key(
+            ElementTree.tostring(measure),
+            (state.divisions, state.bar),
+            (name, tempo, fill.name),
+            (tempos.rate(state.offset), changes),
+        )
+
+        if (entry := cache.get(key)) is None:
+            notes = state.parse(measure)
+            recorder = _Offsets(tempos)
+            part = Part.pb(
+                Part.from_notes(notes, parser, tempo, fill, tempos=recorder)
+            )
+            # Leading rests take the pitch of the previous note, if any.
+            rests = 0
+            while (
+                rests < len(notes) and type(notes[rests]) is music21.note.Rest
+            ):
+                rests += 1
+            # The fill phoneme becomes the vowel of the last actual note.
+            index = len(part.notes) - 1
+            for note in reversed(notes):
+                if type(note) is not music21.note.Rest:
+                    vowel = part.notes[index].syllable.vowel.phoneme
+                    fill = Phoneme(vowel)
+                    break
+                index -= 1
+            entry = {
+                "part": base64.b64encode(part.SerializeToString()).decode(),
+                "offsets": [
+                    str(Fraction(offset) - start)
+                    for offset in recorder.offsets
+                ],
+                "rests": rests,
+                "fill": fill.name,
+                "state": [
+                    state.divisions,
+                    state.bar,
+                    str(Fraction(state.offset) - start),
+                ],
+                "tempos": [
+                    (str(Fraction(offset) - start), rate)
+                    for offset, rate in state.changes
+                ],
+            }
+            cache.put(key, entry)
+        else:
+            divisions, bar, length = entry["state"]
+            state.divisions, state.bar = divisions, bar
+            state.offset = float(start + Fraction(length))
+            for offset, rate in entry["tempos"]:
+                tempos.add(float(start + Fraction(offset)), rate)
+            fill = Phoneme[entry["fill"]]
+            part = Part.pb().FromString(base64.b64decode(entry["part"]))
+            # Calculate the times just like the conversion does.
+            for note, relative in zip(part.notes, entry["offsets"]):
+                offset = float(start + Fraction(relative))
+                note.time = tempos.seconds(offset) / tempo
+
+        if result.notes:
+            result.notes[-1].syllable.suffix.extend(part.start)
+        else:
+            result.start.extend(part.start)
+        for index, note in enumerate(part.notes):
+            if index < entry["rests"] and result.notes:
+                note.pitch = result.notes[-1].pitch
+            result.notes.append(note)
+
+    return Part.wrap(result)
+
+
+class _Offsets:
+    """Tempo map proxy keeping every offset converted to a time.
+
+    Attributes:
+        tempos: The actual tempo map.
+        offsets: The converted offsets, in order.
+    """
+
+    def __init__(self, tempos: TempoMap):
+        """Initialize the proxy.
+
+        Arguments:
+            tempos: The actual tempo map.
+        """
+        self.tempos = tempos
+        self.offsets: List[float] = []
+
+    def seconds(self, offset: float) -> float:
+        """Convert an offset to an absolute time, keeping the offset.
+
+        Arguments:
+            offset: The offset, in quarter lengths.
+
+        Returns:
+            The absolute time, in seconds.
+        """
+        self.offsets.append(offset)
+        return self.tempos.seconds(offset)
+
+
+class _Measures:
+    """Convert the measures of a part to music21 notes, like music21 does.
+
+    Attributes:
+        divisions: The number of divisions per quarter note.
+        bar: The duration of a bar for the last time signature, in quarter
+            lengths.
+        offset: The offset of the next measure, in quarter lengths.
+        tempos: The tempo map that metronome marks get added to.
+        changes: The tempo changes found in the last measure.
+    """
+
+    def __init__(self, tempos: Optional[TempoMap] = None):
+        """Initialize the state with the music21 defaults.
+
+        Arguments:
+            tempos: The tempo map that metronome marks get added to, usually
+                shared by every part; None means a new one.
+        """
+        self.divisions: float = 1.0
+        self.bar: float = 4.0
+        self.offset: float = 0.0
+        self.tempos = TempoMap() if tempos is None else tempos
+        self.changes: List[Tuple[float, float]] = []
+
+    def parse(
+        self, measure: ElementTree.Element
+    ) -> List[music21.note.GeneralNote]:
+        """Convert a measure to music21 notes.
+
+        Arguments:
+            measure: The measure element.
+
+        Returns:
+            The notes, chords and rests of the measure, with absolute offsets
+            and sorted like in a flattened music21 part.
+        """
+        voices = sorted(
+            {
+                voice.text.strip()
+                for voice in measure.findall("note/voice")
+                if voice.text and voice.text.strip()
+            }
+        )
+        ranks = {voice: rank for rank, voice in enumerate(voices)}
+        self.changes = []
+
+        # Sorting keys (offset, grace note last, voice and insertion order)
+        # followed by the notes themselves.
+        entries: List[tuple] = []
+        chord: List[ElementTree.Element] = []
+        children = list(measure)
+        position, voice = 0.0, "1"
+
+        for index, child in enumerate(children):
+            if child.tag == "attributes":
+                self.attributes(child)
+            elif child.tag in ("backup", "forward"):
+                text = (child.findtext("duration") or "").strip()
+                change = float(text) / self.divisions if text else 0.0
+                position += change if child.tag == "forward" else -change
+            elif child.tag == "direction":
+                self.direction(child, position)
+            elif child.tag == "note":
+                # Chords are built once their last note has been read.
+                following = children[index + 1 : index + 2]
+                if following and following[0].tag == "note":
+                    chorded = following[0].find("chord") is not None
+                else:
+                    chorded = False
+
+                if chorded or child.find("chord") is not None:
+                    chord.append(child)
+                    if chorded:
+                        continue
+                    element = music21.chord.Chord(list(map(self.note, chord)))
+                    members, chord = chord, []
+                elif child.find("rest") is not None:
+                    duration = self.duration(child)
+                    element = music21.note.Rest(quarterLength=duration)
+                    members = [child]
+                else:
+                    element = self.note(child)
+                    members = [child]
+
+                # Notes without voice belong to the last voice found.
+                for member in members:
+                    if text := (member.findtext("voice") or "").strip():
+                        voice = text
+                        break
+
+                lyrics = [
+                    self.lyric(lyric)
+                    for member in members
+                    for lyric in member.findall("lyric")
+                ]
+                # Setting the lyric property would parse hyphens.
+                for number, text in enumerate(lyrics, 1):
+                    lyric = music21.note.Lyric(number=number)
+                    lyric.text = text
+                    element.lyrics.append(lyric)
+
+                offset = music21.common.opFrac(position)
+                key = (offset, not element.duration.isGrace)
+                entries.append((*key, ranks.get(voice, 0), index, element))
+                position += element.duration.quarterLength
+
+        highest = max(
+            (offset + entry[-1].quarterLength for offset, *entry in entries),
+            default=0.0,
+        )
+
+        if len(voices) > 1:
+            entries.extend(self.rests(entries, len(voices), highest))
+        elif not entries:
+            # Empty measures get a rest that lasts the whole measure.
+            rest = music21.note.Rest(quarterLength=self.bar)
+            entries.append((0.0, True, 0, 0, rest))
+            highest = self.bar
+
+        result = []
+        for offset, *_, element in sorted(entries, key=lambda e: e[:4]):
+            element.offset = music21.common.opFrac(self.offset + offset)
+            result.append(element)
+
+        self.offset += highest
+        return result
+
+    def skip(self, measure: ElementTree.Element):
+        """Advance past a measure, only reading its tempo changes.
+
+        This method keeps the same state as :py:meth:`parse`, but doesn't
+        convert any note, so it's much quicker for unselected parts.
+
+        Arguments:
+            measure: The measure element.
+        """
+        self.changes = []
+        position = highest = 0.0
+        empty = True
+
+        for child in measure:
+            if child.tag == "attributes":
+                self.attributes(child)
+            elif child.tag in ("backup", "forward"):
+                text = (child.findtext("duration") or "").strip()
+                change = float(text) / self.divisions if text else 0.0
+                position += change if child.tag == "forward" else -change
+            elif child.tag == "direction":
+                self.direction(child, position)
+            elif child.tag == "note":
+                empty = False
+                # Chords take the duration of their first note.
+                if child.find("chord") is None:
+                    if child.find("grace") is None:
+                        position += self.duration(child)
+                    highest = max(highest, position)
+
+        self.offset += self.bar if empty else highest
+
+    def direction(self, direction: ElementTree.Element, position: float):
+        """Add the metronome marks of a direction element to the tempo map.
+
+        Like in music21, metric modulations and marks without a number are
+        ignored, and beat units default to a quarter note.
+
+        Arguments:
+            direction: The direction element.
+            position: The position of the direction in the measure, in
+                quarter lengths.
+        """
+        if text := (direction.findtext("offset") or "").strip():
+            position += float(text) / self.divisions
+
+        for metronome in direction.findall("direction-type/metronome"):
+            units = metronome.findall("beat-unit")
+            try:
+                number = float(metronome.findtext("per-minute") or "")
+            except ValueError:
+                continue
+            if len(units) > 1 or number <= 0:
+                continue
+
+            length = 1.0
+            if units:
+                length = LENGTHS.get((units[0].text or "").strip(), 1.0)
+                dots = len(metronome.findall("beat-unit-dot"))
+                length *= 2 - 0.5**dots
+
+            offset = float(music21.common.opFrac(self.offset + position))
+            change = offset, 60 / (number * length)
+            self.changes.append(change)
+            self.tempos.add(*change)
+
+    def rests(
+        self, entries: List[tuple], voices: int, highest: float
+    ) -> Iterator[tuple]:
+        """Generate hidden rests filling the gaps in every voice.
+
+        Arguments:
+            entries: The sorting keys and notes of the measure.
+            voices: The number of voices in the measure.
+            highest: The end offset of the measure, in quarter lengths.
+
+        Yields:
+            Sorting keys and rests, inserted after the rest of notes.
+        """
+        order = len(entries)
+        for rank in range(voices):
+            cursor, gaps = 0.0, []
+            for offset, _, _, _, element in sorted(
+                entry for entry in entries if entry[2] == rank
+            ):
+                if offset > cursor:
+                    gaps.append((cursor, offset - cursor))
+                cursor = max(cursor, offset + element.quarterLength)
+            if cursor < highest:
+                gaps.append((cursor, highest - cursor))
+
+            for offset, length in gaps:
+                rest = music21.note.Rest(quarterLength=length)
+                yield offset, True, rank, order, rest
+                order += 1
+
+    def attributes(self, attributes: ElementTree.Element):
+        """Update the divisions and time signature from an attributes element.
+
+        Arguments:
+            attributes: The attributes element.
+        """
+        if divisions := (attributes.findtext("divisions") or "").strip():
+            self.divisions = float(divisions)
+
+        if (time := attributes.find("time")) is not None:
+            bar = 0.0
+            for beats, kind in zip(
+                time.findall("beats"), time.findall("beat-type")
+            ):
+                try:
+                    numerator = sum(map(float, (beats.text or "").split("+")))
+                    bar += numerator * 4 / float(kind.text or "")
+                except ValueError:
+                    continue
+            self.bar = bar or self.bar
+
+    def note(self, element: ElementTree.Element) -> music21.note.Note:
+        """Convert a note element to a music21 note.
+
+        Arguments:
+            element: The note element; unpitched notes become middle C.
+
+        Returns:
+            A music21 note, which is a grace note if the element says so.
+        """
+        pitch = music21.pitch.Pitch()
+        if (source := element.find("pitch")) is not None:
+            pitch.step = (source.findtext("step") or "C").strip()
+            pitch.octave = int(source.findtext("octave") or 4)
+            if alter := (source.findtext("alter") or "").strip():
+                pitch.accidental = music21.pitch.Accidental(float(alter))
+
+        note = music21.note.Note(pitch, quarterLength=self.duration(element))
+        return note.getGrace() if element.find("grace") is not None else note
+
+    def duration(self, element: ElementTree.Element) -> float:
+        """Calculate the duration of a note element.
+
+        Like music21, this method prefers the note type, dots and time
+        modification to the raw duration, which is only used as a fallback.
+
+        Arguments:
+            element: The note element.
+
+        Returns:
+            The duration of the note, in quarter lengths.
+        """
+        kind = (element.findtext("type") or "").strip()
+        if kind in LENGTHS:
+            dots = len(element.findall("dot"))
+            length = Fraction(LENGTHS[kind]) * (2 - Fraction(1, 2**dots))
+            if (modification := element.find("time-modification")) is not None:
+                actual = int(modification.findtext("actual-notes") or 1)
+                normal = int(modification.findtext("normal-notes") or 1)
+                length *= Fraction(normal, actual)
+            return music21.common.opFrac(length)
+
+        duration = (element.findtext("duration") or "").strip()
+        return music21.common.opFrac(
+            float(duration) / self.divisions if duration else 0.0
+        )
+
+    @staticmethod
+    def lyric(element: ElementTree.Element) -> str:
+        """Extract the text of a lyric element.
+
+        Arguments:
+            element: The lyric element.
+
+        Returns:
+            The lyric text, joining the syllables of composite lyrics with
+            their elisions; like in music21, elisions only count when every
+            syllable up to them has a syllabic element, and default to a
+            space.
+        """
+        texts = [(text.text or "").strip() for text in element.findall("text")]
+        syllabics = len(element.findall("syllabic"))
+        elisions = [
+            elision.text or "" for elision in element.findall("elision")
+        ]
+        result = texts[0] if texts else ""
+        for index, text in enumerate(texts[1:], 1):
+            if index < syllabics and index - 1 < len(elisions):
+                result += elisions[index - 1] + text
+            else:
+                result += " " + text
+        return result
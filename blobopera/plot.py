@@ -0,0 +1,128 @@
+"""Piano roll plots.
+
+This module draws every part of a recording as a piano roll, with a bar for
+every sung note, spanning from its time to the time of the next note, and
+its lyrics on top. The bars of every part are drawn as a single collection
+instead of a shape per note, and figures are built without pyplot, so plots
+render on any process without a display or any global state.
+
+Example:
+    >>> with open("recording.png", "wb") as file:
+    >>>     render(recording, file)
+"""
+
+from typing import BinaryIO, Sequence
+
+import numpy  # type: ignore
+from matplotlib.collections import PolyCollection  # type: ignore
+from matplotlib.figure import Figure  # type: ignore
+
+from .phoneme import Phoneme
+from .recording import Part, Recording
+
+# Names of the parts, in recording order.
+NAMES: Sequence[str] = ("Soprano", "Alto", "Tenor", "Bass")
+
+# Colors of the parts, in recording order.
+COLORS: Sequence[str] = ("tab:red", "tab:orange", "tab:green", "tab:blue")
+
+# Size of the figures, in inches.
+SIZE = (16.0, 6.0)
+
+# Resolution of raster images, in dots per inch.
+DPI: int = 100
+
+# Height of the note bars, in semitones.
+HEIGHT: float = 0.8
+
+
+def figure(recording: Recording, labels: bool = True) -> Figure:
+    """Draw the piano roll of a recording.
+
+    Arguments:
+        recording: The recording to draw.
+        labels: Whether to write the lyrics of every sung note on its bar.
+
+    Returns:
+        A new figure, not managed by pyplot, with the piano roll.
+    """
+    result = Figure(figsize=SIZE, dpi=DPI)
+    axes = result.add_subplot()
+
+    # Protocol buffer wrappers are quite slow for per-note access, so read
+    # the underlying messages directly.
+    for index, part in enumerate(Recording.pb(recording).parts):
+        notes = part.notes
+        count = len(notes)
+        times = numpy.fromiter((note.time for note in notes), float, count)
+        pitches = numpy.fromiter((note.pitch for note in notes), float, count)
+        vowels = numpy.fromiter(
+            (note.syllable.vowel.phoneme for note in notes), int, count
+        )
+
+        # The last note lasts until the end of the part, so it doesn't get
+        # any bar.
+        ends = times.copy()
+        ends[:-1] = times[1:]
+        sung = (vowels != Phoneme.SILENCE.value) & (ends > times)
+
+        left, right = times[sung], ends[sung]
+        low, high = pitches[sung] - HEIGHT / 2, pitches[sung] + HEIGHT / 2
+        vertices = numpy.stack(
+            (
+                numpy.stack((left, left, right, right), axis=1),
+                numpy.stack((low, high, high, low), axis=1),
+            ),
+            axis=2,
+        )
+        color = COLORS[index % len(COLORS)]
+        axes.add_collection(
+            PolyCollection(
+                vertices,
+                facecolors=color,
+                edgecolors="black",
+                linewidths=0.3,
+                alpha=0.8,
+                label=NAMES[index] if index < len(NAMES) else f"Part {index}",
+            )
+        )
+
+        if labels:
+            lyrics = list(Part.wrap(part).lyrics())
+            for position in numpy.flatnonzero(sung):
+                if lyric := lyrics[position]:
+                    axes.text(
+                        times[position],
+                        pitches[position] + HEIGHT / 2,
+                        lyric.lower(),
+                        color=color,
+                        fontsize="xx-small",
+                        verticalalignment="bottom",
+                        clip_on=True,
+                    )
+
+    axes.autoscale_view()
+    axes.set_xlabel("Time (seconds)")
+    axes.set_ylabel("Pitch (MIDI)")
+    axes.grid(alpha=0.3)
+    if axes.collections:
+        axes.legend(loc="upper right")
+    result.tight_layout()
+    return result
+
+
+def render(
+    recording: Recording,
+    file: BinaryIO,
+    format: str = "png",
+    labels: bool = True,
+):
+    """Render the piano roll of a recording to an image.
+
+    Arguments:
+        recording: The recording to draw.
+        file: A binary stream to write the image to.
+        format: The image format, like png or svg.
+        labels: Whether to write the lyrics of every sung note on its bar.
+    """
+    figure(recording, labels).savefig(file, format=format)
@@ -0,0 +1,166 @@
+"""Time quantization.
+
+Recordings store note times as single-precision floats, so musical offsets
+like a third of a second must be snapped back to simple fractions before
+building scores. This module snaps every time of a part at once with NumPy,
+trying every allowed denominator for all the times in a single pass.
+
+The closest fraction wins and, on ties, the one with the smallest allowed
+denominator and then the smallest value, so, with the default denominators,
+the result is the same as calling
+:py:meth:`fractions.Fraction.limit_denominator` with a limit of 100 on every
+single-precision time.
+
+Example:
+    >>> quantized = quantize([0.0, 0.33333334, 0.6666667])
+    >>> quantized.fractions()
+    [Fraction(0, 1), Fraction(1, 3), Fraction(2, 3)]
+    >>> quantized.ticks(12)
+    array([0, 4, 8])
+"""
+
+from fractions import Fraction
+from typing import Iterable, List, NamedTuple, Sequence
+
+import numpy  # type: ignore
+
+# Allowed denominators by default; the same as the old per-note conversion.
+DENOMINATORS: Sequence[int] = range(1, 101)
+
+# Maximum number of times snapped at once, bounding the memory used by the
+# table of candidates.
+CHUNK: int = 4096
+
+
+class Quantized(NamedTuple):
+    """Times snapped to rational values.
+
+    Attributes:
+        numerators: The numerator of every snapped time.
+        denominators: The positive denominator of every snapped time; every
+            fraction is in lowest terms.
+        error: The maximum absolute difference between a time and its
+            snapped value, or zero if there aren't any times.
+    """
+
+    numerators: numpy.ndarray
+    denominators: numpy.ndarray
+    error: float
+
+    def fractions(self) -> List[Fraction]:
+        """Convert the snapped times to fractions.
+
+        Returns:
+            A fraction for every time, in order.
+        """
+        return [
+            Fraction(numerator, denominator)
+            for numerator, denominator in zip(
+                self.numerators.tolist(), self.denominators.tolist()
+            )
+        ]
+
+    def ticks(
+        self, resolution: int, start: Fraction = Fraction(0)
+    ) -> numpy.ndarray:
+        """Convert the snapped times to integer ticks.
+
+        Arguments:
+            resolution: The number of ticks per unit of time.
+            start: The time of the first tick.
+
+        Returns:
+            The number of ticks since the start of every snapped time,
+            rounded to the nearest integer, with ties to even like
+            :py:func:`round`.
+        """
+        numerators = (
+            self.numerators * start.denominator
+            - start.numerator * self.denominators
+        ) * resolution
+        denominators = self.denominators * start.denominator
+        quotients, remainders = numpy.divmod(numerators, denominators)
+        twice = 2 * remainders
+        up = (twice > denominators) | (
+            (twice == denominators) & (quotients % 2 == 1)
+        )
+        return quotients + up
+
+
+def quantize(
+    times: Iterable[float], denominators: Sequence[int] = DENOMINATORS
+) -> Quantized:
+    """Snap times to the closest fractions with some denominators.
+
+    Arguments:
+        times: The times to snap, in any unit.
+        denominators: The allowed denominators; a single one snaps the times
+            to a regular grid, like (12,) for triplet sixteenths of a quarter
+            note, and several ones snap every time to the best fit.
+
+    Returns:
+        The snapped times, with their maximum error.
+
+    Raises:
+        ValueError: If there isn't any denominator or some of them isn't
+            positive.
+    """
+    values = numpy.asarray(
+        times if isinstance(times, numpy.ndarray) else list(times),
+        dtype=numpy.float64,
+    ).reshape(-1)
+    candidates = numpy.unique(numpy.asarray(denominators, dtype=numpy.int64))
+    if not len(candidates) or candidates[0] < 1:
+        raise ValueError("denominators must be positive")
+
+    numerators = numpy.empty(len(values), dtype=numpy.int64)
+    result = numpy.empty(len(values), dtype=numpy.int64)
+
+    # Most times are exact multiples of some power of two, like halves or
+    # eighths, so they already are as close as they can get.
+    exact = numpy.zeros(len(values), dtype=bool)
+    if len(powers := candidates[(candidates & (candidates - 1)) == 0]):
+        scaled = values * powers[-1]
+        exact = scaled == numpy.floor(scaled)
+        numerators[exact] = scaled[exact]
+        result[exact] = powers[-1]
+
+    pending = numpy.flatnonzero(~exact)
+    for first in range(0, len(pending), CHUNK):
+        chunk = pending[first : first + CHUNK]
+        numerators[chunk], result[chunk] = _snap(values[chunk], candidates)
+
+    divisors = numpy.gcd(numerators, result)
+    numerators //= divisors
+    result //= divisors
+
+    error = numpy.abs(values - numerators / result)
+    return Quantized(
+        numerators, result, float(error.max()) if len(error) else 0.0
+    )
+
+
+def _snap(values: numpy.ndarray, candidates: numpy.ndarray):
+    """Snap some times to the closest fractions.
+
+    Arguments:
+        values: The times to snap.
+        candidates: The allowed denominators, sorted and unique.
+
+    Returns:
+        The numerators and denominators of the snapped times.
+    """
+    # Take the closest numerator for every denominator, rounding halves
+    # down. Products of single-precision times and small denominators are
+    # exact, so distances only get rounded when divided, and equally close
+    # fractions get exactly the same distance.
+    scaled = values[:, None] * candidates
+    numerators = numpy.ceil(scaled - 0.5)
+    distances = numpy.abs(scaled - numerators)
+    distances /= candidates
+
+    # Denominators are sorted, so the first of the closest fractions has the
+    # smallest one.
+    index = distances.argmin(axis=1)
+    rows = numpy.arange(len(values))
+    return numerators[rows, index], candidates[index]
@@ -1,13 +1,28 @@
+from collections import deque
 from fractions import Fraction
-from typing import List, Optional, Sequence, Tuple, Type
+from itertools import islice
+from time import perf_counter
+from typing import (
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 import music21  # type: ignore
 import proto  # type: ignore
 from more_itertools import split_before, windowed_complete
 
+from . import timing
 from .languages import GenericLanguage, Language
 from .location import Location
 from .phoneme import Phoneme
+from .quantize import quantize
+from .tempo import TempoMap
 from .theme import Theme
 
 __protobuf__ = proto.module(package=__name__)
@@ -188,22 +203,9 @@ class Note(proto.Message):
             A music21 note with an extra ad-hoc attribute holding all the
             phonemes so they can be processed later and converted to strings.
         """
-        if Syllable.to_phonemes(self.syllable)[0].is_silence():
-            note = music21.note.Rest()
-        else:
-            note = music21.note.Note()
-            note.pitch.midi = self.pitch
-
-        # Unfortunately, timing information is being stored as IEEE 754
-        # binary32 single-precision float, so we need to reconstruct the
-        # original fraction to the nearest denominator to approximate its
-        # real musical duration. This is a humongous HACK and yields wrong
-        # results for durations below the two hundred fifty-sixth note. This
-        # duration is small enough to be considered acceptable, but...
-        note.offset = Fraction(self.time).limit_denominator(100)
-
-        note.phonemes = Syllable.to_phonemes(self.syllable)
-        return note
+        note = Note.pb(self)
+        offset = quantize([note.time]).fractions()[0]
+        return _note(note, _phonemes(note.syllable), offset)
 
 
 class Part(proto.Message):
@@ -233,6 +235,7 @@ class Part(proto.Message):
         language: Type[Language] = GenericLanguage,
         tempo: float = 1.0,
         fill: Phoneme = Phoneme.SILENCE,
+        tempos: Optional[TempoMap] = None,
     ):
         """Create a Blob Opera part from a music21 part.
 
@@ -241,30 +244,140 @@ class Part(proto.Message):
             language: The absolute start offset of the note, in seconds.
             tempo: The tempo correction factor; 0.5 makes it twice as slow.
             fill: The phoneme to use if none of the notes has lyrics.
+            tempos: The tempo map of the score; None means building it from
+                the metronome marks of the part.
 
         Returns:
             An instance of this class containing the basic information required
             to play the given part.
         """
-        notes = (
+        # Retrieve the observer once; timing has no cost when disabled.
+        if timings := timing.observer.get():
+            mark = perf_counter()
+
+        notes = [
             event
             for event in part.flat
             if isinstance(event, music21.note.GeneralNote)
-        )
+        ]
 
-        result = self()
-        language: Language = language(part)
+        if timings:
+            mark = timings.lap("flatten", mark)
+
+        if tempos is None:
+            tempos = TempoMap.from_stream(part)
+
+            if timings:
+                mark = timings.lap("tempo", mark)
+
+        instance = language(part)
 
-        # Iterate over the notes while having available a list with all the
-        # previous note, the current note, and a list with all the next notes.
-        for before, current, after in windowed_complete(notes, 1):
-            before, current, after = list(before), current[0], list(after)
+        # Languages following the protocol parse every note at once, which is
+        # usually much quicker than parsing them one by one.
+        if not hasattr(instance, "parse_all"):
+            return self.from_notes(notes, instance, tempo, fill, tempos=tempos)
 
-            # Use the language parser to obtain the phonemes for the current
-            # note. Passing the previous and next notes will allow the parser
-            # to infer the sound of a syllable in languages where it may vary
-            # depending on its position in a word or the previous/next letters.
-            phonemes: list = language.parse(before, current, after)
+        phonemes = instance.parse_all(notes)
+
+        if timings:
+            timings.lap("language", mark)
+
+        return self.from_phonemes(zip(notes, phonemes), tempo, fill, tempos)
+
+    @classmethod
+    def from_notes(
+        self,
+        notes: Iterable[music21.note.GeneralNote],
+        language: Language,
+        tempo: float = 1.0,
+        fill: Phoneme = Phoneme.SILENCE,
+        context: Optional[int] = None,
+        tempos: Optional[TempoMap] = None,
+    ):
+        """Create a Blob Opera part from a sequence of music21 notes.
+
+        Unlike :py:meth:`from_part`, this method doesn't need a complete
+        music21 part, so notes can be generated on the fly and discarded as
+        soon as they're converted.
+
+        Arguments:
+            notes: The notes, chords and rests of the part, in order.
+            language: The language instance used for converting lyrics to
+                language-agnostic phonemes.
+            tempo: The tempo correction factor; 0.5 makes it twice as slow.
+            fill: The phoneme to use if none of the notes has lyrics.
+            context: The maximum number of previous and next notes passed to
+                the language parser; None means all of them, which requires
+                keeping every note in memory.
+            tempos: The tempo map of the score, which may keep growing while
+                the notes are generated; None means a quarter note per second.
+
+        Returns:
+            An instance of this class containing the basic information required
+            to play the given notes.
+        """
+        timings = timing.observer.get()
+
+        def parse() -> Iterator[Tuple[music21.note.GeneralNote, list]]:
+            if timings:
+                mark = perf_counter()
+
+            # Iterate over the notes while having available a list with all
+            # the previous notes, the current note, and a list with all the
+            # next notes.
+            for before, current, after in _window(notes, context):
+                if timings:
+                    mark = timings.lap("read", mark)
+
+                # Use the language parser to obtain the phonemes for the
+                # current note. Passing the previous and next notes will allow
+                # the parser to infer the sound of a syllable in languages
+                # where it may vary depending on its position in a word or the
+                # previous/next letters.
+                phonemes = language.parse(before, current, after)
+
+                if timings:
+                    timings.lap("language", mark)
+
+                yield current, phonemes
+
+                if timings:
+                    mark = perf_counter()
+
+        return self.from_phonemes(parse(), tempo, fill, tempos)
+
+    @classmethod
+    def from_phonemes(
+        self,
+        notes: Iterable[Tuple[music21.note.GeneralNote, List[Phoneme]]],
+        tempo: float = 1.0,
+        fill: Phoneme = Phoneme.SILENCE,
+        tempos: Optional[TempoMap] = None,
+    ):
+        """Create a Blob Opera part from music21 notes and their phonemes.
+
+        Arguments:
+            notes: Pairs of notes, chords or rests, in order, and the phonemes
+                that a language parser obtained for them; phoneme lists may be
+                modified.
+            tempo: The tempo correction factor; 0.5 makes it twice as slow.
+            fill: The phoneme to use if none of the notes has lyrics.
+            tempos: The tempo map of the score, used for converting note
+                offsets to seconds; None means a quarter note per second.
+
+        Returns:
+            An instance of this class containing the basic information required
+            to play the given notes.
+        """
+        timings = timing.observer.get()
+        result = self()
+        if tempos is None:
+            tempos = TempoMap()
+
+        for current, phonemes in notes:
+            if timings:
+                timings.count("notes")
+                mark = perf_counter()
 
             # Extract the start consonants so they can be moved to the previous
             # note, as every note must begin with a vowel in order to produce
@@ -307,6 +420,11 @@ class Part(proto.Message):
             else:
                 syllables = [[fill]]
 
+            if timings:
+                timings.count("consonants", len(start))
+                timings.count("syllables", len(syllables))
+                mark = timings.lap("syllabification", mark)
+
             # The length of the original note will be divided in equally sized
             # parts to accomodate each of these syllable fragments. Resorting
             # to the example above, a quarter note would be divided into a
@@ -314,7 +432,8 @@ class Part(proto.Message):
             # corresponding syllable fragment.
             for index, syllable in enumerate(syllables):
                 duration = current.quarterLength / len(syllables)
-                time = (current.offset + index * duration) / tempo
+                offset = current.offset + index * duration
+                time = tempos.seconds(offset) / tempo
 
                 # Try to determine a fallback pitch for filling the decay time
                 # before rests, so there isn't a low hum.
@@ -325,10 +444,55 @@ class Part(proto.Message):
                     fallback = None
 
                 note = Note.from_note(current, time, syllable, fallback)
+
+                if timings:
+                    if isinstance(current, music21.note.Rest) and fallback:
+                        timings.count("fallbacks")
+                    mark = timings.lap("note", mark)
+
                 result.notes.append(note)
 
+                if timings:
+                    mark = timings.lap("append", mark)
+
         return result
 
+    def lyrics(self) -> Iterator[Optional[str]]:
+        """Generate the textual lyrics for each note of this part.
+
+        Start phonemes are prepended to the first note and, as rests can't
+        hold lyrics, their consonants are migrated to the next note that
+        begins with a vowel.
+
+        Yields:
+            The phonemes of each note as an uppercase string, or
+            :py:obj:`None` for notes without lyrics.
+        """
+        # Protocol buffer wrappers are quite slow for per-note access, so
+        # read the underlying messages directly.
+        message = Part.pb(self)
+        yield from _lyrics(
+            message.start,
+            (_phonemes(note.syllable) for note in message.notes),
+        )
+
+    def compact(self) -> "Part":
+        """Merge the redundant notes of this part.
+
+        Consecutive notes are redundant when they share pitch and vowel and
+        nothing but that vowel is uttered between them, like tied notes,
+        vowel continuations or consecutive rests; the first note is extended
+        until the end of the last one, and inherits its suffix. The last
+        note of the part is always kept, because its duration is implicit.
+
+        Returns:
+            A new part without redundant notes.
+        """
+        result = Part.pb(self).__class__()
+        result.CopyFrom(Part.pb(self))
+        _compact(result)
+        return Part.wrap(result)
+
     def to_part(self, name: str = "") -> music21.stream.Part:
         """Extract the equivalent music21 part for this Blob Opera part.
 
@@ -339,39 +503,25 @@ class Part(proto.Message):
             A music21 part with all the notes in this Blob Opera part, along
             with the raw phonemes as lyrics, in uppercase.
         """
-        # Convert each Blob Opera note to a music21 note.
-        notes = [note.to_note() for note in self.notes]
+        # Convert each Blob Opera note to a music21 note, extracting the
+        # phonemes of every note only once.
+        message = Part.pb(self)
+        phonemes = [_phonemes(note.syllable) for note in message.notes]
 
-        # Prepend the start phonemes to the first note.
-        if notes:
-            # FIXME: https://github.com/googleapis/proto-plus-python/issues/179
-            start = [Phoneme(timed.phoneme) for timed in self.start]
-            notes[0].phonemes[:0] = start  # Extend from the beginning.
-
-        # Migrate consonants from previous rests to the actual notes.
-        for current, note in enumerate(notes):
-            # Determine whether the current "note" is a rest.
-            if note.phonemes and note.phonemes[0].is_silence():
-                # Find the next "real" note to transfer the consonants.
-                for real in range(current, len(notes)):
-                    if (lyric := notes[real].phonemes) and lyric[0].is_vowel():
-                        # Prepend the consonants to the found note.
-                        new = filter(Phoneme.is_consonant, note.phonemes)
-                        notes[real].phonemes[:0] = list(new)
-                        break
-                # Clear the phonemes from the rest.
-                notes[current].phonemes = []
-
-        # Convert all the phonemes in each note to textual lyrics. The
-        # ``phonemes`` attribute is not part of the music21.note.GeneralNote
-        # class; we create it on the fly from ``Note.to_note()`` instead.
-        for note in notes:
-            lyric = (
-                phoneme.name
-                for phoneme in note.phonemes
-                if not phoneme.is_silence()
-            )
-            note.lyric = "".join(lyric) or None
+        # Unfortunately, timing information is being stored as IEEE 754
+        # binary32 single-precision float, so we need to reconstruct the
+        # original fraction to the nearest denominator to approximate its
+        # real musical duration. This is a humongous HACK and yields wrong
+        # results for durations below the two hundred fifty-sixth note. This
+        # duration is small enough to be considered acceptable, but...
+        offsets = quantize(note.time for note in message.notes).fractions()
+        notes = [
+            _note(*items) for items in zip(message.notes, phonemes, offsets)
+        ]
+
+        # Convert all the phonemes in each note to textual lyrics.
+        for note, lyric in zip(notes, _lyrics(message.start, phonemes)):
+            note.lyric = lyric
 
         # Start building a music21 part with the provided name.
         part = music21.stream.Part()
@@ -379,21 +529,24 @@ class Part(proto.Message):
 
         # Calculate note and rest durations by subtracting the absolute start
         # time of the current note to the absolute start time of the next note.
+        # The core methods don't update the stream after every element, so
+        # it gets updated once at the end.
         for note, next_note in zip(notes, notes[1:]):
             note.quarterLength = next_note.offset - note.offset
-            part.append(note)
+            part.coreAppend(note)
 
         # We can't determine the duration of the last note, as there isn't
         # any further element to subtract the duration from, so we append it
         # directly, assuming the default duration of a quarter note (1 second
         # at 60 beats per minute)
         if notes:
-            part.append(notes[-1])
+            part.coreAppend(notes[-1])
 
         # Add a metronome mark so quarter notes last a second.
         metronome = music21.tempo.MetronomeMark(number=60)
         metronome.durationToSeconds(music21.duration.Duration(1.0))
-        part.insert(0, metronome)
+        part.coreInsert(0, metronome)
+        part.coreElementsChanged()
 
         return part
 
@@ -434,8 +587,9 @@ class Recording(proto.Message):
             theme: The user interface theme for the Blob Opera experiment.
             language: The language class used for converting lyrics to
                 language-agnostic phonemes.
-            tempo: The tempo factor to use when interpreting the score, where
-                2.0 would mean twice as quick and 0.5 twice as slow.
+            tempo: The tempo factor applied on top of the metronome marks of
+                the score, where 2.0 would mean twice as quick and 0.5 twice
+                as slow; scores without marks play a quarter note per second.
             parts: The indexes for the four parts that should be used as
                 soprano, alto, tenor and bass, in that order. Indexes use the
                 same notation as Python indexes, where 0 means the topmost
@@ -456,6 +610,9 @@ class Recording(proto.Message):
         """
         if len(parts) != 4:
             raise ValueError("recordings require exactly four tracks")
+        # Tempo changes apply to every part, even if only one of them has
+        # the metronome marks, so the map gets built from the whole score.
+        tempos = TempoMap.from_stream(score)
         try:
             recording = Recording(theme=theme, location=location)
             for index in parts:
@@ -464,6 +621,7 @@ class Recording(proto.Message):
                     language,
                     tempo,
                     fill,
+                    tempos,
                 )
                 recording.parts.append(part)
         except IndexError:
@@ -471,6 +629,25 @@ class Recording(proto.Message):
         else:
             return recording
 
+    def compact(self) -> "Recording":
+        """Reduce the size of this recording without altering its sound.
+
+        Redundant notes of every part are merged as in
+        :py:meth:`Part.compact`, and fields holding default values are
+        cleared, so they aren't serialized.
+
+        Returns:
+            A new, compacted, recording.
+        """
+        # Protocol buffer wrappers are quite slow for per-note access, so
+        # work on a copy of the underlying message.
+        result = Recording.pb(self).__class__()
+        result.CopyFrom(Recording.pb(self))
+        for part in result.parts:
+            _compact(part)
+        _prune(result)
+        return Recording.wrap(result)
+
     def to_score(
         self, title: str = "", composer: str = ""
     ) -> music21.stream.Score:
@@ -502,3 +679,179 @@ class Recording(proto.Message):
         metadata = music21.metadata.Metadata(composer=composer, title=title)
         score = music21.stream.Score([metadata] + parts)
         return score
+
+
+def _window(
+    notes: Iterable[music21.note.GeneralNote], context: Optional[int]
+) -> Iterator[Tuple[list, music21.note.GeneralNote, list]]:
+    """Generate every note along with the lists of previous and next notes.
+
+    Arguments:
+        notes: The notes to iterate over.
+        context: The maximum length of the previous and next note lists, or
+            None for unbounded lists.
+
+    Yields:
+        Tuples of previous notes, current note and next notes.
+    """
+    if context is None:
+        for before, current, after in windowed_complete(list(notes), 1):
+            yield list(before), current[0], list(after)
+        return
+
+    iterator = iter(notes)
+    before: deque = deque(maxlen=context)
+    after: deque = deque(islice(iterator, context + 1))
+    while after:
+        current = after.popleft()
+        after.extend(islice(iterator, 1))
+        yield list(before), current, list(after)
+        before.append(current)
+
+
+def _compact(part) -> None:
+    """Merge the redundant notes of a raw part message, in place.
+
+    Arguments:
+        part: The underlying protocol buffer message of a :py:class:`Part`.
+    """
+    notes: list = []
+    for index, note in enumerate(part.notes):
+        if (
+            notes
+            and index < len(part.notes) - 1
+            and _redundant(notes[-1], note)
+        ):
+            # Extend the previous note, which keeps its own time.
+            del notes[-1].syllable.suffix[:]
+            notes[-1].syllable.suffix.extend(note.syllable.suffix)
+        else:
+            notes.append(note)
+
+    if len(notes) < len(part.notes):
+        # Repeated fields can't be reassigned, so copy the notes back.
+        notes = [
+            type(note).FromString(note.SerializeToString()) for note in notes
+        ]
+        del part.notes[:]
+        part.notes.extend(notes)
+
+
+def _redundant(previous, note) -> bool:
+    """Determine whether a raw note message just continues the previous one.
+
+    Arguments:
+        previous: The underlying protocol buffer message of the previous note.
+        note: The underlying protocol buffer message of the note.
+
+    Returns:
+        Whether the note has the same pitch and vowel as the previous one, and
+        the previous note doesn't utter anything else between them.
+    """
+    vowel = previous.syllable.vowel
+    return (
+        note.pitch == previous.pitch
+        and note.controlled == previous.controlled
+        and note.syllable.vowel == vowel
+        and all(
+            timed.phoneme == vowel.phoneme
+            for timed in previous.syllable.suffix
+        )
+    )
+
+
+def _prune(message) -> None:
+    """Clear every scalar field holding its default value, recursively.
+
+    Arguments:
+        message: A raw protocol buffer message with explicit field presence.
+    """
+    for field, value in message.ListFields():
+        repeated = field.label == field.LABEL_REPEATED
+        if field.message_type is None:
+            # Repeated scalars don't have any default value to clear.
+            if not repeated and value == field.default_value:
+                message.ClearField(field.name)
+        elif repeated:
+            for item in value:
+                _prune(item)
+        else:
+            _prune(value)
+
+
+def _note(
+    message, phonemes: List[Phoneme], offset: Fraction
+) -> music21.note.GeneralNote:
+    """Convert a raw note message to a music21 note.
+
+    Arguments:
+        message: The raw protocol buffer message of a :py:class:`Note`.
+        phonemes: The phonemes of the note syllable.
+        offset: The quantized time of the note; see :py:mod:`.quantize`.
+
+    Returns:
+        A music21 note, as described in :py:meth:`Note.to_note`.
+    """
+    if phonemes[0].is_silence():
+        note = music21.note.Rest()
+    else:
+        note = music21.note.Note()
+        note.pitch.midi = message.pitch
+
+    note.offset = offset
+
+    note.phonemes = phonemes
+    return note
+
+
+def _phonemes(syllable) -> List[Phoneme]:
+    """Extract all the phonemes from a raw syllable message.
+
+    This is the same as :py:meth:`Syllable.to_phonemes`, but much quicker.
+
+    Arguments:
+        syllable: The raw protocol buffer message of a :py:class:`Syllable`.
+
+    Returns:
+        All the phonemes from the syllable, in order.
+    """
+    return [
+        Phoneme(timed.phoneme) for timed in (syllable.vowel, *syllable.suffix)
+    ]
+
+
+def _lyrics(
+    start: Iterable[TimedPhoneme], notes: Iterable[List[Phoneme]]
+) -> Iterator[Optional[str]]:
+    """Generate the textual lyrics for each note of a part.
+
+    Arguments:
+        start: The timed phonemes of the part start, as raw messages.
+        notes: The phonemes of every note of the part.
+
+    Yields:
+        The lyrics of every note, as described in :py:meth:`Part.lyrics`.
+    """
+    initial = [Phoneme(timed.phoneme) for timed in start]
+    # Consonants from previous rests, waiting for the next actual note; the
+    # ones from later rests go first.
+    pending: Deque[Phoneme] = deque()
+
+    for phonemes in notes:
+        phonemes, initial = initial + phonemes, []
+
+        # Determine whether the current "note" is a rest.
+        if phonemes[0].is_silence():
+            # Keep the consonants for the next "real" note.
+            consonants = filter(Phoneme.is_consonant, phonemes)
+            pending.extendleft(reversed(list(consonants)))
+            phonemes = []
+        elif phonemes[0].is_vowel():
+            # Prepend the consonants from the previous rests.
+            phonemes[:0] = pending
+            pending.clear()
+
+        lyric = (
+            phoneme.name for phoneme in phonemes if not phoneme.is_silence()
+        )
+        yield "".join(lyric) or None
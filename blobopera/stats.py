@@ -0,0 +1,266 @@
+"""Recording statistics.
+
+This module summarizes the notes and phonemes of recordings part by part,
+with a few vectorized passes over the note arrays of every part. Summaries
+only hold counts, sums and histograms, so the summaries of many recordings
+can be merged into a single one without keeping any of them around.
+
+Example:
+    >>> totals = []
+    >>> for recording in recordings:
+    >>>     totals = merge(totals, summarize(recording))
+    >>> totals[0].to_dict()["density"]
+"""
+
+from itertools import chain, zip_longest
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy  # type: ignore
+
+from .phoneme import Phoneme
+from .recording import Recording
+
+# Number of bins of the pitch histograms, one for every MIDI pitch.
+PITCHES: int = 128
+
+# Names of the scalar statistics, in output order.
+FIELDS: Sequence[str] = (
+    "parts",
+    "notes",
+    "rests",
+    "syllables",
+    "duration",
+    "density",
+    "rest_ratio",
+    "syllables_per_note",
+    "lowest",
+    "highest",
+)
+
+
+class Summary(NamedTuple):
+    """Statistics of a part, or of many parts merged together.
+
+    Attributes:
+        parts: The number of summarized parts.
+        notes: The number of sung notes, i.e. notes that aren't rests.
+        rests: The number of rests.
+        syllables: The number of sung notes starting a new syllable instead
+            of just holding the vowel of the previous note.
+        duration: The time from the first to the last note of every part,
+            added up, in seconds.
+        silence: The duration of every rest, added up, in seconds.
+        pitches: The number of sung notes with every MIDI pitch.
+        phonemes: The number of times every phoneme gets uttered, by code,
+            including the part starts.
+    """
+
+    parts: int
+    notes: int
+    rests: int
+    syllables: int
+    duration: float
+    silence: float
+    pitches: numpy.ndarray
+    phonemes: numpy.ndarray
+
+    @classmethod
+    def empty(cls) -> "Summary":
+        """Create the summary of no parts at all.
+
+        Returns:
+            An instance of this class with every statistic set to zero.
+        """
+        return cls(
+            0,
+            0,
+            0,
+            0,
+            0.0,
+            0.0,
+            numpy.zeros(PITCHES, dtype=numpy.int64),
+            numpy.zeros(len(Phoneme), dtype=numpy.int64),
+        )
+
+    def merge(self, other: "Summary") -> "Summary":
+        """Merge the statistics of two summaries.
+
+        Arguments:
+            other: The summary to merge with this one.
+
+        Returns:
+            A new instance of this class with the statistics of both.
+        """
+        return type(self)(
+            *(mine + theirs for mine, theirs in zip(self, other))
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        """Describe the statistics.
+
+        Returns:
+            A dictionary, suitable for serializing as JSON, with every field
+            in :py:data:`FIELDS`, where ratios without notes or duration and
+            pitch bounds without sung notes are None, followed by ``pitches``
+            and ``phonemes`` dictionaries with the nonzero histogram counts,
+            by MIDI pitch and phoneme name.
+        """
+        present = numpy.flatnonzero(self.pitches)
+        return {
+            "parts": self.parts,
+            "notes": self.notes,
+            "rests": self.rests,
+            "syllables": self.syllables,
+            "duration": self.duration,
+            "density": _ratio(self.notes, self.duration),
+            "rest_ratio": _ratio(self.silence, self.duration),
+            "syllables_per_note": _ratio(self.syllables, self.notes),
+            "lowest": int(present[0]) if len(present) else None,
+            "highest": int(present[-1]) if len(present) else None,
+            "pitches": {
+                str(pitch): int(self.pitches[pitch]) for pitch in present
+            },
+            "phonemes": {
+                Phoneme(code).name: int(self.phonemes[code])
+                for code in numpy.flatnonzero(self.phonemes)
+            },
+        }
+
+    def to_row(self) -> Dict[str, object]:
+        """Describe the statistics as a flat table row.
+
+        Returns:
+            A dictionary with every field in :py:data:`FIELDS`, as in
+            :py:meth:`to_dict`, followed by a ``pitch_`` column for every
+            MIDI pitch and a ``phoneme_`` column for every phoneme name,
+            holding their histogram counts, zeros included.
+        """
+        values = self.to_dict()
+        return {
+            **{field: values[field] for field in FIELDS},
+            **{
+                f"pitch_{pitch}": int(count)
+                for pitch, count in enumerate(self.pitches)
+            },
+            **{
+                f"phoneme_{phoneme.name}": int(self.phonemes[phoneme.value])
+                for phoneme in Phoneme
+            },
+        }
+
+
+def summarize(recording: Recording) -> List[Summary]:
+    """Calculate the statistics of every part of a recording.
+
+    Arguments:
+        recording: The recording to summarize.
+
+    Returns:
+        A summary for every part, in order.
+    """
+    # Protocol buffer wrappers are quite slow for per-note access, so read
+    # the underlying messages directly.
+    return [_part(part) for part in Recording.pb(recording).parts]
+
+
+def merge(
+    summaries: Iterable[Summary], others: Iterable[Summary]
+) -> List[Summary]:
+    """Merge two lists of summaries, part by part.
+
+    Arguments:
+        summaries: The summaries of every part, like the running totals of
+            many recordings.
+        others: The summaries of every part of another recording; either
+            list may have more parts than the other.
+
+    Returns:
+        The merged summary of every part, in order.
+    """
+    empty = Summary.empty()
+    return [
+        mine.merge(theirs)
+        for mine, theirs in zip_longest(summaries, others, fillvalue=empty)
+    ]
+
+
+def _part(part) -> Summary:
+    """Calculate the statistics of a part.
+
+    Arguments:
+        part: The raw protocol buffer message of a :py:class:`.Part`.
+
+    Returns:
+        The summary of the part.
+    """
+    notes = part.notes
+    count = len(notes)
+    times = numpy.fromiter((note.time for note in notes), float, count)
+    pitches = numpy.fromiter((note.pitch for note in notes), float, count)
+    vowels = numpy.fromiter(
+        (note.syllable.vowel.phoneme for note in notes), int, count
+    )
+    # Whether every note holds its vowel until the next one, without
+    # uttering any consonant or any other vowel.
+    held = numpy.fromiter(
+        (
+            all(
+                timed.phoneme == note.syllable.vowel.phoneme
+                for timed in note.syllable.suffix
+            )
+            for note in notes
+        ),
+        bool,
+        count,
+    )
+    phonemes = numpy.fromiter(
+        (
+            timed.phoneme
+            for timed in chain(
+                part.start,
+                *(
+                    (note.syllable.vowel, *note.syllable.suffix)
+                    for note in notes
+                ),
+            )
+        ),
+        int,
+    )
+
+    # The last note lasts until the end of the part, so it doesn't have any.
+    durations = numpy.zeros(count)
+    durations[:-1] = numpy.diff(times)
+    rests = vowels == Phoneme.SILENCE.value
+    sung = ~rests
+
+    # Notes holding the vowel of the previous sung note just continue its
+    # syllable, like ties or melismas.
+    continued = numpy.zeros(count, dtype=bool)
+    continued[1:] = sung[:-1] & held[:-1] & (vowels[1:] == vowels[:-1])
+
+    midi = numpy.rint(pitches[sung])
+    midi = midi[(midi >= 0) & (midi < PITCHES)].astype(numpy.int64)
+    known = phonemes[(phonemes >= 0) & (phonemes < len(Phoneme))]
+    return Summary(
+        1,
+        int(sung.sum()),
+        int(rests.sum()),
+        int((sung & ~continued).sum()),
+        float(times[-1] - times[0]) if count else 0.0,
+        float(durations[rests].sum()),
+        numpy.bincount(midi, minlength=PITCHES),
+        numpy.bincount(known, minlength=len(Phoneme)),
+    )
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    """Divide two statistics.
+
+    Arguments:
+        numerator: The dividend.
+        denominator: The divisor.
+
+    Returns:
+        The quotient, or None if the divisor is zero.
+    """
+    return float(numerator / denominator) if denominator else None
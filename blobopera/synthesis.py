@@ -0,0 +1,455 @@
+"""Offline audio previews.
+
+This module synthesizes a rough preview of a recording, so it can be heard
+without uploading it. Every sung note becomes a harmonic oscillator whose
+harmonics are shaped by the formants of its vowel, with the pitch jitter of
+:py:class:`.jitter.Generator` on top, and rests become silence; consonants
+aren't synthesized at all.
+
+Voices are rendered in fixed-size blocks, which get mixed and written to the
+output file as soon as they're ready, so memory use doesn't depend on the
+length of the recording. Voices can be rendered on worker processes, which
+stream their blocks back through bounded queues.
+
+Example:
+    >>> with open("recording.wav", "wb") as file:
+    >>>     render(recording, file, jitter=jitter, jobs=4)
+"""
+
+import math
+import multiprocessing
+import queue
+import wave
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
+
+import numpy  # type: ignore
+
+from .jitter import Generator, Jitter, check
+from .phoneme import Phoneme
+from .recording import Part, Recording
+
+# Sample rate of the rendered audio, in hertz.
+RATE: int = 22050
+
+# Number of samples rendered at once by every voice.
+BLOCK: int = 4096
+
+# Number of jitter values per second; every value is a pitch deviation, in
+# semitones.
+JITTER: int = 100
+
+# Number of harmonics of every oscillator; the ones above the Nyquist
+# frequency are muted.
+HARMONICS: int = 24
+
+# Frequencies of the first three formants of every vowel, in hertz.
+FORMANTS = {
+    Phoneme.A: (800.0, 1150.0, 2900.0),
+    Phoneme.E: (400.0, 1600.0, 2700.0),
+    Phoneme.I: (270.0, 2300.0, 3000.0),
+    Phoneme.O: (450.0, 800.0, 2830.0),
+    Phoneme.U: (325.0, 700.0, 2530.0),
+}
+
+# Harmonic numbers of the oscillators.
+_HARMONICS = numpy.arange(1, HARMONICS + 1)
+
+# Gain of every formant.
+GAINS = (1.0, 0.5, 0.25)
+
+# Bandwidth of every formant, in hertz.
+WIDTH: float = 100.0
+
+# Duration of the fades at the start and end of every phrase, in seconds.
+FADE: float = 0.02
+
+# Silence after the last note, in seconds.
+TAIL: float = 0.5
+
+# Maximum number of blocks waiting to be mixed, for every worker.
+QUEUE: int = 8
+
+
+class Voice:
+    """Synthesizer for a single part.
+
+    Attributes:
+        times: The start time of every note, in seconds.
+        ends: The end time of every note, in seconds; the last note lasts
+            until the end of the part, so it doesn't have any.
+        pitches: The MIDI pitch of every note.
+        vowels: The vowel code of every note.
+        sung: Whether every note gets sung, i.e. has a vowel and some
+            duration.
+        phrases: The start and end times of the phrase, i.e. the run of
+            consecutive sung notes, of every note.
+        amplitudes: The amplitude of every note, for every harmonic.
+        phase: The phase of the oscillator at the end of the last block.
+    """
+
+    def __init__(
+        self,
+        part: Part,
+        jitter: Optional[Jitter] = None,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the voice.
+
+        Arguments:
+            part: The part to synthesize.
+            jitter: The jitter templates for the pitch deviations, if any.
+            seed: The seed of the jitter generator, if any.
+
+        Raises:
+            ValueError: If the jitter templates could never yield any value;
+                see :py:func:`.jitter.check`.
+        """
+        # Protocol buffer wrappers are quite slow for per-note access, so
+        # read the underlying messages directly.
+        notes = Part.pb(part).notes
+        count = len(notes)
+        self.times = numpy.fromiter(
+            (note.time for note in notes), float, count
+        )
+        self.pitches = numpy.fromiter(
+            (note.pitch for note in notes), float, count
+        )
+        self.vowels = numpy.fromiter(
+            (note.syllable.vowel.phoneme for note in notes), int, count
+        )
+
+        self.ends = self.times.copy()
+        self.ends[:-1] = self.times[1:]
+        self.sung = numpy.isin(self.vowels, [int(v) for v in FORMANTS]) & (
+            self.ends > self.times
+        )
+
+        # Find the first and last note of the phrase of every note, so fades
+        # don't break legato notes.
+        indexes = numpy.arange(count)
+        before = numpy.zeros(count, dtype=bool)
+        before[1:] = self.sung[:-1]
+        after = numpy.zeros(count, dtype=bool)
+        after[:-1] = self.sung[1:]
+        firsts = numpy.maximum.accumulate(
+            numpy.where(self.sung & ~before, indexes, 0)
+        )
+        lasts = numpy.minimum.accumulate(
+            numpy.where(self.sung & ~after, indexes, count - 1)[::-1]
+        )[::-1]
+        self.phrases = numpy.stack(
+            (self.times[firsts], self.ends[lasts]), axis=1
+        )
+        self.amplitudes = _amplitudes(self.pitches, self.vowels).T.copy()
+        self.phase = 0.0
+
+        self._jitter: Optional[Iterator[float]] = None
+        if jitter is not None and len(jitter.templates):
+            self._jitter = iter(Generator(jitter, seed=seed))
+        self._controls = numpy.zeros(0)
+        self._base = 0
+
+    def blocks(
+        self, length: int, size: int = BLOCK
+    ) -> Iterator[numpy.ndarray]:
+        """Synthesize the part, block by block.
+
+        Arguments:
+            length: The total number of samples to synthesize.
+            size: The number of samples of every block but the last one.
+
+        Yields:
+            The samples of every block, between -1 and 1.
+        """
+        for start in range(0, length, size):
+            yield self.block(start, min(size, length - start))
+
+    def block(self, start: int, count: int) -> numpy.ndarray:
+        """Synthesize a block of samples.
+
+        Blocks must be synthesized in order, because the oscillator phase
+        and the jitter values carry over from one block to the next one.
+
+        Arguments:
+            start: The position of the first sample of the block.
+            count: The number of samples of the block.
+
+        Returns:
+            The samples of the block, between -1 and 1.
+        """
+        times = (start + numpy.arange(count)) / RATE
+        result = numpy.zeros(count)
+        if not len(self.times):
+            return result
+
+        index = numpy.searchsorted(self.times, times, "right") - 1
+        valid = index >= 0
+        index = numpy.maximum(index, 0)
+        phrases = self.phrases[index]
+        envelope = numpy.clip(
+            numpy.minimum(times - phrases[:, 0], phrases[:, 1] - times) / FADE,
+            0.0,
+            1.0,
+        )
+        envelope *= valid & self.sung[index] & (times < self.ends[index])
+
+        pitches = self.pitches[index] + self._deviations(times)
+        frequencies = 440.0 * 2.0 ** ((pitches - 69.0) / 12.0)
+        phases = self.phase + numpy.cumsum(frequencies) * (2 * math.pi / RATE)
+        self.phase = float(phases[-1] % (2 * math.pi))
+
+        # Only synthesize the samples that aren't silent.
+        if not (active := numpy.flatnonzero(envelope)).size:
+            return result
+        notes, phases = index[active], phases[active]
+
+        # Build every harmonic from the previous two, with the Chebyshev
+        # recurrence, instead of calling sin for every one of them.
+        mix = numpy.zeros(len(active))
+        previous, current = numpy.zeros(len(active)), numpy.sin(phases)
+        factor = 2 * numpy.cos(phases)
+        for amplitudes in self.amplitudes:
+            mix += amplitudes[notes] * current
+            previous, current = current, factor * current - previous
+        result[active] = mix * envelope[active]
+        return result
+
+    def _deviations(self, times: numpy.ndarray) -> numpy.ndarray:
+        """Calculate the pitch jitter of some samples.
+
+        Jitter values get consumed from the generator as needed, and the ones
+        before the given samples are discarded.
+
+        Arguments:
+            times: The sorted times of the samples, in seconds.
+
+        Returns:
+            The pitch deviation of every sample, in semitones, interpolated
+            between jitter values.
+        """
+        if self._jitter is None:
+            return numpy.zeros(len(times))
+
+        positions = times * JITTER
+        first, last = int(positions[0]), int(positions[-1]) + 1
+        missing = last + 1 - self._base - len(self._controls)
+        if missing > 0:
+            values = numpy.fromiter(islice(self._jitter, missing), float)
+            self._controls = numpy.concatenate((self._controls, values))
+        self._controls = self._controls[first - self._base :]
+        self._base = first
+        return numpy.interp(
+            positions,
+            numpy.arange(first, last + 1),
+            self._controls[: last + 1 - first],
+        )
+
+
+def _amplitudes(pitches: numpy.ndarray, vowels: numpy.ndarray):
+    """Calculate the harmonic amplitudes of some notes.
+
+    Jitter barely changes the frequency of the harmonics, so amplitudes only
+    depend on the pitch and vowel of every note, not on every sample.
+
+    Arguments:
+        pitches: The MIDI pitch of every note.
+        vowels: The vowel code of every note.
+
+    Returns:
+        The amplitude of every harmonic of every note, shaped by the formants
+        of its vowel and adding up to one; harmonics above the Nyquist
+        frequency and notes without a vowel are silent.
+    """
+    table = numpy.zeros((len(Phoneme), len(GAINS)))
+    for vowel, frequencies in FORMANTS.items():
+        table[vowel.value] = frequencies
+    known = (vowels >= 0) & (vowels < len(Phoneme))
+    formants = table[numpy.where(known, vowels, Phoneme.SILENCE.value)]
+
+    frequencies = 440.0 * 2.0 ** ((pitches - 69.0) / 12.0)
+    partials = frequencies[:, None] * _HARMONICS
+    distances = (partials[:, :, None] - formants[:, None, :]) / WIDTH
+    result = (numpy.asarray(GAINS) / (1 + distances**2)).sum(axis=2)
+    result /= _HARMONICS
+    result[partials >= RATE / 2] = 0.0
+    result /= numpy.maximum(result.sum(axis=1, keepdims=True), 1e-9)
+    return result
+
+
+def length(recording: Recording) -> int:
+    """Calculate the number of samples of a recording preview.
+
+    Arguments:
+        recording: The recording.
+
+    Returns:
+        The number of samples until the last note of every part, plus a
+        short silence.
+    """
+    times = [
+        part.notes[-1].time
+        for part in Recording.pb(recording).parts
+        if part.notes
+    ]
+    return math.ceil((max(times, default=0.0) + TAIL) * RATE)
+
+
+def render(
+    recording: Recording,
+    file: BinaryIO,
+    jitter: Optional[Jitter] = None,
+    seed: Optional[int] = None,
+    jobs: int = 1,
+    size: int = BLOCK,
+):
+    """Render a preview of a recording to a WAV file.
+
+    Arguments:
+        recording: The recording to render.
+        file: A binary stream to write the 16-bit mono WAV file to; it
+            doesn't need to be seekable.
+        jitter: The jitter templates for the pitch deviations, if any.
+        seed: The seed of the jitter generators, if any; every part gets a
+            different one, derived from it.
+        jobs: The number of worker processes; with a single one, every part
+            gets rendered on the current process instead.
+        size: The number of samples rendered at once.
+
+    Raises:
+        ValueError: If the jitter templates could never yield any value; see
+            :py:func:`.jitter.check`.
+    """
+    # Check the templates before writing anything or starting any worker.
+    if jitter is not None and len(jitter.templates):
+        check(jitter)
+
+    parts = [
+        Part.serialize(Part.wrap(part))
+        for part in Recording.pb(recording).parts
+    ]
+    data = Jitter.serialize(jitter) if jitter is not None else None
+    seeds = [
+        None if seed is None else seed + index for index in range(len(parts))
+    ]
+    total = length(recording)
+
+    # Split the parts amongst the workers, which send their mix back.
+    groups = [
+        (parts[index::jobs], data, seeds[index::jobs], total, size)
+        for index in range(min(jobs, len(parts)))
+    ]
+    processes: List[multiprocessing.Process] = []
+    if len(groups) > 1:
+        processes, mixes = _workers(groups)
+    else:
+        mixes = [_mix(*group) for group in groups]
+
+    try:
+        with wave.open(file, "wb") as output:
+            output.setnchannels(1)
+            output.setsampwidth(2)
+            output.setframerate(RATE)
+            output.setnframes(total)
+            for start in range(0, total, size):
+                block = numpy.zeros(min(size, total - start))
+                for mix in mixes:
+                    block += next(mix)
+                block /= max(len(parts), 1)
+                samples = numpy.clip(block * 32767, -32768, 32767)
+                output.writeframes(samples.astype("<i2").tobytes())
+    finally:
+        # Closing generators that never started doesn't run their cleanup,
+        # so the workers get stopped explicitly.
+        for mix in mixes:
+            mix.close()
+        for process in processes:
+            process.terminate()
+            process.join()
+
+
+def _mix(
+    parts: Sequence[bytes],
+    jitter: Optional[bytes],
+    seeds: Sequence[Optional[int]],
+    length: int,
+    size: int,
+) -> Iterator[numpy.ndarray]:
+    """Synthesize and mix some parts, block by block.
+
+    Arguments:
+        parts: The serialized parts.
+        jitter: The serialized jitter templates, if any.
+        seeds: The seed of the jitter generator of every part.
+        length: The total number of samples to synthesize.
+        size: The number of samples of every block but the last one.
+
+    Yields:
+        The sum of the samples of every part, for every block.
+    """
+    templates = Jitter.deserialize(jitter) if jitter is not None else None
+    voices = [
+        Voice(Part.deserialize(part), templates, seed)
+        for part, seed in zip(parts, seeds)
+    ]
+    for blocks in zip(*(voice.blocks(length, size) for voice in voices)):
+        yield numpy.sum(blocks, axis=0)
+
+
+def _work(arguments: tuple, output: multiprocessing.Queue):
+    """Send the mix of some parts through a queue, block by block.
+
+    Arguments:
+        arguments: The arguments of :py:func:`_mix`.
+        output: The queue for the blocks, or for the exception raised while
+            synthesizing them.
+    """
+    try:
+        for block in _mix(*arguments):
+            output.put(block)
+    # Forward any error, so the parent raises it again instead of waiting
+    # for blocks that will never come.
+    except Exception as error:  # noqa: BLE001
+        output.put(error)
+
+
+def _workers(
+    groups: List[tuple],
+) -> Tuple[List[multiprocessing.Process], List[Iterator[numpy.ndarray]]]:
+    """Synthesize some groups of parts on worker processes.
+
+    Arguments:
+        groups: The arguments of :py:func:`_mix` for every worker.
+
+    Returns:
+        The worker processes, which must be terminated once done, and a
+        generator over the blocks of every worker.
+    """
+    queues = [multiprocessing.Queue(maxsize=QUEUE) for _ in groups]
+    processes = [
+        multiprocessing.Process(
+            target=_work, args=(group, output), daemon=True
+        )
+        for group, output in zip(groups, queues)
+    ]
+    for process in processes:
+        process.start()
+
+    def receive(
+        process: multiprocessing.Process, input: multiprocessing.Queue
+    ) -> Iterator[numpy.ndarray]:
+        """Receive the blocks of a worker, until there aren't any more."""
+        while True:
+            try:
+                block = input.get(timeout=1.0)
+            except queue.Empty:
+                if not process.is_alive() and input.empty():
+                    raise RuntimeError("synthesis worker stopped")
+                continue
+            if isinstance(block, Exception):
+                raise block
+            yield block
+
+    return processes, [
+        receive(process, input) for process, input in zip(processes, queues)
+    ]
@@ -0,0 +1,279 @@
+"""Synthetic scores and recordings.
+
+This module generates deterministic pseudorandom scores and recordings of any
+size, so benchmarks and load tests can exercise the conversion pipeline with
+inputs much larger than the ones available in the test fixtures, and without
+relying on copyrighted material.
+"""
+
+from random import Random
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import music21  # type: ignore
+from more_itertools import split_before
+
+from .location import Location
+from .phoneme import Phoneme
+from .recording import Note, Part, Recording, Syllable
+from .theme import Theme
+
+# Syllables used for building lyrics; each one of them has a single vowel so
+# the generic language parser reads them back without splitting any note.
+SYLLABLES: Tuple[Tuple[Phoneme, ...], ...] = (
+    (Phoneme.A,),
+    (Phoneme.M, Phoneme.O, Phoneme.R),
+    (Phoneme.D, Phoneme.I),
+    (Phoneme.L, Phoneme.U, Phoneme.N),
+    (Phoneme.S, Phoneme.E),
+    (Phoneme.T, Phoneme.A),
+    (Phoneme.V, Phoneme.E),
+    (Phoneme.CH, Phoneme.I),
+    (Phoneme.G, Phoneme.L, Phoneme.O),
+    (Phoneme.P, Phoneme.A, Phoneme.N),
+    (Phoneme.B, Phoneme.E, Phoneme.N),
+    (Phoneme.F, Phoneme.I),
+)
+
+# Pitch ranges, in MIDI numbers, for soprano, alto, tenor and bass parts.
+RANGES: Tuple[Tuple[int, int], ...] = ((60, 79), (55, 74), (48, 67), (40, 60))
+
+# Note durations, in quarter lengths.
+DURATIONS: Tuple[float, ...] = (0.5, 1.0, 1.0, 1.5, 2.0)
+
+
+class Event(NamedTuple):
+    """Synthetic musical event.
+
+    Attributes:
+        offset: The absolute start offset of the event, in quarter lengths.
+        duration: The duration of the event, in quarter lengths.
+        pitches: The MIDI pitches of the event, in ascending order; empty
+            for rests and with more than one element for chords.
+        lyrics: The syllables for each line of lyrics; empty for events
+            without lyrics.
+    """
+
+    offset: float
+    duration: float
+    pitches: Tuple[int, ...]
+    lyrics: Tuple[Tuple[Phoneme, ...], ...]
+
+
+def events(
+    notes: int,
+    part: int = 0,
+    *,
+    lyrics: float = 1.0,
+    rests: float = 0.1,
+    chords: float = 0.0,
+    lines: int = 1,
+    seed: int = 0,
+) -> Iterator[Event]:
+    """Generate the events for a single part of a synthetic score.
+
+    Arguments:
+        notes: The number of events (notes, chords and rests) to generate.
+        part: The index of the part; used for choosing the pitch range and
+            deriving an independent pseudorandom sequence for every part.
+        lyrics: The ratio of notes with lyrics, between 0 and 1.
+        rests: The ratio of rests, between 0 and 1.
+        chords: The ratio of chords amongst the non-rest events.
+        lines: The number of lines of lyrics for notes with lyrics.
+        seed: The seed for the pseudorandom number generator.
+
+    Yields:
+        Synthetic events, in chronological order.
+    """
+    random = Random(f"{seed}:{part}")
+    low, high = RANGES[part % len(RANGES)]
+    pitch, offset = (low + high) // 2, 0.0
+
+    for _ in range(notes):
+        duration = random.choice(DURATIONS)
+
+        if random.random() < rests:
+            yield Event(offset, duration, (), ())
+        else:
+            # Walk randomly through the pitch range of the part.
+            pitch = min(max(pitch + random.randint(-3, 3), low), high)
+            pitches: Tuple[int, ...] = (pitch,)
+            if random.random() < chords:
+                pitches = (pitch - 7, pitch - 3, pitch)[
+                    -random.randint(2, 3) :
+                ]
+
+            syllables: Tuple[Tuple[Phoneme, ...], ...] = ()
+            if random.random() < lyrics:
+                syllables = tuple(
+                    random.choice(SYLLABLES) for _ in range(lines)
+                )
+
+            yield Event(offset, duration, pitches, syllables)
+
+        offset += duration
+
+
+def score(
+    notes: int,
+    parts: int = 4,
+    *,
+    lyrics: float = 1.0,
+    rests: float = 0.1,
+    chords: float = 0.0,
+    lines: int = 1,
+    seed: int = 0,
+) -> music21.stream.Score:
+    """Generate a synthetic music21 score.
+
+    Arguments:
+        notes: The number of events per part.
+        parts: The number of parts.
+
+    See :py:func:`events` for the rest of the arguments.
+
+    Returns:
+        A music21 score with the requested number of parts.
+    """
+    result = music21.stream.Score()
+    result.insert(0, music21.metadata.Metadata(title="Synthetic"))
+
+    for index in range(parts):
+        part = music21.stream.Part()
+        part.partName = f"Part {index + 1}"
+
+        for event in events(
+            notes,
+            index,
+            lyrics=lyrics,
+            rests=rests,
+            chords=chords,
+            lines=lines,
+            seed=seed,
+        ):
+            if not event.pitches:
+                element = music21.note.Rest()
+            elif len(event.pitches) == 1:
+                element = music21.note.Note(event.pitches[0])
+            else:
+                element = music21.chord.Chord(event.pitches)
+
+            element.quarterLength = event.duration
+            for syllable in event.lyrics:
+                element.addLyric(text(syllable))
+
+            # Avoid the bookkeeping of ``Stream.insert`` for every element.
+            part.coreInsert(event.offset, element)
+
+        part.coreElementsChanged()
+        result.insert(0, part)
+
+    return result
+
+
+def recording(
+    notes: int,
+    parts: int = 4,
+    *,
+    lyrics: float = 1.0,
+    rests: float = 0.1,
+    chords: float = 0.0,
+    lines: int = 1,
+    seed: int = 0,
+    fill: Phoneme = Phoneme.SILENCE,
+    theme: Theme = Theme.NORMAL,
+    location: Location = Location.BLOBPERAHOUSE,
+) -> Recording:
+    """Generate a synthetic recording without building any music21 score.
+
+    The result is the same recording that :py:meth:`Recording.from_score`
+    would produce with the generic language for the score returned by
+    :py:func:`score` with the same arguments, mapping the parts to voices
+    like the ``recording import`` command does by default.
+
+    Arguments:
+        fill: The phoneme to use for notes without lyrics.
+        theme: The user interface theme for the Blob Opera experiment.
+        location: The location (background image) of the recording.
+
+    See :py:func:`score` for the rest of the arguments.
+
+    Returns:
+        A recording with the four selected parts.
+    """
+    indexes: Sequence[int] = (0, 1, -2, -1) if parts > 1 else (0, 0, 0, 0)
+    result = Recording(theme=theme, location=location)
+
+    for index in indexes:
+        generated = events(
+            notes,
+            range(parts)[index],
+            lyrics=lyrics,
+            rests=rests,
+            chords=chords,
+            lines=lines,
+            seed=seed,
+        )
+        result.parts.append(_part(generated, fill))
+
+    return result
+
+
+def text(syllable: Sequence[Phoneme]) -> str:
+    """Spell the given phonemes as a lyric syllable.
+
+    Arguments:
+        syllable: The phonemes of the syllable.
+
+    Returns:
+        The lowercase lyric text for the syllable.
+    """
+    return "".join(phoneme.name.lower() for phoneme in syllable)
+
+
+def _part(events: Iterator[Event], fill: Phoneme) -> Part:
+    """Build a recording part straight from synthetic events.
+
+    This function mirrors :py:meth:`Part.from_part` for synthetic events,
+    where the phonemes are already known and there isn't any need for a
+    language parser.
+    """
+    result = Part()
+    previous: Optional[Note] = None
+
+    for event in events:
+        phonemes = list(event.lyrics[0]) if event.lyrics else []
+
+        # Move the start consonants to the previous note.
+        start: List[Phoneme] = []
+        while phonemes and not phonemes[0].is_vowel():
+            start.append(phonemes.pop(0))
+        if start:
+            timed = Syllable.from_phonemes([Phoneme.SILENCE] + start).suffix
+            if previous is not None:
+                previous.syllable.suffix.extend(timed)
+            else:
+                result.start.extend(timed)
+
+        if not event.pitches:
+            syllables = [[Phoneme.SILENCE]]
+        elif phonemes:
+            syllables = list(split_before(phonemes, Phoneme.is_vowel))
+            fill = [p for p in phonemes if p.is_vowel()][-1]
+        else:
+            syllables = [[fill]]
+
+        for index, syllable in enumerate(syllables):
+            duration = event.duration / len(syllables)
+            if event.pitches:
+                pitch = event.pitches[-1]
+            else:
+                pitch = previous.pitch if previous is not None else 0
+            note = Note(
+                time=event.offset + index * duration,
+                pitch=pitch,
+                syllable=Syllable.from_phonemes(syllable),
+            )
+            result.notes.append(note)
+            previous = result.notes[-1]
+
+    return result
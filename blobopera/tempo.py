@@ -0,0 +1,144 @@
+"""Tempo maps.
+
+This module converts score offsets, in quarter lengths, to absolute times, in
+seconds, honouring every tempo change of a score. Maps keep the absolute time
+of every change, so converting an offset only takes a binary search instead
+of adding up the duration of every previous tempo section.
+
+Before the first tempo change, a quarter note lasts a second, like in the
+scores exported by :py:meth:`.recording.Recording.to_score`.
+
+Example:
+    >>> tempos = TempoMap.from_stream(score)
+    >>> tempos.seconds(16.0)
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+import music21  # type: ignore
+
+# Duration of a quarter note before the first tempo change, in seconds.
+DEFAULT: float = 1.0
+
+# Tempo change, as offset in quarter lengths and quarter note duration in
+# seconds.
+Change = Tuple[float, float]
+
+
+class TempoMap:
+    """Mapping from score offsets to absolute times.
+
+    Attributes:
+        offsets: The offset of every tempo change, sorted, in quarter lengths.
+        times: The absolute time of every tempo change, in seconds.
+        rates: The duration of a quarter note from every tempo change until
+            the next one, in seconds.
+    """
+
+    def __init__(self, changes: Iterable[Change] = ()):
+        """Initialize the map.
+
+        Arguments:
+            changes: The tempo changes, in any order; see :py:meth:`add`.
+        """
+        self.offsets: List[float] = []
+        self.times: List[float] = []
+        self.rates: List[float] = []
+        for offset, rate in changes:
+            self.add(offset, rate)
+
+    @classmethod
+    def from_stream(self, stream: music21.stream.Stream) -> "TempoMap":
+        """Build the tempo map of a music21 score or part.
+
+        Metronome marks without a number are ignored. When several parts
+        have a mark at the same offset, the topmost part takes precedence.
+
+        Arguments:
+            stream: The music21 score or part.
+
+        Returns:
+            An instance of this class with every metronome mark in the stream.
+        """
+        result = self()
+        for mark in stream.recurse().getElementsByClass(
+            music21.tempo.MetronomeMark
+        ):
+            if bpm := mark.getQuarterBPM():
+                offset = mark.getOffsetInHierarchy(stream)
+                result.add(float(offset), 60 / bpm)
+        return result
+
+    def add(self, offset: float, rate: float):
+        """Add a tempo change.
+
+        Changes are usually added in order, which is cheap; adding them out
+        of order needs updating the times of every later change.
+
+        Arguments:
+            offset: The offset of the change, in quarter lengths; changes at
+                the same offset as a previous one are ignored.
+            rate: The duration of a quarter note, in seconds.
+        """
+        index = bisect_left(self.offsets, offset)
+        if index < len(self.offsets) and self.offsets[index] == offset:
+            return
+
+        self.offsets.insert(index, offset)
+        self.rates.insert(index, rate)
+        self.times.insert(index, 0.0)
+        for position in range(index, len(self.offsets)):
+            if position == 0:
+                self.times[0] = self.offsets[0] * DEFAULT
+            else:
+                self.times[position] = (
+                    self.times[position - 1]
+                    + (self.offsets[position] - self.offsets[position - 1])
+                    * self.rates[position - 1]
+                )
+
+    def seconds(self, offset: float) -> float:
+        """Convert an offset to an absolute time.
+
+        Arguments:
+            offset: The offset, in quarter lengths.
+
+        Returns:
+            The absolute time, in seconds.
+        """
+        index = bisect_right(self.offsets, offset) - 1
+        if index < 0:
+            return offset * DEFAULT
+        return (
+            self.times[index]
+            + (offset - self.offsets[index]) * self.rates[index]
+        )
+
+    def rate(self, offset: float) -> float:
+        """Find the duration of a quarter note at an offset.
+
+        Arguments:
+            offset: The offset, in quarter lengths.
+
+        Returns:
+            The duration of a quarter note, in seconds.
+        """
+        index = bisect_right(self.offsets, offset) - 1
+        return DEFAULT if index < 0 else self.rates[index]
+
+    def changes(self, start: Optional[float] = None) -> List[Change]:
+        """List the tempo changes from an offset on.
+
+        Arguments:
+            start: The offset from which to list changes, in quarter lengths;
+                None lists all of them.
+
+        Returns:
+            The offset and quarter note duration of every change, in order.
+        """
+        index = 0 if start is None else bisect_left(self.offsets, start)
+        return list(zip(self.offsets[index:], self.rates[index:]))
+
+    def __len__(self) -> int:
+        return len(self.offsets)
@@ -0,0 +1,102 @@
+"""Pipeline instrumentation.
+
+This module provides a lightweight observer that collects the time spent on
+each stage of the conversion pipeline, along with some counters. Observers
+are bound to the current context with :py:func:`record`, and instrumented
+code only checks whether there is an observer at all when it's disabled.
+
+Example:
+    >>> with record() as timings:
+    >>>     Recording.from_score(score)
+    >>> timings.durations["language"]
+"""
+
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class Timings:
+    """Per-stage durations and counters of the conversion pipeline.
+
+    Attributes:
+        durations: The accumulated duration of each stage, in seconds.
+        counters: The accumulated value of each counter.
+    """
+
+    def __init__(self):
+        """Initialize the observer with empty durations and counters."""
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    def lap(self, stage: str, start: float) -> float:
+        """Account the time elapsed since the given instant to a stage.
+
+        Arguments:
+            stage: The name of the stage.
+            start: The start instant, as returned by this method or by
+                :py:func:`time.perf_counter`.
+
+        Returns:
+            The current instant, so consecutive stages can be chained.
+        """
+        now = time.perf_counter()
+        self.durations[stage] += now - start
+        return now
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Account the time spent on a block of code to a stage.
+
+        Arguments:
+            stage: The name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.lap(stage, start)
+
+    def count(self, counter: str, value: int = 1):
+        """Increment a counter.
+
+        Arguments:
+            counter: The name of the counter.
+            value: The amount to add to the counter.
+        """
+        self.counters[counter] += value
+
+    def to_dict(self) -> dict:
+        """Export the durations and counters.
+
+        Returns:
+            A dictionary with ``durations`` and ``counters`` keys, suitable
+            for serializing as JSON.
+        """
+        return {
+            "durations": dict(self.durations),
+            "counters": dict(self.counters),
+        }
+
+
+# Observer for the current context; None means that timing is disabled.
+observer: contextvars.ContextVar[Optional[Timings]] = contextvars.ContextVar(
+    "observer", default=None
+)
+
+
+@contextmanager
+def record() -> Iterator[Timings]:
+    """Enable timing for the current context.
+
+    Yields:
+        The observer that will collect the durations and counters.
+    """
+    timings = Timings()
+    token = observer.set(timings)
+    try:
+        yield timings
+    finally:
+        observer.reset(token)
@@ -0,0 +1,185 @@
+"""Recording validation.
+
+Broken recordings, like the ones with notes out of order or syllables that
+don't start with a vowel, only show up as glitches or crashes in the Blob
+Opera player. This module checks every note of a recording with a few
+vectorized passes over its note arrays, so whole batches of recordings can be
+validated before uploading them.
+
+Example:
+    >>> for problem in validate(recording):
+    >>>     print(problem)
+"""
+
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy  # type: ignore
+
+from .location import Location
+from .phoneme import Phoneme
+from .recording import Recording
+from .theme import Theme
+
+# Number of parts expected by the player, one for each blob singer.
+PARTS: int = 4
+
+# Range of valid MIDI pitches.
+PITCHES: Tuple[float, float] = (0.0, 127.0)
+
+# Range of sane phoneme durations, excluding the minimum, in seconds.
+DURATIONS: Tuple[float, float] = (0.0, 1.0)
+
+# Maximum number of note indexes kept for every problem.
+EXAMPLES: int = 5
+
+# Phoneme codes that can start a syllable.
+STARTS: Sequence[int] = [
+    phoneme.value
+    for phoneme in Phoneme
+    if phoneme.is_vowel() or phoneme.is_silence()
+]
+
+
+class Problem(NamedTuple):
+    """Validation problem.
+
+    Attributes:
+        message: A short description of the problem.
+        part: The index of the part with the problem, if any.
+        notes: The indexes of the first few notes with the problem, in the
+            part, if any.
+        count: The number of notes with the problem.
+    """
+
+    message: str
+    part: Optional[int] = None
+    notes: Tuple[int, ...] = ()
+    count: int = 0
+
+    def __str__(self) -> str:
+        """Describe the problem, e.g. "part 1, notes 3, 8 and 2 more: ..."."""
+        location = []
+        if self.part is not None:
+            location.append(f"part {self.part}")
+        if self.notes:
+            label = "note" if self.count == 1 else "notes"
+            indexes = ", ".join(map(str, self.notes))
+            if self.count > len(self.notes):
+                indexes += f" and {self.count - len(self.notes)} more"
+            location.append(f"{label} {indexes}")
+        return ": ".join(filter(None, (", ".join(location), self.message)))
+
+
+def validate(recording: Recording) -> List[Problem]:
+    """Check whether a recording can be played.
+
+    Arguments:
+        recording: The recording to check.
+
+    Returns:
+        The problems found, if any, recording-wide first and then part by
+        part.
+    """
+    # Protocol buffer wrappers are quite slow for per-note access, so read
+    # the underlying messages directly.
+    message = Recording.pb(recording)
+    problems = []
+
+    if len(message.parts) != PARTS:
+        problems.append(
+            Problem(f"expected {PARTS} parts, found {len(message.parts)}")
+        )
+    if message.theme not in {theme.value for theme in Theme}:
+        problems.append(Problem(f"invalid theme: {message.theme}"))
+    if message.location not in {location.value for location in Location}:
+        problems.append(Problem(f"invalid location: {message.location}"))
+
+    for index, part in enumerate(message.parts):
+        problems.extend(_part(part, index))
+    return problems
+
+
+def _part(part, index: int) -> List[Problem]:
+    """Check every note of a part.
+
+    Arguments:
+        part: The raw protocol buffer message of a :py:class:`.Part`.
+        index: The index of the part in the recording.
+
+    Returns:
+        The problems found in the part, if any.
+    """
+    notes = part.notes
+    count = len(notes)
+    times = numpy.fromiter((note.time for note in notes), float, count)
+    pitches = numpy.fromiter((note.pitch for note in notes), float, count)
+    vowels = numpy.fromiter(
+        (note.syllable.vowel.phoneme for note in notes), int, count
+    )
+
+    # Timed phonemes of the start and every syllable, with the note they
+    # belong to; start phonemes don't belong to any note.
+    timed = [(-1, item) for item in part.start]
+    timed += [
+        (position, item)
+        for position, note in enumerate(notes)
+        for item in (note.syllable.vowel, *note.syllable.suffix)
+    ]
+    owners = numpy.fromiter((owner for owner, _ in timed), int, len(timed))
+    phonemes = numpy.fromiter((item.phoneme for _, item in timed), int)
+    durations = numpy.fromiter((item.duration for _, item in timed), float)
+
+    with numpy.errstate(invalid="ignore"):
+        backwards = numpy.zeros(count, dtype=bool)
+        backwards[1:] = numpy.diff(times) < 0
+        checks = [
+            ("invalid time", ~numpy.isfinite(times) | (times < 0)),
+            ("time goes backwards", backwards),
+            (
+                "pitch out of range",
+                ~((pitches >= PITCHES[0]) & (pitches <= PITCHES[1])),
+            ),
+            (
+                "syllable doesn't start with a vowel or silence",
+                ~numpy.isin(vowels, STARTS),
+            ),
+        ]
+        unknown = ~numpy.isin(phonemes, [phoneme.value for phoneme in Phoneme])
+        insane = ~((durations > DURATIONS[0]) & (durations <= DURATIONS[1]))
+
+    problems = [
+        _problem(message, index, numpy.flatnonzero(mask))
+        for message, mask in checks
+        if mask.any()
+    ]
+    for message, mask in (
+        ("unknown phoneme", unknown),
+        ("phoneme duration out of range", insane),
+    ):
+        # Start phonemes don't belong to any note.
+        if mask[owners < 0].any():
+            problems.append(Problem(f"{message} in the part start", index))
+        if (mask := mask & (owners >= 0)).any():
+            problems.append(
+                _problem(message, index, numpy.unique(owners[mask]))
+            )
+    return problems
+
+
+def _problem(message: str, part: int, notes: numpy.ndarray) -> Problem:
+    """Build a problem from the indexes of the notes with it.
+
+    Arguments:
+        message: The description of the problem.
+        part: The index of the part.
+        notes: The sorted indexes of the notes.
+
+    Returns:
+        The problem, with the first few note indexes.
+    """
+    return Problem(
+        message,
+        part,
+        tuple(int(note) for note in notes[:EXAMPLES]),
+        len(notes),
+    )
@@ -0,0 +1,86 @@
+"""File watching.
+
+This module polls files for changes without any platform-specific
+dependency. Editors often save files in several steps, like truncating and
+writing them, or writing a temporary file and renaming it, so changes are
+debounced and reported in batches once the files stop changing.
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Interval between polls, in seconds.
+INTERVAL: float = 0.05
+
+# Time without changes before reporting a batch of changes, in seconds.
+DEBOUNCE: float = 0.2
+
+# File state used for detecting changes: modification time and size.
+State = Optional[Tuple[int, int]]
+
+
+def changes(
+    paths: Callable[[], Iterable[Path]],
+    *,
+    interval: float = INTERVAL,
+    debounce: float = DEBOUNCE,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[List[Path]]:
+    """Watch files for changes.
+
+    Arguments:
+        paths: A function returning the paths to watch; it gets called on
+            every poll, so it can list the contents of a directory.
+        interval: The interval between polls, in seconds.
+        debounce: The time without changes before reporting a batch of
+            changes, in seconds.
+        sleep: The function used for waiting between polls.
+
+    Yields:
+        Sorted lists of the files that were created, modified or deleted
+        since the previous batch.
+    """
+    previous = _snapshot(paths())
+    pending: set = set()
+    quiet = 0.0
+
+    while True:
+        sleep(interval)
+        current = _snapshot(paths())
+        changed = {
+            path
+            for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+        previous = current
+
+        if changed:
+            pending |= changed
+            quiet = 0.0
+        elif pending:
+            quiet += interval
+            if quiet >= debounce:
+                yield sorted(pending)
+                pending, quiet = set(), 0.0
+
+
+def _snapshot(paths: Iterable[Path]) -> Dict[Path, State]:
+    """Take the state of some files.
+
+    Arguments:
+        paths: The paths of the files.
+
+    Returns:
+        The modification time, in nanoseconds, and the size of every file, or
+        None for missing files.
+    """
+    result: Dict[Path, State] = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            result[path] = None
+        else:
+            result[path] = stat.st_mtime_ns, stat.st_size
+    return result
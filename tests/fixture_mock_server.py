@@ -0,0 +1,18 @@
+from threading import Thread
+
+import pytest  # type: ignore
+
+from blobopera.backend.mock import MockServer
+
+
+@pytest.fixture()
+def mock_server(tmp_path):
+    """Fixture that provides a local backend emulator running on a thread,
+    serving static assets from a temporary path.
+    """
+    with MockServer(static=tmp_path, seed=0) as server:
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        thread.join()
@@ -0,0 +1,79 @@
+import io
+
+import pytest  # type: ignore
+
+from blobopera.archive import HEADER, Archive, Compression, Writer
+
+
+@pytest.mark.parametrize("compression", list(Compression))
+def test_archive(tmp_path, compression):
+    """Test if archives return every entry, compressed or not."""
+    entries = {
+        "empty": b"",
+        "short": b"\x01",
+        "nested/long": bytes(range(256)) * 64,
+    }
+    path = tmp_path / "recordings.pack"
+    with open(path, "wb") as file, Writer(file, compression) as writer:
+        for name, data in entries.items():
+            writer.add(name, data)
+
+    with Archive(path) as archive:
+        assert len(archive) == len(entries)
+        assert archive.names() == list(entries)
+        assert "missing" not in archive
+        for name in reversed(entries):
+            assert archive.read(name) == entries[name]
+        stored = archive.index["nested/long"]
+        assert (stored.compression != Compression.NONE) == bool(compression)
+        with pytest.raises(KeyError):
+            archive.read("missing")
+
+
+def test_archive_invalid(tmp_path):
+    """Test if archives reject invalid files and duplicate entries."""
+    with pytest.raises(ValueError, match="duplicate"):
+        writer = Writer(io.BytesIO())
+        writer.add("entry", b"")
+        writer.add("entry", b"")
+
+    for data in b"", b"BLOBPACK", b"\x00" * 64:
+        path = tmp_path / "invalid.pack"
+        path.write_bytes(data)
+        with pytest.raises(ValueError, match="invalid pack file"):
+            Archive(path)
+
+    # Writers interrupted by an error don't write any index.
+    path = tmp_path / "failed.pack"
+    with pytest.raises(RuntimeError):
+        with open(path, "wb") as file, Writer(file) as writer:
+            writer.add("entry", b"\x01")
+            raise RuntimeError
+    with pytest.raises(ValueError, match="invalid pack file"):
+        Archive(path)
+
+
+def test_archive_corrupt(tmp_path):
+    """Test if corrupt entries and truncated archives get rejected."""
+    path = tmp_path / "recordings.pack"
+    for compression in Compression.ZLIB, Compression.LZMA:
+        with open(path, "wb") as file, Writer(file, compression) as writer:
+            writer.add("entry", bytes(1024))
+        data = bytearray(path.read_bytes())
+        data[HEADER.size : HEADER.size + 8] = b"\xff" * 8
+        path.write_bytes(data)
+        with Archive(path) as archive:
+            with pytest.raises(ValueError, match="invalid pack entry: entry"):
+                archive.read("entry")
+
+    with open(path, "wb") as file, Writer(file) as writer:
+        writer.add("entry", bytes(1024))
+    data = path.read_bytes()
+    header = bytearray(data[: HEADER.size])
+    # Point the index back at the middle of the entry data.
+    magic, version, count, offset, size = HEADER.unpack(header)
+    HEADER.pack_into(header, 0, magic, version, count, offset - 512, size)
+    index = data[offset:]
+    path.write_bytes(bytes(header) + data[HEADER.size : offset - 512] + index)
+    with pytest.raises(ValueError, match="invalid pack file"):
+        Archive(path)
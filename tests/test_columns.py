@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import numpy  # type: ignore
+import pytest  # type: ignore
+
+from blobopera.columns import Columns, summary
+from blobopera.libretto import Corpus
+from blobopera.phoneme import Phoneme
+
+# Directory with the sample corpus of libretto texts.
+DATA = Path(__file__).parent / "test_command_libretto.data"
+
+
+@pytest.fixture(scope="module")
+def corpus() -> Corpus:
+    """Fixture that provides the sample corpus of libretto texts."""
+    return Corpus.deserialize((DATA / "libretto.binary").read_bytes())
+
+
+def test_columns(tmp_path, corpus):
+    """Test if columns hold every phoneme and survive a round trip."""
+    columns = Columns.from_corpus(corpus)
+    for index, fragment in enumerate(corpus.fragments[:10]):
+        start, end = columns.offsets[index : index + 2]
+        assert [Phoneme(code) for code in columns.phonemes[start:end]] == [
+            Phoneme(timed.phoneme) for timed in fragment.phonemes
+        ]
+        assert columns.starts[start] == fragment.phonemes[0].start
+        assert columns.ends[end - 1] == fragment.phonemes[-1].end
+
+    path = tmp_path / "libretto.npz"
+    with open(path, "wb") as file:
+        columns.save(file)
+    for mmap in True, False:
+        loaded = Columns.load(path, mmap)
+        for name in Columns._fields:
+            assert numpy.array_equal(
+                getattr(loaded, name), getattr(columns, name)
+            )
+    assert isinstance(Columns.load(path).phonemes, numpy.memmap)
+
+    path.write_bytes(b"invalid")
+    with pytest.raises(ValueError, match="invalid columns file"):
+        Columns.load(path)
+
+
+def test_summary(corpus):
+    """Test if the vectorized summary matches per-phoneme calculations."""
+    columns = Columns.from_corpus(corpus)
+    result = summary(columns)
+    durations = columns.ends - columns.starts
+    for name, statistics in result["phonemes"].items():
+        values = durations[columns.phonemes == Phoneme[name]].astype(float)
+        assert statistics["count"] == len(values)
+        assert statistics["mean"] == pytest.approx(values.mean())
+        assert statistics["min"] == values.min()
+        assert statistics["max"] == values.max()
+        for percentile in 5, 50, 95:
+            assert statistics[f"p{percentile}"] == pytest.approx(
+                numpy.percentile(values, percentile)
+            )
+    assert sum(item["count"] for item in result["phonemes"].values()) == len(
+        columns.phonemes
+    )
+    assert result["fragments"]["count"] == len(corpus.fragments)
+
+    empty = summary(Columns.from_corpus(Corpus()))
+    assert empty == {
+        "phonemes": {},
+        "fragments": {"count": 0, "phonemes": {}, "duration": {}},
+    }
@@ -1,3 +1,5 @@
+import pstats
+
 from .fixture_invoke_command import invoke_command  # noqa: F401
 
 
@@ -13,3 +15,26 @@ def test_command_invalid(invoke_command):  # noqa: F811
     result = invoke_command("invalid")
     assert "No such command" in result.output
     assert result.exit_code == 2
+
+
+def test_command_profile(tmp_path, invoke_command):  # noqa: F811
+    """Test if the profiler saves its results in every format."""
+    for format in "pstats", "collapsed":
+        output = tmp_path / f"profile.{format}"
+        result = invoke_command(
+            "--profile",
+            f"--profile-output={output}",
+            f"--profile-format={format}",
+            "synthetic",
+            "recording",
+            "--notes=10",
+            tmp_path / "recording.binary",
+        )
+        assert result.exit_code == 0
+        assert not result.exception
+        assert output.exists()
+
+    pstats.Stats(str(tmp_path / "profile.pstats"))
+    for line in (tmp_path / "profile.collapsed").read_text().splitlines():
+        stack, microseconds = line.rsplit(" ", 1)
+        assert stack and int(microseconds) > 0
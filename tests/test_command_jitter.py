@@ -1,4 +1,10 @@
 import filecmp
+import json
+
+from blobopera import synthetic
+from blobopera.jitter import Jitter, Template
+from blobopera.recording import Recording
+from blobopera.validation import validate
 
 from .fixture_data_directory import data_directory  # noqa: F401
 from .fixture_invoke_command import invoke_command  # noqa: F401
@@ -63,3 +69,73 @@ def test_generate(data_directory, invoke_command):  # noqa: F811
         assert not result.output
         assert output.exists()
         assert filecmp.cmp(output, sample, shallow=False)
+
+
+def test_apply(data_directory, invoke_command):  # noqa: F811
+    """Test if recordings get humanized, along with their curves."""
+    input = data_directory / "recordings" / "synthetic.binary"
+    input.parent.mkdir()
+    input.write_bytes(Recording.serialize(synthetic.recording(20)))
+    output = data_directory / "humanized"
+
+    for _ in range(2):
+        result = invoke_command(
+            "jitter",
+            "apply",
+            "--seed=0",
+            "--pitch-depth=0.5",
+            "--curves",
+            data_directory / "jitter.binary",
+            output,
+            input.parent,
+        )
+        assert result.exit_code == 0
+        assert not result.exception
+        assert not result.output
+
+    original = Recording.deserialize(input.read_bytes())
+    humanized = Recording.deserialize(
+        (output / "synthetic.binary").read_bytes()
+    )
+    curves = json.loads((output / "synthetic.curves.json").read_text())
+    assert len(curves["parts"]) == 4
+    assert humanized.parts[0].notes[1].time != original.parts[0].notes[1].time
+    assert validate(humanized) == []
+
+    # Recordings named alike would overwrite each other.
+    duplicate = data_directory / "synthetic.json"
+    duplicate.write_bytes(input.read_bytes())
+    result = invoke_command(
+        "jitter",
+        "apply",
+        data_directory / "jitter.binary",
+        output,
+        input,
+        duplicate,
+    )
+    assert result.exit_code == 1
+    assert "Error: duplicate entry name: synthetic." in result.output
+
+    # Invalid recordings get skipped, but the rest get humanized.
+    broken = input.parent / "broken.binary"
+    broken.write_bytes(b"\xff")
+    (output / "synthetic.binary").unlink()
+    result = invoke_command(
+        "jitter",
+        "apply",
+        data_directory / "jitter.binary",
+        output,
+        input.parent,
+    )
+    assert result.exit_code == 1
+    assert f"Error: {broken}: invalid input file." in result.output
+    assert (output / "synthetic.binary").exists()
+
+    # Templates that can't yield any value get rejected up front.
+    short = data_directory / "short.binary"
+    short.write_bytes(
+        Jitter.serialize(Jitter(templates=[Template(values=[1])]))
+    )
+    result = invoke_command("jitter", "apply", short, output, input)
+    assert result.exit_code == 1
+    assert "Error: jitter templates need at least two values." in result.output
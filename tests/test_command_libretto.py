@@ -1,4 +1,5 @@
 import filecmp
+import json
 
 from .fixture_data_directory import data_directory  # noqa: F401
 from .fixture_invoke_command import invoke_command  # noqa: F401
@@ -61,3 +62,43 @@ def test_export(data_directory, invoke_command):  # noqa: F811
         assert not result.output
         assert output.exists()
         assert filecmp.cmp(output, sample, shallow=False)
+
+
+def test_search(data_directory, invoke_command):  # noqa: F811
+    """Test if the indexed searches find phoneme sequences."""
+    input = data_directory / "libretto.binary"
+    index = data_directory / "libretto.index"
+    result = invoke_command("libretto", "index", input, index)
+    assert result.exit_code == 0
+    assert not result.exception
+
+    result = invoke_command("libretto", "search", index, "a m o r e")
+    assert result.exit_code == 0
+    assert not result.exception
+    lines = result.output.splitlines()
+    assert len(lines) == 24
+    assert lines[0] == "4\t44\t14.340\t16.665"
+
+    result = invoke_command("libretto", "search", index, "A UNKNOWN")
+    assert result.exit_code == 1
+    assert "unknown phoneme: UNKNOWN" in result.output
+
+
+def test_export_npz(data_directory, invoke_command):  # noqa: F811
+    """Test if the columnar exports yield the same summary as the corpus."""
+    input = data_directory / "libretto.binary"
+    output = data_directory / "libretto.npz"
+    result = invoke_command(
+        "libretto", "export", "--format=npz", input, output
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    summaries = []
+    for file in input, output:
+        result = invoke_command("libretto", "stats", file)
+        assert result.exit_code == 0
+        assert not result.exception
+        summaries.append(json.loads(result.output))
+    assert summaries[0] == summaries[1]
+    assert summaries[0]["fragments"]["count"] == 1644
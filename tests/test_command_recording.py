@@ -1,4 +1,13 @@
 import filecmp
+import json
+
+import music21  # type: ignore
+
+from blobopera import watch
+from blobopera.archive import HEADER
+from blobopera.jitter import Jitter, Template
+from blobopera.phoneme import Phoneme
+from blobopera.recording import Recording
 
 from .fixture_data_directory import data_directory  # noqa: F401
 from .fixture_invoke_command import invoke_command  # noqa: F401
@@ -52,6 +61,283 @@ def test_export(data_directory, invoke_command):  # noqa: F811
         assert output.exists()
 
 
+def test_export_musicxml(data_directory, invoke_command):  # noqa: F811
+    """Test if the MusicXML export is equivalent to the music21 score."""
+    input = data_directory / "recording.binary"
+    output = data_directory / "recording.musicxml"
+    result = invoke_command("recording", "export", input, output)
+    assert result.exit_code == 0
+    assert not result.exception
+    assert not result.output
+
+    def events(score):
+        # Rests split at bar lines aren't tied, so merge consecutive rests.
+        result = []
+        for part in score.parts:
+            items = []
+            for element in part.stripTies().flat.notesAndRests:
+                pitch = None if element.isRest else element.pitch.midi
+                item = [element.offset, element.quarterLength, pitch]
+                item.append(element.lyric)
+                if items and pitch is None and items[-1][2] is None:
+                    if not element.lyric:
+                        items[-1][1] += element.quarterLength
+                        continue
+                items.append(item)
+            result.append(items)
+        return result
+
+    recording = Recording.deserialize(input.read_bytes())
+    expected = events(recording.to_score())
+    assert events(music21.converter.parse(output)) == expected
+
+
+def test_export_midi(data_directory, invoke_command):  # noqa: F811
+    """Test if the MIDI export keeps the pitches and timing of every note."""
+    input = data_directory / "recording.binary"
+    output = data_directory / "recording.mid"
+    result = invoke_command(
+        "recording", "export", "--format=midi", input, output
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+    assert not result.output
+
+    recording = Recording.deserialize(input.read_bytes())
+    score = music21.converter.parse(output)
+    assert len(score.parts) == 4
+    for part, expected in zip(score.parts, recording.parts):
+        notes = [
+            (round(note.time * 48) / 48, note.pitch)
+            for note in expected.notes
+            if note.syllable.vowel.phoneme != Phoneme.SILENCE.value
+        ]
+        assert notes == [
+            (float(note.offset), note.pitch.midi) for note in part.flat.notes
+        ]
+
+
+def test_import_native(data_directory, invoke_command):  # noqa: F811
+    """Test if the native MusicXML engine matches the music21 engine."""
+    input = data_directory / "recording.musicxml"
+    outputs = []
+    for engine in "music21", "native":
+        output = data_directory / f"{engine}.binary"
+        result = invoke_command(
+            "recording", "import", f"--engine={engine}", input, output
+        )
+        assert result.exit_code == 0
+        assert not result.exception
+        assert not result.output
+        outputs.append(output)
+
+    assert filecmp.cmp(*outputs, shallow=False)
+
+
+def test_import_incremental(data_directory, invoke_command):  # noqa: F811
+    """Test if incremental imports only convert the changed measures."""
+    input = data_directory / "recording.musicxml"
+    expected = data_directory / "expected.binary"
+    output = data_directory / "incremental.binary"
+    result = invoke_command("recording", "import", input, expected)
+    assert result.exit_code == 0
+
+    def run(*arguments):
+        result = invoke_command(
+            "recording",
+            "import",
+            "--incremental",
+            "--timings=json",
+            *arguments,
+            input,
+            output,
+        )
+        assert result.exit_code == 0
+        assert not result.exception
+        assert filecmp.cmp(expected, output, shallow=False)
+        return json.loads(result.output)["counters"]
+
+    assert run()["hits"] == 0
+    counters = run()
+    assert counters["misses"] == 0
+    assert counters["hits"] > 0
+
+    # Change the lyrics of a single note and import again.
+    text = input.read_text()
+    start = text.index("<text>", len(text) // 2) + len("<text>")
+    input.write_text(text[:start] + "strong" + text[text.index("<", start) :])
+    result = invoke_command("recording", "import", input, expected)
+    assert result.exit_code == 0
+    counters = run()
+    assert 0 < counters["misses"] <= 3
+
+    # Insert a measure, shifting every later one, and import again.
+    text = input.read_text()
+    start = text.index('<measure number="3">')
+    measure = (
+        '<measure number="3"><note><pitch><step>C</step><octave>5</octave>'
+        "</pitch><duration>40320</duration><type>whole</type>"
+        "<lyric><text>la</text></lyric></note></measure>"
+    )
+    input.write_text(text[:start] + measure + text[start:])
+    result = invoke_command("recording", "import", input, expected)
+    assert result.exit_code == 0
+    counters = run()
+    assert 0 < counters["misses"] <= 3
+
+
+def test_import_optimize(data_directory, invoke_command):  # noqa: F811
+    """Test if optimized imports are smaller and keep every onset."""
+    input = data_directory / "recording.musicxml"
+    recordings = []
+    for option in "--no-optimize", "--optimize":
+        output = data_directory / f"recording.output{option}.binary"
+        result = invoke_command("recording", "import", option, input, output)
+        assert result.exit_code == 0
+        assert not result.exception
+        recordings.append(output.read_bytes())
+
+    assert "Optimized:" in result.output
+    assert len(recordings[1]) < len(recordings[0])
+    original, optimized = map(Recording.deserialize, recordings)
+    for before, after in zip(original.parts, optimized.parts):
+        times = {note.time for note in before.notes}
+        assert {note.time for note in after.notes} <= times
+
+
+def test_import_watch(data_directory, invoke_command, monkeypatch):  # noqa: F811
+    """Test if watch mode imports the scores again when they change."""
+    input = data_directory / "recording.musicxml"
+    expected = data_directory / "expected.binary"
+    output = data_directory / "watch.binary"
+    directory = data_directory / "scores"
+    directory.mkdir()
+    score = directory / "score.musicxml"
+    score.write_bytes(input.read_bytes())
+    result = invoke_command("recording", "import", input, expected)
+    assert result.exit_code == 0
+
+    def changes(paths, **arguments):
+        assert paths() == [input, score]
+        output.unlink()
+        yield [input]
+        (directory / "score.binary").unlink()
+        score.write_text("invalid")
+        yield [score]
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(watch, "changes", changes)
+    result = invoke_command(
+        "recording",
+        "import",
+        "--watch",
+        f"--watch-directory={directory}",
+        input,
+        output,
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+    assert filecmp.cmp(expected, output, shallow=False)
+    assert not (directory / "score.binary").exists()
+    assert result.output.count("Imported") == 3
+    assert f"Error: {score}" in result.output
+
+
+def test_pack_unpack(data_directory, invoke_command):  # noqa: F811
+    """Test if recordings survive a round trip through an archive."""
+    directory = data_directory / "loose"
+    (directory / "nested").mkdir(parents=True)
+    for format in "binary", "json":
+        source = data_directory / f"recording.{format}"
+        (directory / "nested" / f"{format}.{format}").write_bytes(
+            source.read_bytes()
+        )
+
+    pack = data_directory / "recordings.pack"
+    single = data_directory / "recording.binary"
+    result = invoke_command(
+        "recording", "pack", "--compression=zlib", pack, directory, single
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    output = data_directory / "unpacked"
+    result = invoke_command("recording", "unpack", pack, output)
+    assert result.exit_code == 0
+    assert not result.exception
+    assert sorted(
+        path.relative_to(output).as_posix() for path in output.rglob("*.*")
+    ) == ["nested/binary.binary", "nested/json.binary", "recording.binary"]
+    assert filecmp.cmp(single, output / "recording.binary", shallow=False)
+
+    result = invoke_command("recording", "pack", pack, single, single)
+    assert result.exit_code == 1
+    assert "duplicate entry name" in result.output
+
+    # Failed packs leave the previous archive untouched.
+    previous = pack.read_bytes()
+    broken = directory / "broken.binary"
+    broken.write_bytes(b"\xff")
+    result = invoke_command("recording", "pack", pack, directory)
+    assert result.exit_code == 1
+    assert f"Error: {broken}: invalid input file." in result.output
+    assert pack.read_bytes() == previous
+    assert sorted(path.name for path in data_directory.glob("*.pack*")) == [
+        "recordings.pack"
+    ]
+
+    fresh = data_directory / "fresh.pack"
+    result = invoke_command("recording", "pack", fresh, directory)
+    assert result.exit_code == 1
+    assert not fresh.exists()
+
+    # Corrupt entries get reported by every command reading archives.
+    result = invoke_command(
+        "recording", "pack", "--compression=zlib", fresh, single
+    )
+    assert result.exit_code == 0
+    data = bytearray(fresh.read_bytes())
+    data[HEADER.size : HEADER.size + 8] = b"\xff" * 8
+    fresh.write_bytes(data)
+    for command in "validate", "stats":
+        result = invoke_command("recording", command, fresh)
+        assert result.exit_code == 1
+        assert "fresh.pack:recording: invalid pack entry" in result.output
+    result = invoke_command("recording", "unpack", fresh, output)
+    assert result.exit_code == 1
+    assert "Error: invalid pack entry: recording." in result.output
+    result = invoke_command("recording", "unpack", pack, output, "missing")
+    assert result.exit_code == 1
+
+
+def test_import_midi(data_directory, invoke_command):  # noqa: F811
+    """Test if both MIDI import engines produce the same recording."""
+    input = data_directory / "recording.binary"
+    midi = data_directory / "recording.mid"
+    result = invoke_command(
+        "recording", "export", "--format=midi", input, midi
+    )
+    assert result.exit_code == 0
+
+    recordings = []
+    for engine in "music21", "native":
+        output = data_directory / f"{engine}.binary"
+        result = invoke_command(
+            "recording", "import", f"--engine={engine}", midi, output
+        )
+        assert result.exit_code == 0
+        assert not result.exception
+        assert not result.output
+        recordings.append(Recording.deserialize(output.read_bytes()))
+
+    for (*parts,) in zip(*(recording.parts for recording in recordings)):
+        music21_part, native_part = (
+            [(round(note.time * 48) / 48, note.pitch) for note in part.notes]
+            for part in parts
+        )
+        assert native_part == music21_part
+
+
 def test_import(data_directory, invoke_command):  # noqa: F811
     """Test if the import mechanism works correctly."""
     for format in "raw", "binary", "json":
@@ -68,6 +354,22 @@ def test_import(data_directory, invoke_command):  # noqa: F811
         assert output.exists()
 
 
+def test_import_timings(data_directory, invoke_command):  # noqa: F811
+    """Test if the import timings are reported as JSON."""
+    result = invoke_command(
+        "recording",
+        "import",
+        "--timings=json",
+        data_directory / "recording.musicxml",
+        data_directory / "recording.output.binary",
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+    timings = json.loads(result.output)
+    assert {"parse", "language", "note", "append"} <= set(timings["durations"])
+    assert timings["counters"]["notes"] > 0
+
+
 def test_convert(data_directory, invoke_command):  # noqa: F811
     """Test if the converted files conform to the expected samples."""
     for target in "binary", "json":
@@ -87,3 +389,137 @@ def test_convert(data_directory, invoke_command):  # noqa: F811
             assert not result.output
             assert output.exists()
             assert filecmp.cmp(output, sample, shallow=False)
+
+
+def test_validate(data_directory, invoke_command):  # noqa: F811
+    """Test if broken recordings are reported, even inside archives."""
+    valid = data_directory / "recording.binary"
+    invalid = data_directory / "recording.invalid"
+    pack = data_directory / "recordings.pack"
+    result = invoke_command("recording", "pack", pack, valid)
+    assert result.exit_code == 0
+
+    result = invoke_command("recording", "validate", valid, pack)
+    assert result.exit_code == 0
+    assert not result.exception
+    assert "Invalid recordings: 0 of 2." in result.output
+
+    result = invoke_command("recording", "validate", valid, invalid)
+    assert result.exit_code == 1
+    assert f"{invalid}: expected 4 parts, found 0" in result.output
+
+
+def test_stats(data_directory, invoke_command):  # noqa: F811
+    """Test if statistics get aggregated over files and archives."""
+    valid = data_directory / "recording.binary"
+    broken = data_directory / "recording.broken"
+    broken.write_bytes(b"\xff")
+    pack = data_directory / "recordings.pack"
+    result = invoke_command("recording", "pack", pack, valid)
+    assert result.exit_code == 0
+
+    result = invoke_command("recording", "stats", valid)
+    assert result.exit_code == 0
+    single = json.loads(result.output)
+    assert single["recordings"] == 1
+    assert len(single["parts"]) == 4
+
+    result = invoke_command("recording", "stats", valid, pack)
+    assert result.exit_code == 0
+    double = json.loads(result.output)
+    assert double["recordings"] == 2
+    assert double["total"]["notes"] == 2 * single["total"]["notes"]
+    assert double["total"]["density"] == single["total"]["density"]
+
+    result = invoke_command("recording", "stats", "--format=csv", valid)
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0].startswith("part,parts,notes,rests,syllables,")
+    assert [line.split(",")[0] for line in lines[1:]] == [
+        "0",
+        "1",
+        "2",
+        "3",
+        "total",
+    ]
+
+    result = invoke_command("recording", "stats", valid, broken)
+    assert result.exit_code == 1
+    assert f"Error: {broken}: invalid input file." in result.output
+
+
+def test_plot(data_directory, invoke_command):  # noqa: F811
+    """Test if piano rolls get rendered, even on worker processes."""
+    valid = data_directory / "recording.binary"
+    broken = data_directory / "broken.binary"
+    broken.write_bytes(b"\xff")
+    pack = data_directory / "recordings.pack"
+    output = data_directory / "plots"
+    result = invoke_command("recording", "pack", pack, valid)
+    assert result.exit_code == 0
+
+    directory = data_directory / "directory"
+    directory.mkdir()
+    (directory / "other.binary").write_bytes(valid.read_bytes())
+    result = invoke_command("recording", "plot", output, valid, directory)
+    assert result.exit_code == 0
+    assert (output / "recording.png").read_bytes().startswith(b"\x89PNG")
+    assert (output / "other.png").read_bytes().startswith(b"\x89PNG")
+    assert "Rendered recordings: 2 of 2." in result.output
+
+    result = invoke_command(
+        "recording",
+        "plot",
+        "--format=svg",
+        "--no-labels",
+        "--jobs=2",
+        output,
+        valid,
+        broken,
+    )
+    assert result.exit_code == 1
+    assert b"<svg" in (output / "recording.svg").read_bytes()
+    assert f"Error: {broken}: invalid input file." in result.output
+
+    # The pack entry gets the same name as the file it was packed from.
+    result = invoke_command("recording", "plot", output, valid, pack)
+    assert result.exit_code == 1
+    assert "Error: duplicate entry name: recording." in result.output
+
+
+def test_render(data_directory, invoke_command):  # noqa: F811
+    """Test if audio previews get rendered, with and without jitter."""
+    input = data_directory / "recording.binary"
+    output = data_directory / "recording.wav"
+    jitter = data_directory / "jitter.binary"
+    templates = Jitter(templates=[Template(values=[0.0, 0.05] * 20)])
+    jitter.write_bytes(Jitter.serialize(templates))
+
+    result = invoke_command("recording", "render", input, output)
+    assert result.exit_code == 0
+    plain = output.read_bytes()
+    assert plain.startswith(b"RIFF") and plain[8:12] == b"WAVE"
+
+    result = invoke_command(
+        "recording",
+        "render",
+        "--jitter",
+        jitter,
+        "--seed=0",
+        "--jobs=2",
+        input,
+        output,
+    )
+    assert result.exit_code == 0
+    assert len(output.read_bytes()) == len(plain)
+    assert output.read_bytes() != plain
+
+    # Templates that can't yield any value get rejected instead of hanging.
+    jitter.write_bytes(
+        Jitter.serialize(Jitter(templates=[Template(values=[1])]))
+    )
+    result = invoke_command(
+        "recording", "render", "--jitter", jitter, input, output
+    )
+    assert result.exit_code == 1
+    assert "Error: jitter templates need at least two values." in result.output
@@ -0,0 +1,46 @@
+import json
+
+from blobopera.recording import Part, Recording
+
+from .fixture_invoke_command import invoke_command  # noqa: F401
+from .fixture_mock_server import mock_server  # noqa: F401
+
+
+def test_load(tmp_path, invoke_command, mock_server):  # noqa: F811
+    """Test if the load test reports every operation against the emulator."""
+    input = tmp_path / "recording.binary"
+    input.write_bytes(Recording.serialize(Recording(parts=[Part()])))
+    hosts = [
+        f"--{name}-host={mock_server.host}"
+        for name in ("public", "private", "static", "shortener")
+    ]
+    result = invoke_command(
+        *hosts,
+        "--scheme=http",
+        "load-test",
+        "--clients=2",
+        "--requests=5",
+        "--shorten",
+        input,
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+    report = json.loads(result.output)
+    for operation in "upload", "shorten", "download":
+        assert report["operations"][operation]["count"] == 5
+        assert report["operations"][operation]["errors"] == 0
+
+
+def test_jitter_download(tmp_path, invoke_command, mock_server):  # noqa: F811
+    """Test if static assets get downloaded from the emulator."""
+    (tmp_path / "jittertemplates.proto").write_bytes(b"jitter")
+    result = invoke_command(
+        f"--static-host={mock_server.host}",
+        "--scheme=http",
+        "jitter",
+        "download",
+        tmp_path / "jitter.raw",
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+    assert (tmp_path / "jitter.raw").read_bytes() == b"jitter"
@@ -0,0 +1,52 @@
+import filecmp
+
+import music21  # type: ignore
+import pytest  # type: ignore
+
+from blobopera import synthetic
+from blobopera.recording import Recording
+
+from .fixture_invoke_command import invoke_command  # noqa: F401
+
+
+def test_score(tmp_path, invoke_command):  # noqa: F811
+    """Test if the generated scores can be parsed back."""
+    output = tmp_path / "synthetic.musicxml"
+    result = invoke_command(
+        "synthetic", "score", "--notes=20", "--chords=0.5", output
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+    assert not result.output
+    assert len(music21.converter.parse(output).parts) == 4
+
+
+def test_recording(tmp_path, invoke_command):  # noqa: F811
+    """Test if the generated recordings are deterministic."""
+    outputs = tmp_path / "first.binary", tmp_path / "second.binary"
+    for output in outputs:
+        result = invoke_command(
+            "synthetic", "recording", "--notes=50", "--seed=1", output
+        )
+        assert result.exit_code == 0
+        assert not result.exception
+        assert not result.output
+    assert filecmp.cmp(*outputs, shallow=False)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"lyrics": 0.5, "rests": 0.3, "chords": 0.4, "lines": 2, "seed": 3},
+        {"parts": 1},
+        {"parts": 2, "lyrics": 0.2},
+    ],
+)
+def test_recording_from_score(options):
+    """Test if generated recordings match the imported generated scores."""
+    parts = options.get("parts", 4)
+    score = synthetic.score(100, **options)
+    indexes = (0, 1, -2, -1) if parts > 1 else (0, 0, 0, 0)
+    expected = Recording.from_score(score, parts=indexes)
+    assert synthetic.recording(100, **options) == expected
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from blobopera.index import Index
+from blobopera.libretto import Corpus
+from blobopera.phoneme import Phoneme
+
+# Directory with the sample corpus of libretto texts.
+DATA = Path(__file__).parent / "test_command_libretto.data"
+
+
+@pytest.fixture(scope="module")
+def corpus() -> Corpus:
+    """Fixture that provides the sample corpus of libretto texts."""
+    return Corpus.deserialize((DATA / "libretto.binary").read_bytes())
+
+
+@pytest.mark.parametrize("size", [1, 3, 8])
+@pytest.mark.parametrize(
+    "query", ["A M O R E", "A", "M O", "CH E I L", "- V I", "E -", "TZ"]
+)
+def test_index_search(tmp_path, corpus, size, query):
+    """Test if searches find the same matches as a full scan."""
+    path = tmp_path / "libretto.index"
+    Index.from_corpus(corpus, size).save(path)
+    index = Index.load(path)
+
+    # Exported librettos have a line of phoneme names for every fragment.
+    text = (DATA / "libretto.txt").read_text().replace("-", "SILENCE")
+    lines = [line.split() for line in text.splitlines()]
+    names = query.replace("-", "SILENCE").split()
+    expected = [
+        (fragment, offset)
+        for fragment, line in enumerate(lines)
+        for offset in range(len(line))
+        if line[offset : offset + len(names)] == names
+    ]
+    matches = index.search([Phoneme[name] for name in names])
+    assert [(match.fragment, match.offset) for match in matches] == expected
+    assert all(match.start < match.end for match in matches)
+    assert index.search([Phoneme[name] for name in names], 1) == matches[:1]
+
+
+def test_index_invalid(tmp_path):
+    """Test if invalid index files get rejected."""
+    path = tmp_path / "libretto.index"
+    path.write_bytes(b"invalid")
+    with pytest.raises(ValueError, match="invalid index file"):
+        Index.load(path)
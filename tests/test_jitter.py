@@ -0,0 +1,65 @@
+import numpy  # type: ignore
+import pytest  # type: ignore
+
+from blobopera import synthetic
+from blobopera.jitter import (
+    Curves,
+    Jitter,
+    Template,
+    apply,
+    check,
+    curves,
+)
+from blobopera.recording import Recording
+
+
+def test_curves():
+    """Test if deviations are scaled to the depth and reproducible."""
+    recording = synthetic.recording(20)
+    jitter = Jitter(templates=[Template(values=[-0.2, 0.4, 0.1] * 10)])
+
+    deviations = curves(recording, jitter, time=0.01, pitch=0.5, seed=0)
+    assert [len(times) for times in deviations.times] == [20] * 4
+    assert all(numpy.abs(times).max() <= 0.01 for times in deviations.times)
+    assert numpy.abs(numpy.concatenate(deviations.pitches)).max() == 0.5
+
+    again = curves(recording, jitter, time=0.01, pitch=0.5, seed=0)
+    assert numpy.array_equal(deviations.times[3], again.times[3])
+
+    empty = curves(recording, Jitter(), time=0.01, seed=0)
+    assert not numpy.concatenate(empty.times).any()
+
+
+def test_apply():
+    """Test if deviations get added without breaking the note order."""
+    recording = synthetic.recording(20)
+    times = [numpy.zeros(20) for _ in range(4)]
+    pitches = [numpy.zeros(20) for _ in range(4)]
+    times[0][:3] = -10.0, 0.5, -10.0
+    pitches[1][0] = 0.25
+    original = Recording.pb(recording).parts
+
+    result = Recording.pb(apply(recording, Curves(times, pitches)))
+    assert [note.time for note in result.parts[0].notes[:3]] == [
+        0.0,
+        original[0].notes[1].time + 0.5,
+        original[0].notes[1].time + 0.5,
+    ]
+    assert result.parts[1].notes[0].pitch == original[1].notes[0].pitch + 0.25
+    assert result.parts[2] == original[2]
+    assert Recording.pb(recording).parts[0].notes[1] == original[0].notes[1]
+
+
+def test_curves_short():
+    """Test if templates too short to yield any value get rejected."""
+    recording = synthetic.recording(5)
+    short = Jitter(templates=[Template(values=[0.3])])
+    with pytest.raises(ValueError):
+        curves(recording, short, time=0.01, seed=0)
+
+    pair = Jitter(templates=[Template(values=[0.3, 0.1])])
+    deviations = curves(recording, pair, time=0.01, seed=0)
+    assert [len(times) for times in deviations.times] == [5] * 4
+
+    with pytest.raises(ValueError):
+        check(Jitter(templates=[Template(values=[0.3] * 30)]), overlap=0)
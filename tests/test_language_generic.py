@@ -28,3 +28,27 @@ def test_generic_language_none(none_events):  # noqa: F811
         phonemes = language.parse(*event)
         assert isinstance(phonemes, list)
         assert not phonemes
+
+
+def test_generic_language_parse_all():
+    """Test if batched parsing matches parsing every note on its own."""
+    lyrics = ["Fö; o\n.", None, "", "amare", "chi\nqu", "ñ", "x"]
+    notes = [music21.note.Note() for _ in lyrics]
+    for note, lyric in zip(notes, lyrics):
+        if lyric is not None:
+            note.lyric = lyric
+    notes.append(music21.note.Rest())
+
+    language = GenericLanguage(music21.stream.Part(), strict=False)
+    assert language.parse_all(notes) == [
+        language.parse(notes[:index], note, notes[index + 1 :])
+        for index, note in enumerate(notes)
+    ]
+    assert language.parse_all(notes)[3] == [
+        Phoneme.A,
+        Phoneme.M,
+        Phoneme.A,
+        Phoneme.R,
+        Phoneme.E,
+    ]
+    assert language.parse_all([]) == []
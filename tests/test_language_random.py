@@ -1,3 +1,5 @@
+from fractions import Fraction
+
 import music21  # type: ignore
 import pytest  # type: ignore
 
@@ -23,3 +25,41 @@ def test_random_language_strict_fail(foo_events):  # noqa: F811
     for event in foo_events:
         with pytest.raises(ValueError, match=error):
             language.parse(*event)
+
+
+def test_random_language_consistency():
+    """Test if notes starting together get the same phonemes in any part."""
+    first = RandomLanguage(music21.stream.Part())
+    second = RandomLanguage(music21.stream.Part())
+    offsets = [0.0, 0.5, Fraction(1, 3), 1000.25]
+    for offset in offsets:
+        note, rest = music21.note.Note(), music21.note.Rest()
+        note.offset = rest.offset = offset
+        phonemes = first.parse([], note, [])
+        assert phonemes == second.parse([], rest, [])
+        phonemes.pop()  # Callers may alter the results.
+        assert len(first.parse([], note, [])) == 2
+
+    # Different offsets should get different phonemes, most of the time.
+    results = set()
+    for offset in range(100):
+        note = music21.note.Note()
+        note.offset = offset / 4
+        results.add(tuple(first.parse([], note, [])))
+    assert len(results) > 50
+
+
+def test_random_language_parse_all(foo_none_events):  # noqa: F811
+    """Test if batched parsing matches parsing every note on its own."""
+    notes = []
+    for offset in range(20):
+        notes.append(music21.note.Note())
+        notes[-1].offset = offset / 3
+    language = RandomLanguage(music21.stream.Part(), strict=True)
+    assert language.parse_all(notes) == [
+        language.parse([], note, []) for note in notes
+    ]
+
+    events = [current for _, current, _ in foo_none_events]
+    with pytest.raises(ValueError, match="doesn't accept lyrics"):
+        language.parse_all(events)
@@ -0,0 +1,29 @@
+import io
+import struct
+
+from blobopera import midi
+
+
+def track(*events: bytes) -> bytes:
+    """Build a track chunk from raw events with their delta times."""
+    data = b"".join(events) + b"\x00\xff\x2f\x00"
+    return b"MTrk" + struct.pack(">I", len(data)) + data
+
+
+def test_read():
+    """Test the tempo map, running status and the top voice reduction."""
+    header = b"MThd" + struct.pack(">IHHH", 6, 1, 2, 100)
+    conductor = track(
+        b"\x00\xff\x51\x03\x0f\x42\x40",  # 60 beats per minute.
+        b"\x81\x48\xff\x51\x03\x07\xa1\x20",  # 120 from tick 200 on.
+    )
+    notes = track(
+        b"\x00\x90\x3c\x40",  # Chord at tick 0, with running status.
+        b"\x00\x43\x40",
+        b"\x64\x80\x3c\x00",
+        b"\x00\x43\x00",
+        b"\x64\x90\x40\x40",  # Note at tick 200, ending with velocity 0.
+        b"\x64\x40\x00",
+    )
+    parts = midi.read(io.BytesIO(header + conductor + notes))
+    assert parts == [[midi.Event(0.0, 1.0, 0x43), midi.Event(2.0, 0.5, 0x40)]]
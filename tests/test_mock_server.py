@@ -0,0 +1,95 @@
+import time
+import urllib.parse
+
+import pytest  # type: ignore
+import requests
+
+from blobopera.backend import load
+
+from .fixture_mock_server import mock_server  # noqa: F401
+
+
+def test_upload_download(mock_server):  # noqa: F811
+    """Test if recordings get stored and retrieved by every handle."""
+    backend = mock_server.backend()
+    identifier = backend.upload(b"recording")
+    assert mock_server.objects[identifier] == b"recording"
+    assert backend.download(identifier) == b"recording"
+
+    link = backend.link(identifier)
+    assert backend.download(link) == b"recording"
+
+    short = backend.shorten(link)
+    assert short.startswith(f"http://{mock_server.host}/s/")
+    assert backend.download(short) == b"recording"
+
+    with pytest.raises(ValueError):
+        backend.upload(b"")
+    with pytest.raises(KeyError):
+        backend.download("missing")
+
+
+def test_signature(mock_server):  # noqa: F811
+    """Test if file links get rejected when tampered with or expired."""
+    backend = mock_server.backend()
+    identifier = backend.upload(b"recording")
+    address = f"http://{mock_server.host}/recording/{identifier}"
+    link = requests.get(address).json()["url"]
+    assert requests.get(link).content == b"recording"
+
+    base, query = link.split("?")
+    parameters = urllib.parse.parse_qs(query)
+    expires = int(parameters["expires"][0])
+    forged = f"{base}?expires={expires + 1}&signature={'0' * 64}"
+    assert requests.get(forged).status_code == 403
+    assert requests.get(base).status_code == 403
+
+    expired = int(time.time()) - 1
+    signature = mock_server.sign(identifier, expired)
+    stale = f"{base}?expires={expired}&signature={signature}"
+    assert requests.get(stale).status_code == 403
+
+
+def test_static(mock_server):  # noqa: F811
+    """Test if static assets get served without leaving their directory."""
+    (mock_server.static / "asset.proto").write_bytes(b"asset")
+    base = f"http://{mock_server.host}/blob-opera"
+    assert requests.get(f"{base}/asset.proto").content == b"asset"
+    assert requests.get(f"{base}/missing.proto").status_code == 404
+    assert requests.get(f"{base}/..%2Fasset.proto").status_code == 404
+
+
+def test_errors(mock_server):  # noqa: F811
+    """Test if every request fails when the error rate is one."""
+    mock_server.errors = 1.0
+    backend = mock_server.backend()
+    with pytest.raises(ValueError):
+        backend.upload(b"recording")
+    assert not mock_server.objects
+
+
+def test_latency(mock_server):  # noqa: F811
+    """Test if every request gets delayed."""
+    mock_server.latency = 0.1
+    start = time.perf_counter()
+    mock_server.backend().upload(b"recording")
+    assert time.perf_counter() - start >= 0.1
+
+
+def test_load(mock_server):  # noqa: F811
+    """Test if the load generator measures every operation."""
+    backend = mock_server.backend()
+    report = load.run(backend, b"recording", clients=4, count=20).to_dict()
+    assert set(report["operations"]) == {"upload", "download"}
+    for operation in report["operations"].values():
+        assert operation["count"] == 20
+        assert operation["errors"] == 0
+        assert 0 < operation["p50"] <= operation["p99"]
+    assert report["throughput"] > 0
+
+    mock_server.errors = 0.5
+    report = load.run(backend, b"recording", 4, 20, shorten=True).to_dict()
+    operations = report["operations"]
+    assert set(operations) == {"upload", "shorten", "download"}
+    assert operations["upload"]["count"] + operations["upload"]["errors"] == 20
+    assert sum(operation["errors"] for operation in operations.values())
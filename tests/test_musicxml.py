@@ -0,0 +1,191 @@
+import io
+
+import music21  # type: ignore
+
+from blobopera import musicxml
+from blobopera.recording import Recording
+
+# Score with voices, grace notes, chords, tuplets, an empty measure and a
+# composite lyric, which are the trickiest parts to read like music21 does.
+SCORE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<score-partwise version="3.1">
+  <part-list>
+    <score-part id="P1"><part-name>A</part-name></score-part>
+    <score-part id="P2"><part-name>B</part-name></score-part>
+  </part-list>
+  <part id="P1">
+    <measure number="1">
+      <attributes>
+        <divisions>2</divisions>
+        <time><beats>3</beats><beat-type>4</beat-type></time>
+      </attributes>
+      <note>
+        <pitch><step>C</step><octave>5</octave></pitch>
+        <duration>2</duration><voice>1</voice><type>quarter</type>
+        <lyric><text>la</text></lyric>
+      </note>
+      <note>
+        <grace/>
+        <pitch><step>D</step><alter>1</alter><octave>5</octave></pitch>
+        <voice>1</voice><type>eighth</type>
+      </note>
+      <note>
+        <pitch><step>E</step><octave>5</octave></pitch>
+        <duration>4</duration><voice>1</voice><type>half</type>
+        <lyric><text>mor</text><elision>_</elision><text>e</text></lyric>
+      </note>
+      <backup><duration>6</duration></backup>
+      <forward><duration>2</duration></forward>
+      <note>
+        <pitch><step>A</step><octave>3</octave></pitch>
+        <duration>2</duration><voice>2</voice><type>quarter</type>
+        <lyric><text>tu</text></lyric>
+      </note>
+    </measure>
+    <measure number="2"/>
+    <measure number="3">
+      <note>
+        <pitch><step>C</step><octave>5</octave></pitch>
+        <duration>1</duration><type>quarter</type>
+        <time-modification>
+          <actual-notes>3</actual-notes><normal-notes>2</normal-notes>
+        </time-modification>
+        <lyric><text>di</text></lyric>
+      </note>
+      <note>
+        <pitch><step>C</step><octave>4</octave></pitch>
+        <duration>1</duration><type>quarter</type>
+        <time-modification>
+          <actual-notes>3</actual-notes><normal-notes>2</normal-notes>
+        </time-modification>
+      </note>
+      <note>
+        <chord/>
+        <pitch><step>G</step><octave>4</octave></pitch>
+        <duration>1</duration><type>quarter</type>
+        <lyric><text>da</text></lyric>
+      </note>
+      <note><rest/><duration>1</duration></note>
+      <note>
+        <pitch><step>B</step><alter>-1</alter><octave>4</octave></pitch>
+        <duration>3</duration><type>quarter</type><dot/>
+      </note>
+    </measure>
+  </part>
+  <part id="P2">
+    <measure number="1">
+      <attributes><divisions>1</divisions></attributes>
+      <note><rest measure="yes"/><duration>4</duration></note>
+    </measure>
+  </part>
+</score-partwise>
+"""
+
+# Score whose tempo changes, with a dotted beat unit and a direction offset,
+# are only in the first part.
+TEMPO = b"""<?xml version="1.0" encoding="UTF-8"?>
+<score-partwise version="3.1">
+  <part-list>
+    <score-part id="P1"><part-name>A</part-name></score-part>
+    <score-part id="P2"><part-name>B</part-name></score-part>
+  </part-list>
+  <part id="P1">
+    <measure number="1">
+      <attributes><divisions>2</divisions></attributes>
+      <direction>
+        <direction-type>
+          <metronome>
+            <beat-unit>quarter</beat-unit><beat-unit-dot/>
+            <per-minute>40</per-minute>
+          </metronome>
+        </direction-type>
+      </direction>
+      <note>
+        <pitch><step>C</step><octave>5</octave></pitch>
+        <duration>4</duration><type>half</type>
+        <lyric><text>la</text></lyric>
+      </note>
+      <direction>
+        <direction-type>
+          <metronome>
+            <beat-unit>half</beat-unit><per-minute>60</per-minute>
+          </metronome>
+        </direction-type>
+        <sound tempo="120"/>
+      </direction>
+      <note>
+        <pitch><step>D</step><octave>5</octave></pitch>
+        <duration>4</duration><type>half</type>
+        <lyric><text>mo</text></lyric>
+      </note>
+    </measure>
+    <measure number="2">
+      <note>
+        <pitch><step>C</step><octave>5</octave></pitch>
+        <duration>2</duration><type>quarter</type>
+        <lyric><text>re</text></lyric>
+      </note>
+      <direction>
+        <direction-type>
+          <metronome>
+            <beat-unit>quarter</beat-unit><per-minute>30</per-minute>
+          </metronome>
+        </direction-type>
+        <offset>1</offset>
+      </direction>
+      <note>
+        <pitch><step>E</step><octave>5</octave></pitch>
+        <duration>6</duration><type>half</type><dot/>
+        <lyric><text>mi</text></lyric>
+      </note>
+    </measure>
+  </part>
+  <part id="P2">
+    <measure number="1">
+      <attributes><divisions>1</divisions></attributes>
+      <note>
+        <pitch><step>A</step><octave>3</octave></pitch>
+        <duration>3</duration><type>half</type><dot/>
+        <lyric><text>tu</text></lyric>
+      </note>
+      <note>
+        <pitch><step>B</step><octave>3</octave></pitch>
+        <duration>1</duration><type>quarter</type>
+      </note>
+    </measure>
+    <measure number="2">
+      <note>
+        <pitch><step>A</step><octave>3</octave></pitch>
+        <duration>1</duration><type>quarter</type>
+      </note>
+      <note>
+        <chord/>
+        <pitch><step>C</step><octave>4</octave></pitch>
+        <duration>1</duration><type>quarter</type>
+      </note>
+      <note>
+        <pitch><step>G</step><octave>3</octave></pitch>
+        <duration>3</duration><type>half</type><dot/>
+      </note>
+    </measure>
+  </part>
+</score-partwise>
+"""
+
+
+def test_read():
+    """Test if reading a score produces the same recording as music21."""
+    parts = 0, 0, 1, -1
+    score = music21.converter.parseData(SCORE.decode(), format="musicxml")
+    expected = Recording.from_score(score, parts=parts)
+    recording = musicxml.read(io.BytesIO(SCORE), parts=parts, context=1)
+    assert Recording.serialize(recording) == Recording.serialize(expected)
+
+
+def test_read_tempo():
+    """Test if metronome marks change the timing like in music21."""
+    score = music21.converter.parseData(TEMPO.decode(), format="musicxml")
+    for parts in (0, 0, 1, 1), (1, 1, 1, 1):
+        expected = Recording.from_score(score, parts=parts)
+        recording = musicxml.read(io.BytesIO(TEMPO), parts=parts, context=1)
+        assert Recording.serialize(recording) == Recording.serialize(expected)
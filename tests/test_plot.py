@@ -0,0 +1,28 @@
+import io
+
+from blobopera import synthetic
+from blobopera.plot import figure, render
+
+
+def test_figure():
+    """Test if every part gets a single collection and labels."""
+    recording = synthetic.recording(20)
+    axes = figure(recording).axes[0]
+    assert len(axes.collections) == 4
+    assert [collection.get_label() for collection in axes.collections] == [
+        "Soprano",
+        "Alto",
+        "Tenor",
+        "Bass",
+    ]
+    assert axes.texts
+    assert not figure(recording, labels=False).axes[0].texts
+
+
+def test_render():
+    """Test if piano rolls get rendered in every format."""
+    recording = synthetic.recording(20)
+    for format, magic in ("png", b"\x89PNG"), ("svg", b"<?xml"):
+        file = io.BytesIO()
+        render(recording, file, format)
+        assert file.getvalue().startswith(magic)
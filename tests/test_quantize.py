@@ -0,0 +1,38 @@
+from fractions import Fraction
+
+import numpy  # type: ignore
+import pytest  # type: ignore
+
+from blobopera.quantize import quantize
+
+
+def test_quantize():
+    """Test if times get the same fractions as limit_denominator."""
+    generator = numpy.random.default_rng(0)
+    times = numpy.concatenate(
+        (
+            generator.uniform(-10, 500, 5000),
+            generator.integers(0, 2000, 5000)
+            / generator.integers(1, 101, 5000),
+            [0.5, 1.5, 0.005, 1 / 201],  # Ties between fractions.
+        )
+    ).astype(numpy.float32)
+
+    quantized = quantize(times)
+    assert quantized.fractions() == [
+        Fraction(float(time)).limit_denominator(100) for time in times
+    ]
+    assert quantized.error == pytest.approx(0.005)
+
+
+def test_quantize_grid():
+    """Test if times can be snapped to a regular grid."""
+    quantized = quantize([0.0, 0.3, 0.5, 1.125], (4,))
+    assert quantized.fractions() == [0, Fraction(1, 4), Fraction(1, 2), 1]
+    assert quantized.error == pytest.approx(0.125)
+    assert quantized.ticks(12).tolist() == [0, 3, 6, 12]
+    assert quantized.ticks(2, Fraction(1, 4)).tolist() == [0, 0, 0, 2]
+
+    assert quantize([]).fractions() == []
+    with pytest.raises(ValueError):
+        quantize([1.0], (0, 2))
@@ -0,0 +1,80 @@
+import music21  # type: ignore
+
+from blobopera.phoneme import Phoneme
+from blobopera.recording import Note, Part, Recording, Syllable, TimedPhoneme
+
+
+def test_compact():
+    """Test if compaction merges redundant notes without altering timing."""
+    part = music21.converter.parse("tinyNotation: 4/4 c4~ c4 r4 r4 d4 d4 e4")
+    for note, lyric in zip(part.flat.notes, ("la", None, "na", "a", "do")):
+        note.lyric = lyric
+    recording = Recording.from_score(music21.stream.Score([part]))
+    compacted = recording.compact()
+
+    notes = [
+        (note.time, note.pitch, Syllable.to_phonemes(note.syllable))
+        for note in compacted.parts[0].notes
+    ]
+    silence, a, o = Phoneme.SILENCE, Phoneme.A, Phoneme.O
+    assert notes == [
+        (0.0, 60.0, [a, a]),  # Tied notes.
+        (2.0, 60.0, [silence, silence, Phoneme.N]),  # Consecutive rests.
+        (4.0, 62.0, [a, a, Phoneme.D]),  # Vowel continuation.
+        (6.0, 64.0, [o, o]),
+    ]
+    assert list(compacted.parts[0].lyrics()) == ["LAA", None, "NAAD", "OO"]
+    assert len(Recording.serialize(compacted)) < len(
+        Recording.serialize(recording)
+    )
+    assert len(recording.parts[0].notes) == 7  # The original is untouched.
+
+
+def test_from_part_languages():
+    """Test if languages without batched parsing still get every note."""
+
+    class Vowels:
+        def __init__(self, part, *, strict=False):
+            pass
+
+        def parse(self, before, current, after):
+            return [Phoneme.U] if len(before) % 2 else [Phoneme.E]
+
+    part = music21.converter.parse("tinyNotation: 4/4 c4 d4 e4 f4")
+    notes = Part.from_part(part, Vowels).notes
+    assert [Syllable.to_phonemes(note.syllable)[0] for note in notes] == [
+        Phoneme.E,
+        Phoneme.U,
+        Phoneme.E,
+        Phoneme.U,
+    ]
+
+
+def test_to_part():
+    """Test if consonants of consecutive rests move to the next note."""
+    silence, a = Phoneme.SILENCE, Phoneme.A
+    phonemes = [
+        [a, Phoneme.N],
+        [silence, Phoneme.D],
+        [silence, Phoneme.R, Phoneme.S],
+        [silence, silence],
+        [a, a],
+    ]
+    part = Part(
+        notes=[
+            Note(time=time, pitch=60, syllable=Syllable.from_phonemes(item))
+            for time, item in enumerate(phonemes)
+        ],
+        start=[TimedPhoneme(phoneme=Phoneme.M)],
+    )
+
+    result = part.to_part("Soprano")
+    assert result.partName == "Soprano"
+    assert [(note.offset, note.lyric) for note in result.notesAndRests] == [
+        (0.0, "MAN"),
+        (1.0, None),
+        (2.0, None),
+        (3.0, None),
+        (4.0, "RSDAA"),
+    ]
+    assert result.highestTime == 5.0
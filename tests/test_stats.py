@@ -0,0 +1,50 @@
+from blobopera.phoneme import Phoneme
+from blobopera.recording import Note, Part, Recording, Syllable
+from blobopera.stats import Summary, merge, summarize
+
+
+def test_summarize():
+    """Test if notes, rests, syllables and phonemes get counted."""
+    phonemes = [
+        [Phoneme.SILENCE, Phoneme.M],
+        [Phoneme.A],
+        [Phoneme.A, Phoneme.R],
+        [Phoneme.O],
+        [Phoneme.SILENCE],
+    ]
+    notes = [
+        Note(time=time, pitch=pitch, syllable=Syllable.from_phonemes(syllable))
+        for time, pitch, syllable in zip(
+            [0.0, 1.0, 1.5, 2.0, 4.0], [0, 60, 62, 64, 64], phonemes
+        )
+    ]
+    recording = Recording(parts=[Part(notes=notes), Part()])
+
+    first, second = summarize(recording)
+    assert first.to_dict() == {
+        "parts": 1,
+        "notes": 3,
+        "rests": 2,
+        # The second A just holds the vowel of the first one.
+        "syllables": 2,
+        "duration": 4.0,
+        "density": 0.75,
+        "rest_ratio": 0.25,
+        "syllables_per_note": 2 / 3,
+        "lowest": 60,
+        "highest": 64,
+        "pitches": {"60": 1, "62": 1, "64": 1},
+        "phonemes": {"A": 3, "O": 2, "SILENCE": 3, "R": 1, "M": 1},
+    }
+    assert second.to_dict()["density"] is None
+    assert second.to_dict()["lowest"] is None
+
+    totals = merge(merge([], [first]), [first, second])
+    assert [total.parts for total in totals] == [2, 1]
+    assert totals[0].to_dict()["notes"] == 6
+    assert totals[0].to_dict()["rest_ratio"] == 0.25
+
+    row = Summary.empty().merge(first).to_row()
+    assert row["notes"] == 3
+    assert row["pitch_60"] == 1 and row["pitch_61"] == 0
+    assert row["phoneme_M"] == 1 and row["phoneme_U"] == 0
@@ -0,0 +1,72 @@
+import io
+import multiprocessing
+import wave
+
+import numpy  # type: ignore
+import pytest  # type: ignore
+
+from blobopera import synthetic
+from blobopera.jitter import Jitter, Template
+from blobopera.synthesis import RATE, Voice, length, render
+
+
+def test_voice():
+    """Test if voices are silent on rests and don't depend on block sizes."""
+    recording = synthetic.recording(20)
+    jitter = Jitter(templates=[Template(values=[0.0, 0.05, -0.05] * 10)])
+    total = length(recording)
+
+    samples = [
+        numpy.concatenate(
+            list(Voice(recording.parts[0], jitter, 0).blocks(total, size))
+        )
+        for size in (1000, 4096)
+    ]
+    assert len(samples[0]) == total
+    assert numpy.allclose(samples[0], samples[1])
+    assert 0 < numpy.abs(samples[0]).max() <= 1
+
+    voice = Voice(recording.parts[0])
+    rests = numpy.flatnonzero(~voice.sung[:-1])
+    start, end = voice.times[rests[0]], voice.ends[rests[0]]
+    silence = samples[0][int(start * RATE) + 1 : int(end * RATE)]
+    assert not silence.any()
+
+
+def test_render():
+    """Test if renders on worker processes are the same as sequential ones."""
+    recording = synthetic.recording(20)
+    results = []
+    for jobs in 1, 3:
+        file = io.BytesIO()
+        render(recording, file, seed=0, jobs=jobs)
+        results.append(file.getvalue())
+    assert results[0] == results[1]
+
+    with wave.open(io.BytesIO(results[0])) as file:
+        assert file.getframerate() == RATE
+        assert file.getnframes() == length(recording)
+
+
+def test_render_short():
+    """Test if jitter templates too short to yield any value get rejected."""
+    recording = synthetic.recording(5)
+    jitter = Jitter(templates=[Template(values=[0.3])])
+    file = io.BytesIO()
+    with pytest.raises(ValueError):
+        render(recording, file, jitter=jitter, jobs=2)
+    assert not file.getvalue()
+    with pytest.raises(ValueError):
+        Voice(recording.parts[0], jitter)
+
+
+def test_render_failure(monkeypatch):
+    """Test if workers get stopped when the output can't even be opened."""
+
+    def open(*arguments):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(wave, "open", open)
+    with pytest.raises(OSError):
+        render(synthetic.recording(5), io.BytesIO(), jobs=2)
+    assert not multiprocessing.active_children()
@@ -0,0 +1,31 @@
+import music21  # type: ignore
+
+from blobopera.recording import Recording
+from blobopera.tempo import TempoMap
+
+
+def test_seconds():
+    """Test if offsets are converted to times across tempo changes."""
+    tempos = TempoMap([(4.0, 0.5), (0.0, 2.0), (4.0, 1.0)])
+    assert tempos.changes() == [(0.0, 2.0), (4.0, 0.5)]
+    assert tempos.seconds(3.0) == 6.0
+    assert tempos.seconds(6.0) == 9.0
+    assert tempos.rate(6.0) == 0.5
+
+    # Changes added out of order update the times of the later ones.
+    tempos.add(2.0, 1.0)
+    assert tempos.seconds(6.0) == 7.0
+    assert TempoMap().seconds(3.0) == 3.0
+
+
+def test_from_score():
+    """Test if every metronome mark of a score applies to all the parts."""
+    score = music21.stream.Score()
+    for notation in ("4/4 c2 d2 e1", "4/4 C1 D1"):
+        score.append(music21.converter.parse(f"tinyNotation: {notation}"))
+    score.parts[0].measure(1).insert(0, music21.tempo.MetronomeMark(60))
+    score.parts[0].measure(2).insert(2, music21.tempo.MetronomeMark(120))
+
+    recording = Recording.from_score(score, tempo=2.0, parts=(0, 1, 1, 1))
+    assert [note.time for note in recording.parts[0].notes] == [0, 1, 2]
+    assert [note.time for note in recording.parts[1].notes] == [0, 2]
@@ -0,0 +1,37 @@
+from blobopera import synthetic
+from blobopera.phoneme import Phoneme
+from blobopera.recording import Recording
+from blobopera.validation import Problem, validate
+
+
+def test_validate():
+    """Test if every kind of problem is found in a broken recording."""
+    recording = synthetic.recording(20)
+    assert validate(recording) == []
+
+    message = Recording.pb(recording)
+    message.theme = 7
+    message.parts[0].notes[2].time = -1.0
+    message.parts[0].notes[5].time = 0.0
+    message.parts[1].notes[0].pitch = 128
+    message.parts[1].notes[1].syllable.vowel.phoneme = Phoneme.R.value
+    message.parts[2].start.add(phoneme=Phoneme.S.value, duration=0.0)
+    for note in message.parts[3].notes[:8]:
+        note.syllable.suffix.add(phoneme=99, duration=0.05)
+    del message.parts[3].notes[-1]
+    message.parts.add()
+
+    problems = validate(Recording.wrap(message))
+    assert problems == [
+        Problem("expected 4 parts, found 5"),
+        Problem("invalid theme: 7"),
+        Problem("invalid time", 0, (2,), 1),
+        Problem("time goes backwards", 0, (2, 5), 2),
+        Problem("pitch out of range", 1, (0,), 1),
+        Problem("syllable doesn't start with a vowel or silence", 1, (1,), 1),
+        Problem("phoneme duration out of range in the part start", 2),
+        Problem("unknown phoneme", 3, (0, 1, 2, 3, 4), 8),
+    ]
+    assert str(problems[-1]) == (
+        "part 3, notes 0, 1, 2, 3, 4 and 3 more: unknown phoneme"
+    )
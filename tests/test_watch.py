@@ -0,0 +1,37 @@
+from blobopera.watch import changes
+
+
+def test_changes(tmp_path):
+    """Test if bursts of file changes get debounced into a single batch."""
+    first, second = tmp_path / "first.xml", tmp_path / "second.xml"
+    first.write_text("first")
+
+    # Every poll sleeps once, so each step runs right before a poll.
+    steps = iter(
+        [
+            lambda: first.write_text("changed"),
+            lambda: second.write_text("created"),
+            lambda: first.write_text("changed again"),
+            None,
+            None,
+            None,
+            lambda: first.unlink(),
+            None,
+            None,
+            None,
+        ]
+    )
+
+    def sleep(interval):
+        step = next(steps)
+        if step:
+            step()
+
+    watcher = changes(
+        lambda: sorted(tmp_path.iterdir()) + [first],
+        interval=0.1,
+        debounce=0.25,
+        sleep=sleep,
+    )
+    assert next(watcher) == [first, second]
+    assert next(watcher) == [first]